@@ -0,0 +1,151 @@
+"""add_title_cards
+
+Revision ID: a1c3e5f7b9d0
+Revises: f8b0d2e4a6c7
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c3e5f7b9d0"
+down_revision: Union[str, None] = "f8b0d2e4a6c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CARD_SOURCE = {
+    "title_id": "ct.id",
+    "imdb_tconst": "ct.imdb_tconst",
+    "primary_title": "ct.primary_title",
+    "start_year": "ct.start_year",
+    "runtime_minutes": "ct.runtime_minutes",
+    "genres": "ct.genres",
+    "original_language": "ct.original_language",
+    "poster_path": "ct.poster_path",
+    "has_rating": "cr.title_id IS NOT NULL",
+    "average_rating": "cr.average_rating",
+    "num_votes": "cr.num_votes",
+    "rt_critic_score": "cr.rt_critic_score",
+    "popularity": "COALESCE(cr.average_rating * LN(cr.num_votes + 1), 0)",
+}
+COLUMNS = list(CARD_SOURCE)
+TITLE_COLUMNS = [c for c, expr in CARD_SOURCE.items() if expr.startswith("ct.") and c != "title_id"]
+INCLUDE = ", ".join(c for c in COLUMNS if c not in ("title_id", "popularity"))
+
+# Sort key of each covering index, matching the browse keysets
+INDEXES = {
+    "ix_title_cards_popularity": "popularity DESC, title_id DESC",
+    "ix_title_cards_rating": "COALESCE(average_rating, -1) DESC, COALESCE(num_votes, -1) DESC, title_id DESC",
+    "ix_title_cards_year_desc": "COALESCE(start_year, -1) DESC, COALESCE(num_votes, -1) DESC, title_id DESC",
+    "ix_title_cards_year_asc": "COALESCE(start_year, 2147483647), COALESCE(num_votes, -1) DESC, title_id DESC",
+}
+
+TRIGGERS = {
+    "title_cards_titles_insert": "AFTER INSERT ON catalog_titles REFERENCING NEW TABLE AS new_rows",
+    "title_cards_titles_update": (
+        "AFTER UPDATE ON catalog_titles REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+    "title_cards_ratings_insert": "AFTER INSERT ON catalog_ratings REFERENCING NEW TABLE AS new_rows",
+    "title_cards_ratings_update": "AFTER UPDATE ON catalog_ratings REFERENCING NEW TABLE AS new_rows",
+    "title_cards_ratings_delete": "AFTER DELETE ON catalog_ratings REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "title_cards",
+        sa.Column("title_id", sa.Integer(), nullable=False),
+        sa.Column("imdb_tconst", sa.String(length=20), nullable=False),
+        sa.Column("primary_title", sa.String(length=500), nullable=False),
+        sa.Column("start_year", sa.Integer(), nullable=True),
+        sa.Column("runtime_minutes", sa.Integer(), nullable=True),
+        sa.Column("genres", sa.String(length=200), nullable=True),
+        sa.Column("original_language", sa.String(length=10), nullable=True),
+        sa.Column("poster_path", sa.String(length=255), nullable=True),
+        sa.Column("has_rating", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("average_rating", sa.Float(), nullable=True),
+        sa.Column("num_votes", sa.Integer(), nullable=True),
+        sa.Column("rt_critic_score", sa.Integer(), nullable=True),
+        sa.Column("popularity", sa.Float(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["title_id"], ["catalog_titles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("title_id"),
+    )
+    # Backfill before indexing: one sorted build per index instead of row-by-row inserts
+    op.execute(f"""
+        INSERT INTO title_cards ({', '.join(COLUMNS)})
+        SELECT {', '.join(CARD_SOURCE.values())}
+        FROM catalog_titles ct
+        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+    """)
+    for name, keys in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON title_cards ({keys}) INCLUDE ({INCLUDE})")
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION title_cards_refresh(ids integer[]) RETURNS void
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO title_cards AS tc ({', '.join(COLUMNS)})
+            SELECT {', '.join(CARD_SOURCE.values())}
+            FROM catalog_titles ct
+            LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+            WHERE ct.id = ANY(ids)
+            ON CONFLICT (title_id) DO UPDATE SET
+                {', '.join(f'{c} = EXCLUDED.{c}' for c in COLUMNS[1:])}
+            WHERE ({', '.join(f'tc.{c}' for c in COLUMNS[1:])}) IS DISTINCT FROM
+                  ({', '.join(f'EXCLUDED.{c}' for c in COLUMNS[1:])});
+        END
+        $$
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION title_cards_sync() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            ids integer[];
+        BEGIN
+            IF TG_TABLE_NAME = 'catalog_titles' AND TG_OP = 'INSERT' THEN
+                SELECT array_agg(id) INTO ids FROM new_rows;
+            ELSIF TG_TABLE_NAME = 'catalog_titles' THEN
+                SELECT array_agg(n.id) INTO ids
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE ({', '.join(f'n.{c}' for c in TITLE_COLUMNS)}) IS DISTINCT FROM
+                      ({', '.join(f'o.{c}' for c in TITLE_COLUMNS)});
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(DISTINCT title_id) INTO ids FROM old_rows;
+            ELSE
+                SELECT array_agg(DISTINCT title_id) INTO ids FROM new_rows;
+            END IF;
+            IF ids IS NOT NULL THEN
+                PERFORM title_cards_refresh(ids);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for name, timing in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {timing} FOR EACH STATEMENT EXECUTE FUNCTION title_cards_sync()")
+
+    # Browse and auto collections sort title_cards now
+    op.drop_index("ix_catalog_ratings_rating_votes_title_id", table_name="catalog_ratings")
+    op.drop_index("ix_catalog_ratings_popularity_title_id", table_name="catalog_ratings")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE INDEX ix_catalog_ratings_popularity_title_id
+        ON catalog_ratings (COALESCE(average_rating * LN(num_votes + 1), 0) DESC, title_id DESC)
+    """)
+    op.execute("""
+        CREATE INDEX ix_catalog_ratings_rating_votes_title_id
+        ON catalog_ratings (
+            COALESCE(average_rating, -1) DESC, COALESCE(num_votes, -1) DESC, title_id DESC
+        )
+    """)
+    for name, timing in TRIGGERS.items():
+        table = timing.split(" ON ")[1].split()[0]
+        op.execute(f"DROP TRIGGER {name} ON {table}")
+    op.execute("DROP FUNCTION title_cards_sync()")
+    op.execute("DROP FUNCTION title_cards_refresh(integer[])")
+    op.drop_table("title_cards")
@@ -0,0 +1,32 @@
+"""add_rate_limit_buckets
+
+Revision ID: a3c5e7f9b1d2
+Revises: f2b4c6d8e0a1
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c5e7f9b1d2"
+down_revision: Union[str, None] = "f2b4c6d8e0a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("upstream", sa.String(50), primary_key=True),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("capacity", sa.Float(), nullable=False),
+        sa.Column("refill_per_second", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
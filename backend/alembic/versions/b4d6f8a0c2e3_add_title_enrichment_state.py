@@ -0,0 +1,38 @@
+"""add_title_enrichment_state
+
+Revision ID: b4d6f8a0c2e3
+Revises: a3c5e7f9b1d2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d6f8a0c2e3"
+down_revision: Union[str, None] = "a3c5e7f9b1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "title_enrichment_state",
+        sa.Column(
+            "title_id",
+            sa.Integer(),
+            sa.ForeignKey("catalog_titles.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("field", sa.String(50), primary_key=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("not_available", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("next_check_at", sa.DateTime(timezone=True)),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("title_enrichment_state")
@@ -0,0 +1,35 @@
+"""add_enrichment_checkpoints
+
+Revision ID: c5e7a9b1d3f4
+Revises: b4d6f8a0c2e3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e7a9b1d3f4"
+down_revision: Union[str, None] = "b4d6f8a0c2e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "enrichment_checkpoints",
+        sa.Column("job", sa.String(100), primary_key=True),
+        sa.Column("cursor", sa.Text()),
+        sa.Column("processed", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("written", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("errors", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("enrichment_checkpoints")
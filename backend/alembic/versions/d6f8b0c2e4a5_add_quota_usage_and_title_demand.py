@@ -0,0 +1,45 @@
+"""add_quota_usage_and_title_demand
+
+Revision ID: d6f8b0c2e4a5
+Revises: c5e7a9b1d3f4
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d6f8b0c2e4a5"
+down_revision: Union[str, None] = "c5e7a9b1d3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upstream_quota_usage",
+        sa.Column("upstream", sa.String(50), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("used", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("reserved", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_table(
+        "title_demand",
+        sa.Column(
+            "title_id",
+            sa.Integer(),
+            sa.ForeignKey("catalog_titles.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("score", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("views", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("title_demand")
+    op.drop_table("upstream_quota_usage")
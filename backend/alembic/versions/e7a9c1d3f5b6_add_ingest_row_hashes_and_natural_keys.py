@@ -0,0 +1,49 @@
+"""add_ingest_row_hashes_and_natural_keys
+
+Revision ID: e7a9c1d3f5b6
+Revises: d6f8b0c2e4a5
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a9c1d3f5b6"
+down_revision: Union[str, None] = "d6f8b0c2e4a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-running ingestion used to duplicate akas and principals; keep the first copy
+    for table in ("catalog_akas", "catalog_principals"):
+        op.execute(f"""
+            DELETE FROM {table} t
+            USING {table} d
+            WHERE t.title_id = d.title_id
+              AND t.ordering = d.ordering
+              AND t.id > d.id
+        """)
+    op.create_index(
+        "uq_catalog_akas_title_ordering", "catalog_akas", ["title_id", "ordering"], unique=True
+    )
+    op.create_index(
+        "uq_catalog_principals_title_ordering", "catalog_principals", ["title_id", "ordering"], unique=True
+    )
+
+    op.create_table(
+        "ingest_row_hashes",
+        sa.Column("source", sa.String(30), primary_key=True),
+        sa.Column("key1", sa.BigInteger(), primary_key=True),
+        sa.Column("key2", sa.Integer(), primary_key=True, server_default=sa.text("0")),
+        sa.Column("hash", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingest_row_hashes")
+    op.drop_index("uq_catalog_principals_title_ordering", table_name="catalog_principals")
+    op.drop_index("uq_catalog_akas_title_ordering", table_name="catalog_akas")
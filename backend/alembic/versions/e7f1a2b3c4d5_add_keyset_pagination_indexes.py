@@ -0,0 +1,63 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: e7f1a2b3c4d5
+Revises: d1a2b3c4e5f6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f1a2b3c4d5"
+down_revision: Union[str, None] = "d1a2b3c4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes matching the keyset ORDER BY of each paginated listing,
+    # so a cursor page is an index range scan instead of sort + OFFSET.
+
+    # watches: history sorted by watched_date / created_at / rating per profile
+    op.execute("""
+        CREATE INDEX ix_watches_profile_watched_date_id
+        ON watches (profile_id, COALESCE(watched_date, DATE '0001-01-01') DESC, id DESC)
+    """)
+    op.execute("""
+        CREATE INDEX ix_watches_profile_created_at_id
+        ON watches (profile_id, created_at DESC, id DESC)
+    """)
+    op.execute("""
+        CREATE INDEX ix_watches_profile_rating_id
+        ON watches (profile_id, COALESCE(rating_1_10, 0) DESC, id DESC)
+    """)
+
+    # collection_items: curated collections ordered by position
+    op.create_index(
+        "ix_collection_items_collection_position_id",
+        "collection_items",
+        ["collection_id", "position", "id"],
+    )
+
+    # catalog_ratings: popularity and rating sorts for browse and auto collections
+    op.execute("""
+        CREATE INDEX ix_catalog_ratings_popularity_title_id
+        ON catalog_ratings (COALESCE(average_rating * LN(num_votes + 1), 0) DESC, title_id DESC)
+    """)
+    op.execute("""
+        CREATE INDEX ix_catalog_ratings_rating_votes_title_id
+        ON catalog_ratings (
+            COALESCE(average_rating, -1) DESC, COALESCE(num_votes, -1) DESC, title_id DESC
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_catalog_ratings_rating_votes_title_id", table_name="catalog_ratings")
+    op.drop_index("ix_catalog_ratings_popularity_title_id", table_name="catalog_ratings")
+    op.drop_index("ix_collection_items_collection_position_id", table_name="collection_items")
+    op.drop_index("ix_watches_profile_rating_id", table_name="watches")
+    op.drop_index("ix_watches_profile_created_at_id", table_name="watches")
+    op.drop_index("ix_watches_profile_watched_date_id", table_name="watches")
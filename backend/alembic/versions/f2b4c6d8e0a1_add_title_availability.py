@@ -0,0 +1,60 @@
+"""add_title_availability
+
+Revision ID: f2b4c6d8e0a1
+Revises: e7f1a2b3c4d5
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b4c6d8e0a1"
+down_revision: Union[str, None] = "e7f1a2b3c4d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "title_availability",
+        sa.Column(
+            "title_id", sa.Integer(),
+            sa.ForeignKey("catalog_titles.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("region", sa.String(10), primary_key=True),
+        sa.Column(
+            "flatrate_provider_ids", postgresql.ARRAY(sa.Integer()),
+            nullable=False, server_default="{}",
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index(
+        "ix_title_availability_flatrate_provider_ids",
+        "title_availability",
+        ["flatrate_provider_ids"],
+        postgresql_using="gin",
+    )
+
+    # Backfill from the provider rows already cached
+    op.execute("""
+        INSERT INTO title_availability (title_id, region, flatrate_provider_ids)
+        SELECT
+            title_id,
+            region,
+            COALESCE(
+                array_agg(DISTINCT provider_id ORDER BY provider_id)
+                    FILTER (WHERE provider_type = 'flatrate'),
+                '{}'
+            )
+        FROM watch_providers
+        GROUP BY title_id, region
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_title_availability_flatrate_provider_ids", table_name="title_availability")
+    op.drop_table("title_availability")
@@ -0,0 +1,119 @@
+"""generate_title_search_vectors
+
+Revision ID: f8b0d2e4a6c7
+Revises: e7a9c1d3f5b6
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# revision identifiers, used by Alembic.
+revision: str = "f8b0d2e4a6c7"
+down_revision: Union[str, None] = "e7a9c1d3f5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_TEXT_SQL = (
+    "btrim(coalesce(primary_title, '') || ' ' || coalesce(NULLIF(original_title, primary_title), '')"
+    " || ' ' || coalesce(aka_search_text, ''))"
+)
+
+AKA_TITLES_SQL = """
+    SELECT string_agg(DISTINCT ca.localized_title, ' ')
+    FROM catalog_akas ca
+    WHERE ca.title_id = ct.id
+      AND (ca.is_original
+           OR ca.region IN ('US', 'GB', 'CA', 'AU', 'IE', 'NZ')
+           OR ca.language = 'en')
+      AND ca.localized_title IS DISTINCT FROM ct.primary_title
+      AND ca.localized_title IS DISTINCT FROM ct.original_title
+"""
+
+
+def upgrade() -> None:
+    op.add_column("catalog_titles", sa.Column("aka_search_text", sa.Text(), nullable=True))
+    op.execute(f"UPDATE catalog_titles ct SET aka_search_text = ({AKA_TITLES_SQL})")
+
+    # Stored generated columns replace the values ingestion used to compute per row
+    op.drop_index("ix_catalog_titles_ts_vector", table_name="catalog_titles")
+    op.drop_column("catalog_titles", "ts_vector")
+    op.drop_column("catalog_titles", "title_search_text")
+    op.add_column(
+        "catalog_titles",
+        sa.Column("title_search_text", sa.Text(), sa.Computed(SEARCH_TEXT_SQL, persisted=True)),
+    )
+    op.add_column(
+        "catalog_titles",
+        sa.Column(
+            "ts_vector",
+            TSVECTOR(),
+            sa.Computed(f"to_tsvector('english', {SEARCH_TEXT_SQL})", persisted=True),
+        ),
+    )
+    op.create_index(
+        "ix_catalog_titles_ts_vector", "catalog_titles", ["ts_vector"], unique=False, postgresql_using="gin"
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION catalog_akas_refresh_search_text() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            ids integer[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(DISTINCT title_id) INTO ids FROM new_akas;
+            ELSIF TG_OP = 'UPDATE' THEN
+                SELECT array_agg(DISTINCT title_id) INTO ids
+                FROM (SELECT title_id FROM new_akas UNION SELECT title_id FROM old_akas) changed;
+            ELSE
+                SELECT array_agg(DISTINCT title_id) INTO ids FROM old_akas;
+            END IF;
+            IF ids IS NULL THEN
+                RETURN NULL;
+            END IF;
+            UPDATE catalog_titles ct SET aka_search_text = ({AKA_TITLES_SQL})
+            WHERE ct.id = ANY(ids);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER catalog_akas_search_text_insert AFTER INSERT ON catalog_akas
+        REFERENCING NEW TABLE AS new_akas
+        FOR EACH STATEMENT EXECUTE FUNCTION catalog_akas_refresh_search_text()
+    """)
+    op.execute("""
+        CREATE TRIGGER catalog_akas_search_text_update AFTER UPDATE ON catalog_akas
+        REFERENCING OLD TABLE AS old_akas NEW TABLE AS new_akas
+        FOR EACH STATEMENT EXECUTE FUNCTION catalog_akas_refresh_search_text()
+    """)
+    op.execute("""
+        CREATE TRIGGER catalog_akas_search_text_delete AFTER DELETE ON catalog_akas
+        REFERENCING OLD TABLE AS old_akas
+        FOR EACH STATEMENT EXECUTE FUNCTION catalog_akas_refresh_search_text()
+    """)
+
+
+def downgrade() -> None:
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER catalog_akas_search_text_{event} ON catalog_akas")
+    op.execute("DROP FUNCTION catalog_akas_refresh_search_text()")
+
+    op.drop_index("ix_catalog_titles_ts_vector", table_name="catalog_titles")
+    op.drop_column("catalog_titles", "ts_vector")
+    op.drop_column("catalog_titles", "title_search_text")
+    op.add_column("catalog_titles", sa.Column("title_search_text", sa.Text(), nullable=True))
+    op.add_column("catalog_titles", sa.Column("ts_vector", TSVECTOR(), nullable=True))
+    op.execute("""
+        UPDATE catalog_titles SET
+            title_search_text = btrim(coalesce(primary_title, '') || ' ' || coalesce(original_title, '')),
+            ts_vector = to_tsvector('english', btrim(coalesce(primary_title, '') || ' ' || coalesce(original_title, '')))
+    """)
+    op.create_index(
+        "ix_catalog_titles_ts_vector", "catalog_titles", ["ts_vector"], unique=False, postgresql_using="gin"
+    )
+    op.drop_column("catalog_titles", "aka_search_text")
@@ -20,6 +20,10 @@ class Settings(BaseSettings):
     TMDB_API_KEY: str = ""
     OMDB_API_KEY: str = ""
     TMDB_IMAGE_BASE_URL: str = "https://image.tmdb.org/t/p/"
+    # Point these at scripts/standin_server.py to run against local fixtures
+    TMDB_BASE_URL: str = "https://api.themoviedb.org/3"
+    OMDB_BASE_URL: str = "https://www.omdbapi.com"
+    OPENAI_BASE_URL: str = ""  # empty = the OpenAI SDK default
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSIONS: int = 1536
     RECOMMEND_DEFAULT_LIMIT: int = 20
@@ -29,6 +33,46 @@ class Settings(BaseSettings):
     RECENCY_BOOST: float = 0.2
     RECENCY_WINDOW_DAYS: int = 90
     POPULARITY_WEIGHT: float = 0.30
+    FACET_CACHE_TTL_SECONDS: int = 300
+    CATALOG_SNAPSHOT_ENABLED: bool = False
+    CATALOG_SNAPSHOT_REFRESH_SECONDS: int = 60
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_TIMEOUT_SECONDS: float = 20.0
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_WINDOW_SECONDS: float = 30.0
+    CIRCUIT_MIN_REQUESTS: int = 10
+    CIRCUIT_FAILURE_RATIO: float = 0.5
+    CIRCUIT_OPEN_SECONDS: float = 30.0
+    REQUEST_LATENCY_BUDGET_SECONDS: float = 3.0  # upstream time allowed per API request
+    RECOMMEND_LATENCY_BUDGET_SECONDS: float = 12.0  # mood search makes several OpenAI calls
+    RATE_LIMIT_ENABLED: bool = True
+    TMDB_RATE_LIMIT_PER_SECOND: float = 4.0
+    TMDB_RATE_LIMIT_BURST: int = 40
+    OMDB_RATE_LIMIT_PER_SECOND: float = 0.0116  # ~1000/day free tier
+    OMDB_RATE_LIMIT_BURST: int = 50
+    # OpenAI embedding limits of the account's tier, shared by generate_embeddings runs
+    OPENAI_EMBEDDING_REQUESTS_PER_MINUTE: int = 3000
+    OPENAI_EMBEDDING_TOKENS_PER_MINUTE: int = 1_000_000
+    RATE_LIMIT_BULK_RESERVE_FRACTION: float = 0.25
+    RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS: float = 2.0
+    ENRICHMENT_ENABLED: bool = True
+    ENRICHMENT_WORKERS: int = 4
+    ENRICHMENT_BATCH_SIZE: int = 20
+    ENRICHMENT_FLUSH_SECONDS: float = 2.0
+    ENRICHMENT_MAX_PENDING: int = 1000
+    ENRICHMENT_RETRY_SECONDS: int = 600
+    NEGATIVE_CACHE_BASE_SECONDS: float = 86400.0  # first re-check of a missing field
+    NEGATIVE_CACHE_MAX_SECONDS: float = 365 * 86400.0
+    TRENDING_REFRESH_ENABLED: bool = True
+    TRENDING_REFRESH_CHECK_SECONDS: int = 3600
+    TRENDING_REFRESH_CONCURRENCY: int = 8
+    OMDB_DAILY_QUOTA: int = 1000  # free tier
+    OMDB_SCHEDULED_QUOTA_FRACTION: float = 0.8  # share of the day the refresh plan may reserve
+    DEMAND_FLUSH_SECONDS: float = 30.0
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
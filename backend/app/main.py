@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -10,8 +12,29 @@ from sqlalchemy import text
 from app.config import settings
 from app.database import SessionLocal
 from app.routers import auth, catalog, collections, flags, lists, onboarding, profiles, recommend, watches
+from app.services.circuit import get_circuit_metrics
+from app.services.enrichment import stop_enrichment_queues
+from app.services.http import aclose_async_clients, close_clients, get_http_metrics
+from app.services.omdb_scheduler import stop_demand_tracker
+from app.services.snapshot import start_snapshot_refresher, stop_snapshot_refresher
+from app.services.tmdb import start_trending_refresher, stop_trending_refresher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # --- Background services ---
+    start_snapshot_refresher()
+    start_trending_refresher()
+    yield
+    stop_trending_refresher()
+    stop_snapshot_refresher()
+    stop_enrichment_queues()
+    stop_demand_tracker()
+    close_clients()
+    await aclose_async_clients()
 
-app = FastAPI(title="MovieBrain", version="0.5.0", root_path=settings.ROOT_PATH)
+
+app = FastAPI(title="MovieBrain", version="0.5.0", root_path=settings.ROOT_PATH, lifespan=lifespan)
 
 # --- CORS ---
 if settings.CORS_ORIGINS:
@@ -71,3 +94,8 @@ def health():
             status_code=503,
             content={"status": "error", "database": "unreachable"},
         )
+
+
+@app.get("/metrics")
+def metrics():
+    return {"http": get_http_metrics(), "circuits": get_circuit_metrics()}
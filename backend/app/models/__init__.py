@@ -5,6 +5,8 @@ from app.models.catalog import (
     CatalogPrincipal,
     CatalogRating,
     CatalogTitle,
+    IngestRowHash,
+    TitleCard,
 )
 from app.models.collection import Collection, CollectionItem
 from app.models.personal import (
@@ -18,6 +20,13 @@ from app.models.personal import (
     WatchTag,
 )
 from app.models.recommender import MovieEmbedding, ProfileTaste
+from app.models.upstream import (
+    EnrichmentCheckpoint,
+    RateLimitBucket,
+    TitleDemand,
+    TitleEnrichmentState,
+    UpstreamQuotaUsage,
+)
 from app.models.user import OnboardingMovie, Profile, SkippedOnboardingMovie, User
 
 __all__ = [
@@ -27,6 +36,8 @@ __all__ = [
     "CatalogPrincipal",
     "CatalogCrew",
     "CatalogAka",
+    "IngestRowHash",
+    "TitleCard",
     "User",
     "Profile",
     "Watch",
@@ -43,4 +54,9 @@ __all__ = [
     "SkippedOnboardingMovie",
     "Collection",
     "CollectionItem",
+    "RateLimitBucket",
+    "TitleEnrichmentState",
+    "EnrichmentCheckpoint",
+    "UpstreamQuotaUsage",
+    "TitleDemand",
 ]
@@ -1,6 +1,9 @@
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
@@ -8,6 +11,8 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    event,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import relationship
@@ -15,6 +20,67 @@ from sqlalchemy.sql import func
 
 from app.database import Base
 
+# Searchable text of a title: primary and original title plus selected aka
+# titles. Generated, so every write to these columns keeps search current.
+SEARCH_TEXT_SQL = (
+    "btrim(coalesce(primary_title, '') || ' ' || coalesce(NULLIF(original_title, primary_title), '')"
+    " || ' ' || coalesce(aka_search_text, ''))"
+)
+
+# Statement-level triggers on catalog_akas rebuild aka_search_text for the
+# titles a statement touched, so bulk aka loads cost one UPDATE, not one per row.
+# Akas in English-speaking regions or languages and original titles are searchable.
+AKA_SEARCH_TEXT_FUNCTION = """
+CREATE OR REPLACE FUNCTION catalog_akas_refresh_search_text() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    ids integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT title_id) INTO ids FROM new_akas;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(DISTINCT title_id) INTO ids
+        FROM (SELECT title_id FROM new_akas UNION SELECT title_id FROM old_akas) changed;
+    ELSE
+        SELECT array_agg(DISTINCT title_id) INTO ids FROM old_akas;
+    END IF;
+    IF ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    UPDATE catalog_titles ct SET aka_search_text = (
+        SELECT string_agg(DISTINCT ca.localized_title, ' ')
+        FROM catalog_akas ca
+        WHERE ca.title_id = ct.id
+          AND (ca.is_original
+               OR ca.region IN ('US', 'GB', 'CA', 'AU', 'IE', 'NZ')
+               OR ca.language = 'en')
+          AND ca.localized_title IS DISTINCT FROM ct.primary_title
+          AND ca.localized_title IS DISTINCT FROM ct.original_title
+    )
+    WHERE ct.id = ANY(ids);
+    RETURN NULL;
+END
+$$
+"""
+
+AKA_SEARCH_TEXT_TRIGGERS = [
+    """
+    CREATE TRIGGER catalog_akas_search_text_insert AFTER INSERT ON catalog_akas
+    REFERENCING NEW TABLE AS new_akas
+    FOR EACH STATEMENT EXECUTE FUNCTION catalog_akas_refresh_search_text()
+    """,
+    """
+    CREATE TRIGGER catalog_akas_search_text_update AFTER UPDATE ON catalog_akas
+    REFERENCING OLD TABLE AS old_akas NEW TABLE AS new_akas
+    FOR EACH STATEMENT EXECUTE FUNCTION catalog_akas_refresh_search_text()
+    """,
+    """
+    CREATE TRIGGER catalog_akas_search_text_delete AFTER DELETE ON catalog_akas
+    REFERENCING OLD TABLE AS old_akas
+    FOR EACH STATEMENT EXECUTE FUNCTION catalog_akas_refresh_search_text()
+    """,
+]
+
 
 class CatalogTitle(Base):
     __tablename__ = "catalog_titles"
@@ -33,8 +99,9 @@ class CatalogTitle(Base):
     overview = Column(Text)
     trailer_key = Column(String(20))
     original_language = Column(String(10))
-    title_search_text = Column(Text)
-    ts_vector = Column(TSVECTOR)
+    aka_search_text = Column(Text)  # maintained by triggers on catalog_akas
+    title_search_text = Column(Text, Computed(SEARCH_TEXT_SQL, persisted=True))
+    ts_vector = Column(TSVECTOR, Computed(f"to_tsvector('english', {SEARCH_TEXT_SQL})", persisted=True))
 
     rating = relationship("CatalogRating", back_populates="title", uselist=False)
     principals = relationship("CatalogPrincipal", back_populates="title")
@@ -99,6 +166,7 @@ class CatalogPrincipal(Base):
     __table_args__ = (
         Index("ix_catalog_principals_title_id", "title_id"),
         Index("ix_catalog_principals_person_id", "person_id"),
+        Index("uq_catalog_principals_title_ordering", "title_id", "ordering", unique=True),
     )
 
 
@@ -129,9 +197,182 @@ class CatalogAka(Base):
     __table_args__ = (
         Index("ix_catalog_akas_title_id", "title_id"),
         Index("ix_catalog_akas_language", "language"),
+        Index("uq_catalog_akas_title_ordering", "title_id", "ordering", unique=True),
+    )
+
+
+event.listen(CatalogAka.__table__, "after_create", DDL(AKA_SEARCH_TEXT_FUNCTION))
+for _trigger in AKA_SEARCH_TEXT_TRIGGERS:
+    event.listen(CatalogAka.__table__, "after_create", DDL(_trigger))
+
+
+# Source expression of each title_cards column
+TITLE_CARD_SOURCE = {
+    "title_id": "ct.id",
+    "imdb_tconst": "ct.imdb_tconst",
+    "primary_title": "ct.primary_title",
+    "start_year": "ct.start_year",
+    "runtime_minutes": "ct.runtime_minutes",
+    "genres": "ct.genres",
+    "original_language": "ct.original_language",
+    "poster_path": "ct.poster_path",
+    "has_rating": "cr.title_id IS NOT NULL",
+    "average_rating": "cr.average_rating",
+    "num_votes": "cr.num_votes",
+    "rt_critic_score": "cr.rt_critic_score",
+    "popularity": "COALESCE(cr.average_rating * LN(cr.num_votes + 1), 0)",
+}
+_CARD_COLUMNS = list(TITLE_CARD_SOURCE)
+_CARD_TITLE_COLUMNS = [c for c, expr in TITLE_CARD_SOURCE.items() if expr.startswith("ct.") and c != "title_id"]
+
+# Upsert the cards of the given titles from catalog_titles and catalog_ratings,
+# writing only rows whose card values changed
+TITLE_CARDS_REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION title_cards_refresh(ids integer[]) RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO title_cards AS tc ({', '.join(_CARD_COLUMNS)})
+    SELECT {', '.join(TITLE_CARD_SOURCE.values())}
+    FROM catalog_titles ct
+    LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+    WHERE ct.id = ANY(ids)
+    ON CONFLICT (title_id) DO UPDATE SET
+        {', '.join(f'{c} = EXCLUDED.{c}' for c in _CARD_COLUMNS[1:])}
+    WHERE ({', '.join(f'tc.{c}' for c in _CARD_COLUMNS[1:])}) IS DISTINCT FROM
+          ({', '.join(f'EXCLUDED.{c}' for c in _CARD_COLUMNS[1:])});
+END
+$$
+"""
+
+# Statement-level triggers keep title_cards in step with every ingest and
+# enrichment write; title updates that leave the card columns alone (search
+# text, overview, ...) are skipped. Deleted titles go by ON DELETE CASCADE.
+TITLE_CARDS_SYNC_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION title_cards_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    ids integer[];
+BEGIN
+    IF TG_TABLE_NAME = 'catalog_titles' AND TG_OP = 'INSERT' THEN
+        SELECT array_agg(id) INTO ids FROM new_rows;
+    ELSIF TG_TABLE_NAME = 'catalog_titles' THEN
+        SELECT array_agg(n.id) INTO ids
+        FROM new_rows n JOIN old_rows o ON o.id = n.id
+        WHERE ({', '.join(f'n.{c}' for c in _CARD_TITLE_COLUMNS)}) IS DISTINCT FROM
+              ({', '.join(f'o.{c}' for c in _CARD_TITLE_COLUMNS)});
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT title_id) INTO ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT title_id) INTO ids FROM new_rows;
+    END IF;
+    IF ids IS NOT NULL THEN
+        PERFORM title_cards_refresh(ids);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TITLE_CARDS_TRIGGERS = [
+    """
+    CREATE TRIGGER title_cards_titles_insert AFTER INSERT ON catalog_titles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION title_cards_sync()
+    """,
+    """
+    CREATE TRIGGER title_cards_titles_update AFTER UPDATE ON catalog_titles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION title_cards_sync()
+    """,
+    """
+    CREATE TRIGGER title_cards_ratings_insert AFTER INSERT ON catalog_ratings
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION title_cards_sync()
+    """,
+    """
+    CREATE TRIGGER title_cards_ratings_update AFTER UPDATE ON catalog_ratings
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION title_cards_sync()
+    """,
+    """
+    CREATE TRIGGER title_cards_ratings_delete AFTER DELETE ON catalog_ratings
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION title_cards_sync()
+    """,
+]
+
+# Carried by every sort index so list pages are index-only scans
+TITLE_CARD_INCLUDE = [c for c in _CARD_COLUMNS if c not in ("title_id", "popularity")]
+
+
+class TitleCard(Base):
+    """Denormalized list card of a title: the catalog_titles and catalog_ratings
+    columns browse, featured rows, collections, recommendations and the like
+    show, kept current by triggers. Key sorts mirror the browse keysets."""
+
+    __tablename__ = "title_cards"
+
+    title_id = Column(Integer, ForeignKey("catalog_titles.id", ondelete="CASCADE"), primary_key=True)
+    imdb_tconst = Column(String(20), nullable=False)
+    primary_title = Column(String(500), nullable=False)
+    start_year = Column(Integer)
+    runtime_minutes = Column(Integer)
+    genres = Column(String(200))
+    original_language = Column(String(10))
+    poster_path = Column(String(255))
+    has_rating = Column(Boolean, nullable=False, server_default="false")
+    average_rating = Column(Float)
+    num_votes = Column(Integer)
+    rt_critic_score = Column(Integer)
+    popularity = Column(Float, nullable=False, server_default="0")
+
+    __table_args__ = (
+        Index(
+            "ix_title_cards_popularity",
+            text("popularity DESC"),
+            text("title_id DESC"),
+            postgresql_include=TITLE_CARD_INCLUDE,
+        ),
+        Index(
+            "ix_title_cards_rating",
+            text("COALESCE(average_rating, -1) DESC"),
+            text("COALESCE(num_votes, -1) DESC"),
+            text("title_id DESC"),
+            postgresql_include=TITLE_CARD_INCLUDE,
+        ),
+        Index(
+            "ix_title_cards_year_desc",
+            text("COALESCE(start_year, -1) DESC"),
+            text("COALESCE(num_votes, -1) DESC"),
+            text("title_id DESC"),
+            postgresql_include=TITLE_CARD_INCLUDE,
+        ),
+        Index(
+            "ix_title_cards_year_asc",
+            text("COALESCE(start_year, 2147483647)"),
+            text("COALESCE(num_votes, -1) DESC"),
+            text("title_id DESC"),
+            postgresql_include=TITLE_CARD_INCLUDE,
+        ),
     )
 
 
+# The triggers span three tables, so they are created once all tables exist
+for _ddl in [TITLE_CARDS_REFRESH_FUNCTION, TITLE_CARDS_SYNC_FUNCTION, *TITLE_CARDS_TRIGGERS]:
+    event.listen(Base.metadata, "after_create", DDL(_ddl))
+
+
+class IngestRowHash(Base):
+    """Content hash of each source row as of the last delta ingest, per table and key."""
+
+    __tablename__ = "ingest_row_hashes"
+
+    source = Column(String(30), primary_key=True)
+    key1 = Column(BigInteger, primary_key=True)
+    key2 = Column(Integer, primary_key=True, server_default="0")
+    hash = Column(BigInteger, nullable=False)
+
+
 class ProviderMaster(Base):
     __tablename__ = "provider_master"
 
@@ -163,6 +404,29 @@ class WatchProvider(Base):
     )
 
 
+class TitleAvailability(Base):
+    """Denormalized flatrate provider ids per title and region.
+
+    Derived from watch_providers so "on my services" filters are a single
+    GIN-indexed array overlap instead of a per-row EXISTS.
+    """
+
+    __tablename__ = "title_availability"
+
+    title_id = Column(Integer, ForeignKey("catalog_titles.id", ondelete="CASCADE"), primary_key=True)
+    region = Column(String(10), primary_key=True)
+    flatrate_provider_ids = Column(ARRAY(Integer), nullable=False, server_default="{}")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_title_availability_flatrate_provider_ids",
+            "flatrate_provider_ids",
+            postgresql_using="gin",
+        ),
+    )
+
+
 class TrendingCache(Base):
     __tablename__ = "trending_cache"
 
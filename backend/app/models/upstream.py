@@ -0,0 +1,74 @@
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, String, Text, func
+
+from app.database import Base
+
+
+class RateLimitBucket(Base):
+    """Shared token bucket per third-party API, used by every worker and script."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    upstream = Column(String(50), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    capacity = Column(Float, nullable=False)
+    refill_per_second = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TitleEnrichmentState(Base):
+    """When a third-party field was last fetched for a title, and whether upstream had it.
+
+    Fields upstream does not have are re-checked with exponential backoff
+    (next_check_at) instead of on every request.
+    """
+
+    __tablename__ = "title_enrichment_state"
+
+    title_id = Column(Integer, ForeignKey("catalog_titles.id", ondelete="CASCADE"), primary_key=True)
+    field = Column(String(50), primary_key=True)
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    not_available = Column(Boolean, nullable=False, server_default="false")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    next_check_at = Column(DateTime(timezone=True))
+
+
+class EnrichmentCheckpoint(Base):
+    """Resume point and progress counters of a long-running bulk enrichment job."""
+
+    __tablename__ = "enrichment_checkpoints"
+
+    job = Column(String(100), primary_key=True)
+    cursor = Column(Text)  # keyset cursor of the last title fully written
+    processed = Column(Integer, nullable=False, server_default="0")
+    written = Column(Integer, nullable=False, server_default="0")
+    errors = Column(Integer, nullable=False, server_default="0")
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+
+
+class UpstreamQuotaUsage(Base):
+    """Calls made against a third-party API's daily quota, and how many are reserved.
+
+    `reserved` is held back for a scheduled refresh plan; interactive fetches
+    may only spend what is neither used nor reserved.
+    """
+
+    __tablename__ = "upstream_quota_usage"
+
+    upstream = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+    used = Column(Integer, nullable=False, server_default="0")
+    reserved = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TitleDemand(Base):
+    """Exponentially decaying count of detail views per title."""
+
+    __tablename__ = "title_demand"
+
+    title_id = Column(Integer, ForeignKey("catalog_titles.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, server_default="0")  # as of updated_at
+    views = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
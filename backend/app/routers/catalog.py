@@ -3,22 +3,28 @@ from typing import Literal
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.dependencies import get_current_user, get_db
 from app.models.user import User
 from app.schemas.catalog import (
     BrowseResponse,
     BrowseTitle,
+    DecadeFacet,
     DecadeListResponse,
+    FacetsResponse,
     FeaturedRow,
     FeaturedRowMovie,
     FeaturedRowsResponse,
     FilmographyItem,
+    GenreFacet,
     GenreListResponse,
+    LanguageFacet,
     LanguageListResponse,
     LanguageOption,
     PaginatedSearchResponse,
     PersonDetailResponse,
     PersonWithFilmography,
+    ProviderFacet,
     RandomMovieResponse,
     SimilarTitle,
     SortOption,
@@ -26,30 +32,54 @@ from app.schemas.catalog import (
     TitleSearchResult,
 )
 from app.services.catalog import get_title_detail, search_titles
+from app.services.circuit import latency_budget
 from app.services.discovery import (
     DECADES,
     FEATURED_GENRES,
     GENRES,
     browse_catalog,
     get_available_languages,
+    get_catalog_facets,
     get_featured_rows,
     get_person_by_id,
     get_person_filmography,
     get_random_movie,
     get_similar_movies,
 )
-from app.services.omdb import get_or_fetch_omdb_ratings
+from app.services.enrichment import enqueue_movie_details, enqueue_omdb_ratings
+from app.services.omdb import cached_omdb_ratings, omdb_ratings_due
+from app.services.omdb_scheduler import record_title_view
+from app.services.pagination import InvalidCursorError
 from app.services.tmdb import (
-    get_or_fetch_movie_details,
+    cached_movie_details,
     get_or_fetch_watch_providers,
     get_poster_url,
     refresh_provider_master,
+    movie_details_need_fetch,
     refresh_trending_cache,
 )
 
 router = APIRouter(prefix="/catalog", tags=["catalog"])
 
 
+def _invalid_cursor(e: InvalidCursorError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
+def _parse_provider_ids(provider_ids: str | None) -> list[int] | None:
+    """Parse a comma-separated provider_ids query parameter."""
+    try:
+        return (
+            [int(p.strip()) for p in provider_ids.split(",") if p.strip()]
+            if provider_ids else None
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="provider_ids must be a comma-separated list of integers",
+        )
+
+
 @router.get("/search", response_model=PaginatedSearchResponse)
 def search(
     q: str = Query(..., min_length=1),
@@ -60,19 +90,24 @@ def search(
     max_year: int | None = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
     """Search titles with optional filters."""
-    titles, total = search_titles(
-        db, q,
-        year=year,
-        genre=genre,
-        min_rating=min_rating,
-        min_year=min_year,
-        max_year=max_year,
-        page=page,
-        limit=limit,
-    )
+    try:
+        titles, total, next_cursor = search_titles(
+            db, q,
+            year=year,
+            genre=genre,
+            min_rating=min_rating,
+            min_year=min_year,
+            max_year=max_year,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise _invalid_cursor(e)
 
     results = []
     for title in titles:
@@ -92,7 +127,9 @@ def search(
             )
         )
 
-    return PaginatedSearchResponse(results=results, total=total, page=page, limit=limit)
+    return PaginatedSearchResponse(
+        results=results, total=total, page=page, limit=limit, next_cursor=next_cursor,
+    )
 
 
 @router.get("/browse", response_model=BrowseResponse)
@@ -108,43 +145,41 @@ def browse(
     max_runtime: int | None = Query(None, ge=0),
     language: str | None = Query(None),
     provider_ids: str | None = Query(None, description="Comma-separated provider IDs"),
+    region: str = Query("US", min_length=2, max_length=10, description="Watch region for provider_ids"),
     sort_by: SortOption = Query("popularity"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     exclude_watched: int | None = Query(None, description="Profile ID to exclude watched movies"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
     """Browse the catalog with filters and sorting."""
     genres_list = [g.strip() for g in genres.split(",") if g.strip()] if genres else None
+    provider_id_list = _parse_provider_ids(provider_ids)
+
     try:
-        provider_id_list = (
-            [int(p.strip()) for p in provider_ids.split(",") if p.strip()]
-            if provider_ids else None
-        )
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="provider_ids must be a comma-separated list of integers",
+        results, total, next_cursor = browse_catalog(
+            db,
+            genre=genre,
+            genres=genres_list,
+            min_year=min_year,
+            max_year=max_year,
+            decade=decade,
+            min_rating=min_rating,
+            min_rt_score=min_rt_score,
+            min_runtime=min_runtime,
+            max_runtime=max_runtime,
+            language=language,
+            provider_ids=provider_id_list,
+            region=region.upper(),
+            sort_by=sort_by,
+            page=page,
+            limit=limit,
+            exclude_watched_profile_id=exclude_watched,
+            cursor=cursor,
         )
-
-    results, total = browse_catalog(
-        db,
-        genre=genre,
-        genres=genres_list,
-        min_year=min_year,
-        max_year=max_year,
-        decade=decade,
-        min_rating=min_rating,
-        min_rt_score=min_rt_score,
-        min_runtime=min_runtime,
-        max_runtime=max_runtime,
-        language=language,
-        provider_ids=provider_id_list,
-        sort_by=sort_by,
-        page=page,
-        limit=limit,
-        exclude_watched_profile_id=exclude_watched,
-    )
+    except InvalidCursorError as e:
+        raise _invalid_cursor(e)
 
     return BrowseResponse(
         results=[
@@ -165,6 +200,7 @@ def browse(
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -269,17 +305,70 @@ def get_languages(db: Session = Depends(get_db)):
     )
 
 
+@router.get("/facets", response_model=FacetsResponse)
+def get_facets(
+    genre: str | None = Query(None),
+    genres: str | None = Query(None, description="Comma-separated genre list (OR logic)"),
+    min_year: int | None = Query(None),
+    max_year: int | None = Query(None),
+    decade: int | None = Query(None),
+    min_rating: float | None = Query(None, ge=0, le=10),
+    min_rt_score: int | None = Query(None, ge=0, le=100),
+    min_runtime: int | None = Query(None, ge=0),
+    max_runtime: int | None = Query(None, ge=0),
+    language: str | None = Query(None),
+    provider_ids: str | None = Query(None, description="Comma-separated provider IDs"),
+    region: str = Query("US", min_length=2, max_length=10, description="Watch region for provider_ids"),
+    db: Session = Depends(get_db),
+):
+    """Get filter-aware counts per genre, decade, language and provider.
+
+    Accepts the same filters as /browse. Each facet ignores its own filter so
+    the counts show what selecting a different option would return.
+    """
+    genres_list = [g.strip() for g in genres.split(",") if g.strip()] if genres else None
+    provider_id_list = _parse_provider_ids(provider_ids)
+
+    facets = get_catalog_facets(
+        db,
+        genre=genre,
+        genres=genres_list,
+        min_year=min_year,
+        max_year=max_year,
+        decade=decade,
+        min_rating=min_rating,
+        min_rt_score=min_rt_score,
+        min_runtime=min_runtime,
+        max_runtime=max_runtime,
+        language=language,
+        provider_ids=provider_id_list,
+        region=region.upper(),
+    )
+
+    return FacetsResponse(
+        genres=[GenreFacet(genre=f.value, count=f.count) for f in facets.genres],
+        decades=[DecadeFacet(decade=int(f.value), count=f.count) for f in facets.decades],
+        languages=[LanguageFacet(code=f.value, count=f.count) for f in facets.languages],
+        providers=[ProviderFacet(provider_id=int(f.value), count=f.count) for f in facets.providers],
+    )
+
+
 @router.get("/titles/{title_id}", response_model=TitleDetailResponse)
 def get_title(title_id: int, db: Session = Depends(get_db)):
     title = get_title_detail(db, title_id)
     if not title:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Title not found")
+    record_title_view(title.id)
 
-    # Lazy-fill poster, overview, and trailer if needed
-    details = get_or_fetch_movie_details(db, title)
+    # Serve what is cached; missing TMDB details and stale OMDb scores are
+    # filled in the background and show up on a later request
+    details = cached_movie_details(title)
+    if movie_details_need_fetch(db, title):
+        enqueue_movie_details([(title.id, title.imdb_tconst, title.tmdb_id)])
 
-    # Lazy-fill RT + Metacritic scores from OMDb
-    omdb_scores = get_or_fetch_omdb_ratings(db, title)
+    omdb_scores = cached_omdb_ratings(title)
+    if omdb_ratings_due(db, title):
+        enqueue_omdb_ratings([(title.id, title.imdb_tconst)])
 
     return TitleDetailResponse(
         id=title.id,
@@ -433,7 +522,9 @@ def get_title_providers(title_id: int, db: Session = Depends(get_db)):
     if not title:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Title not found")
 
-    providers = get_or_fetch_watch_providers(db, title)
+    # A slow or failing TMDB yields an empty list rather than a hung request
+    with latency_budget(settings.REQUEST_LATENCY_BUDGET_SECONDS):
+        providers = get_or_fetch_watch_providers(db, title)
 
     # Only return flatrate (subscription streaming) providers
     return [
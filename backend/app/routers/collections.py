@@ -13,6 +13,7 @@ from app.services.collection import (
     get_collection_movies,
     seed_default_collections,
 )
+from app.services.pagination import InvalidCursorError
 from app.services.tmdb import get_poster_url
 
 router = APIRouter(prefix="/collections", tags=["collections"])
@@ -43,6 +44,7 @@ def get_collection(
     collection_id: int,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
     """Get a collection with its movies."""
@@ -53,7 +55,10 @@ def get_collection(
             detail="Collection not found",
         )
 
-    movies, total = get_collection_movies(db, collection, page, limit)
+    try:
+        movies, total, next_cursor = get_collection_movies(db, collection, page, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
     return CollectionDetailResponse(
         id=collection.id,
@@ -78,4 +83,5 @@ def get_collection(
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
     )
@@ -19,12 +19,11 @@ def get_onboarding_movies(
     """Return the next batch of onboarding movies the user hasn't rated or skipped."""
     rows = db.execute(
         text("""
-            SELECT ct.id, ct.primary_title, ct.start_year, ct.genres,
-                   cr.average_rating, cr.num_votes, ct.poster_path,
-                   cr.rt_critic_score
+            SELECT tc.title_id, tc.primary_title, tc.start_year, tc.genres,
+                   tc.average_rating, tc.num_votes, tc.poster_path,
+                   tc.rt_critic_score
             FROM onboarding_movies om
-            JOIN catalog_titles ct ON ct.id = om.title_id
-            LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+            JOIN title_cards tc ON tc.title_id = om.title_id
             WHERE om.title_id NOT IN (
                 SELECT w.title_id FROM watches w WHERE w.profile_id = :profile_id
             )
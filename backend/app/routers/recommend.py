@@ -13,6 +13,7 @@ from app.schemas.recommend import (
     RecommendResponse,
     TasteProfileResponse,
 )
+from app.services.circuit import latency_budget
 from app.services.recommender import (
     blend_vectors,
     compute_taste_vector,
@@ -46,51 +47,59 @@ def recommend(
 
     mood_text = (body.mood or "").strip()
     if mood_text:
-        try:
-            top_movies = get_user_top_movies(db, profile.id)
-
-            # Phase 1: Ask LLM for specific movie titles (the obvious picks)
-            suggestions = suggest_mood_titles(mood_text, top_movies)
-            logger.info("LLM suggested %d titles for mood '%s'", len(suggestions), mood_text)
-
-            # Build exclusion set for catalog lookup
-            from sqlalchemy import text as sa_text
-            excluded_ids = {
-                row[0]
-                for row in db.execute(
-                    sa_text("""
-                        SELECT title_id FROM watches WHERE profile_id = :pid
-                        UNION
-                        SELECT title_id FROM movie_flags WHERE profile_id = :pid
-                    """),
-                    {"pid": profile.id},
-                )
-            }
-
-            llm_picks = lookup_titles_in_catalog(db, suggestions, excluded_ids)
-            logger.info("Matched %d LLM picks in catalog", len(llm_picks))
-
-            # Phase 2: Also do embedding search for discovery picks
-            description = generate_mood_description(mood_text, top_movies)
-            logger.info("Mood description for '%s': %s", mood_text, description)
-            mood_vec = embed_mood_text(description)
-
-            taste = _get_existing_taste(db, profile.id, MODEL_ID)
-            if taste is not None:
-                tv = taste.taste_vector
-                if isinstance(tv, str):
-                    tv = np.fromstring(tv.strip("[]"), sep=",").tolist()
-                search_vector = blend_vectors(mood_vec, tv)
-            else:
-                search_vector = mood_vec
-
-            mood_mode = True
-        except Exception as exc:
-            logger.error("Mood search failed: %s", exc)
+        top_movies = get_user_top_movies(db, profile.id)
+
+        # Each phase degrades on its own: if OpenAI is slow or its circuit is
+        # open, serve what the other phase found instead of failing the request
+        with latency_budget(settings.RECOMMEND_LATENCY_BUDGET_SECONDS):
+            try:
+                # Phase 1: Ask LLM for specific movie titles (the obvious picks)
+                suggestions = suggest_mood_titles(mood_text, top_movies)
+                logger.info("LLM suggested %d titles for mood '%s'", len(suggestions), mood_text)
+
+                # Build exclusion set for catalog lookup
+                from sqlalchemy import text as sa_text
+                excluded_ids = {
+                    row[0]
+                    for row in db.execute(
+                        sa_text("""
+                            SELECT title_id FROM watches WHERE profile_id = :pid
+                            UNION
+                            SELECT title_id FROM movie_flags WHERE profile_id = :pid
+                        """),
+                        {"pid": profile.id},
+                    )
+                }
+
+                llm_picks = lookup_titles_in_catalog(db, suggestions, excluded_ids)
+                logger.info("Matched %d LLM picks in catalog", len(llm_picks))
+            except Exception as exc:
+                logger.warning("Mood title suggestions failed: %s", exc)
+
+            try:
+                # Phase 2: Also do embedding search for discovery picks
+                description = generate_mood_description(mood_text, top_movies)
+                logger.info("Mood description for '%s': %s", mood_text, description)
+                mood_vec = embed_mood_text(description)
+
+                taste = _get_existing_taste(db, profile.id, MODEL_ID)
+                if taste is not None:
+                    tv = taste.taste_vector
+                    if isinstance(tv, str):
+                        tv = np.fromstring(tv.strip("[]"), sep=",").tolist()
+                    search_vector = blend_vectors(mood_vec, tv)
+                else:
+                    search_vector = mood_vec
+            except Exception as exc:
+                logger.warning("Mood embedding search failed: %s", exc)
+
+        mood_mode = bool(llm_picks) or search_vector is not None
+        if not mood_mode:
+            logger.error("Mood search failed for '%s'", mood_text)
             raise HTTPException(
                 status_code=503,
                 detail="Mood search is temporarily unavailable. Please try again.",
-            ) from exc
+            )
 
     result = get_recommendations(
         db=db,
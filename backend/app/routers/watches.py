@@ -15,6 +15,7 @@ from app.schemas.watch import (
     WatchResponse,
     WatchUpdate,
 )
+from app.services.pagination import InvalidCursorError
 from app.services.stats import get_profile_stats
 from app.services.watch import (
     create_or_update_watch,
@@ -67,19 +68,26 @@ def list_history(
     tag: str | None = Query(None),
     min_rating: int | None = Query(None, ge=1, le=10),
     max_rating: int | None = Query(None, ge=1, le=10),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
 ):
-    results, total = get_watch_history(
-        db,
-        profile_id=profile.id,
-        page=page,
-        limit=limit,
-        sort_by=sort_by,
-        tag=tag,
-        min_rating=min_rating,
-        max_rating=max_rating,
-    )
+    try:
+        results, total, next_cursor = get_watch_history(
+            db,
+            profile_id=profile.id,
+            page=page,
+            limit=limit,
+            sort_by=sort_by,
+            tag=tag,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
     return PaginatedWatchHistory(
-        results=results, total=total, page=page, limit=limit
+        results=results, total=total, page=page, limit=limit, next_cursor=next_cursor
     )
 
 
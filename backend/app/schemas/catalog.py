@@ -23,6 +23,7 @@ class PaginatedSearchResponse(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: str | None = None
 
 
 class PersonBrief(BaseModel):
@@ -116,6 +117,7 @@ class BrowseResponse(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: str | None = None
 
 
 class SimilarTitle(BaseModel):
@@ -199,6 +201,7 @@ class CollectionDetailResponse(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: str | None = None
 
 
 # Random movie and featured rows schemas
@@ -246,3 +249,31 @@ class LanguageOption(BaseModel):
 
 class LanguageListResponse(BaseModel):
     languages: list[LanguageOption]
+
+
+# Facet schemas
+class GenreFacet(BaseModel):
+    genre: str
+    count: int
+
+
+class DecadeFacet(BaseModel):
+    decade: int
+    count: int
+
+
+class LanguageFacet(BaseModel):
+    code: str
+    count: int
+
+
+class ProviderFacet(BaseModel):
+    provider_id: int
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    genres: list[GenreFacet]
+    decades: list[DecadeFacet]
+    languages: list[LanguageFacet]
+    providers: list[ProviderFacet]
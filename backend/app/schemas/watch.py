@@ -57,6 +57,7 @@ class PaginatedWatchHistory(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: str | None = None
 
 
 class TagCreate(BaseModel):
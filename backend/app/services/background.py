@@ -0,0 +1,50 @@
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run a callable on a daemon thread every `interval_seconds`."""
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        fn: Callable[[], None],
+        run_immediately: bool = True,
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.fn = fn
+        self.run_immediately = run_immediately
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        if not self.run_immediately:
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+        while not self._stop.is_set():
+            try:
+                self.fn()
+            except Exception:
+                logger.exception("Background task %s failed", self.name)
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
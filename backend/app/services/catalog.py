@@ -1,7 +1,9 @@
 from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.catalog import CatalogPrincipal, CatalogRating, CatalogTitle
+from app.services.pagination import decode_cursor, encode_cursor, keyset_filter
 
 
 def search_titles(
@@ -14,8 +16,17 @@ def search_titles(
     max_year: int | None = None,
     page: int = 1,
     limit: int = 20,
-) -> tuple[list, int]:
+    cursor: str | None = None,
+) -> tuple[list, int, str | None]:
+    """Full-text search over titles. Returns (titles, total, next_cursor)."""
     ts_query = func.plainto_tsquery("english", query)
+    # ts_rank is float4; compare it as float8 so cursor values round-trip exactly
+    rank = func.ts_rank(CatalogTitle.ts_vector, ts_query).cast(DOUBLE_PRECISION)
+    keyset = [
+        (rank, "desc"),
+        (func.coalesce(CatalogRating.num_votes, -1), "desc"),
+        (CatalogTitle.id, "desc"),
+    ]
 
     base = (
         db.query(CatalogTitle)
@@ -40,17 +51,25 @@ def search_titles(
 
     total = base.count()
 
-    results = (
-        base.order_by(
-            func.ts_rank(CatalogTitle.ts_vector, ts_query).desc(),
-            CatalogRating.num_votes.desc().nulls_last(),
-        )
-        .offset((page - 1) * limit)
-        .limit(limit)
+    query_rows = base.add_columns(*(expr for expr, _ in keyset))
+    if cursor:
+        after = decode_cursor(cursor, "search", len(keyset))
+        query_rows = query_rows.filter(keyset_filter(keyset, after))
+    else:
+        query_rows = query_rows.offset((page - 1) * limit)
+
+    rows = (
+        query_rows.order_by(*(expr.desc() for expr, _ in keyset))
+        .limit(limit + 1)
         .all()
     )
 
-    return results, total
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("search", list(rows[-1][1:]))
+
+    return [row[0] for row in rows], total, next_cursor
 
 
 def get_title_detail(db: Session, title_id: int) -> CatalogTitle | None:
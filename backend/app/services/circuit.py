@@ -0,0 +1,187 @@
+"""Circuit breakers and per-request latency budgets for third-party calls.
+
+Each upstream (TMDB, OMDb, OpenAI) has a breaker tracking the failure ratio
+of its calls over a rolling window. Once the ratio crosses the threshold the
+breaker opens and calls fail immediately with UpstreamUnavailable; after
+CIRCUIT_OPEN_SECONDS a single probe call is let through and its outcome
+closes or re-opens the breaker.
+
+A latency budget caps the total time a block of code may spend on upstream
+calls. Timeouts of calls inside the block are shrunk to what is left, and
+once it is spent further calls fail with LatencyBudgetExceeded, so request
+handlers fall back to cached or partial data instead of hanging.
+
+Both exceptions subclass httpx.RequestError, so existing
+`except httpx.HTTPError` handlers already treat them as a failed fetch.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_deadline_var: ContextVar[float | None] = ContextVar("latency_deadline", default=None)
+
+
+class UpstreamUnavailable(httpx.RequestError):
+    """The upstream's circuit is open; the call was not attempted."""
+
+
+class LatencyBudgetExceeded(httpx.TimeoutException):
+    """The enclosing latency budget was spent before the call could be made."""
+
+
+@contextmanager
+def latency_budget(seconds: float) -> Iterator[None]:
+    """Cap the time upstream calls in this block may take, nested budgets included."""
+    deadline = time.monotonic() + seconds
+    outer = _deadline_var.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline_var.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline_var.reset(token)
+
+
+def remaining_budget() -> float | None:
+    """Seconds left in the current latency budget, or None if there is none."""
+    deadline = _deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class CircuitBreaker:
+    """Rolling-window failure-ratio breaker: closed -> open -> half-open -> closed."""
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float,
+        min_requests: int,
+        failure_ratio: float,
+        open_seconds: float,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self._events: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise UpstreamUnavailable unless a call may be made now."""
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "open":
+                if now - self._opened_at < self.open_seconds:
+                    raise UpstreamUnavailable(f"{self.name} circuit is open")
+                self.state = "half_open"
+                self._probe_started = now
+            elif self.state == "half_open":
+                # One probe at a time; allow another if the last never reported back
+                if now - self._probe_started < self.open_seconds:
+                    raise UpstreamUnavailable(f"{self.name} circuit is half-open")
+                self._probe_started = now
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "half_open":
+                if ok:
+                    self._close()
+                else:
+                    self._open(now)
+                return
+            if self.state == "open":
+                return  # late result from before the breaker opened
+
+            self._events.append((now, ok))
+            while self._events and self._events[0][0] < now - self.window_seconds:
+                self._events.popleft()
+            failures = sum(1 for _, event_ok in self._events if not event_ok)
+            if len(self._events) >= self.min_requests and failures / len(self._events) >= self.failure_ratio:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        logger.warning("Circuit for %s opened", self.name)
+        self.state = "open"
+        self._opened_at = now
+        self._events.clear()
+
+    def _close(self) -> None:
+        logger.info("Circuit for %s closed", self.name)
+        self.state = "closed"
+        self._events.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "window_requests": len(self._events),
+                "window_failures": sum(1 for _, ok in self._events if not ok),
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            breaker = _breakers[upstream] = CircuitBreaker(
+                upstream,
+                window_seconds=settings.CIRCUIT_WINDOW_SECONDS,
+                min_requests=settings.CIRCUIT_MIN_REQUESTS,
+                failure_ratio=settings.CIRCUIT_FAILURE_RATIO,
+                open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            )
+        return breaker
+
+
+def get_circuit_metrics() -> dict[str, dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def is_failure(response: httpx.Response) -> bool:
+    """Server errors and throttling count against the upstream; 4xx lookups do not."""
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def apply_budget(request: httpx.Request) -> bool:
+    """Shrink the request's timeouts to the remaining budget. Returns True if shrunk."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return False
+    if remaining <= 0:
+        raise LatencyBudgetExceeded("Latency budget exhausted", request=request)
+    timeout = dict(request.extensions.get("timeout", {}))
+    shrunk = False
+    for key in ("connect", "read", "write", "pool"):
+        current = timeout.get(key)
+        if current is None or current > remaining:
+            timeout[key] = remaining
+            shrunk = True
+    request.extensions["timeout"] = timeout
+    return shrunk
@@ -5,6 +5,36 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.models.collection import Collection, CollectionItem
+from app.services.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_clause,
+    keyset_order_by,
+    keyset_select,
+)
+
+CURATED_KEYSET = [("ci.position", "asc"), ("ci.id", "asc")]
+
+# NULLs map to sentinels so they sort last; title_id makes each order total
+AUTO_KEYSETS = {
+    "popularity": [
+        ("tc.popularity", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+    "rating": [
+        ("COALESCE(tc.average_rating, -1)", "desc"),
+        ("COALESCE(tc.num_votes, -1)", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+    "year_desc": [
+        ("COALESCE(tc.start_year, -1)", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+    "votes": [
+        ("COALESCE(tc.num_votes, -1)", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+}
 
 
 @dataclass
@@ -36,14 +66,17 @@ def get_collection_movies(
     collection: Collection,
     page: int = 1,
     limit: int = 20,
-) -> tuple[list[CollectionTitle], int]:
-    """Get movies for a collection (curated or auto-generated)."""
-    offset = (page - 1) * limit
+    cursor: str | None = None,
+) -> tuple[list[CollectionTitle], int, str | None]:
+    """Get movies for a collection (curated or auto-generated).
 
+    Returns (movies, total, next_cursor); pass next_cursor back as `cursor` to
+    fetch the following page by keyset instead of OFFSET.
+    """
     if collection.collection_type == "curated":
-        return _get_curated_collection_movies(db, collection.id, page, limit)
+        return _get_curated_collection_movies(db, collection.id, page, limit, cursor)
     else:
-        return _get_auto_collection_movies(db, collection.query_params or {}, page, limit)
+        return _get_auto_collection_movies(db, collection.query_params or {}, page, limit, cursor)
 
 
 def _get_curated_collection_movies(
@@ -51,40 +84,51 @@ def _get_curated_collection_movies(
     collection_id: int,
     page: int,
     limit: int,
-) -> tuple[list[CollectionTitle], int]:
+    cursor: str | None = None,
+) -> tuple[list[CollectionTitle], int, str | None]:
     """Get movies from a curated collection using collection_items table."""
-    offset = (page - 1) * limit
+    after = decode_cursor(cursor, "curated", len(CURATED_KEYSET)) if cursor else None
+    offset = 0 if after is not None else (page - 1) * limit
+    params: dict = {"collection_id": collection_id, "limit": limit + 1, "offset": offset}
 
     # Get total count
     total = db.query(CollectionItem).filter(
         CollectionItem.collection_id == collection_id
     ).count()
 
+    where_clause = "ci.collection_id = :collection_id"
+    if after is not None:
+        seek_clause, seek_params = keyset_clause(CURATED_KEYSET, after)
+        where_clause = f"{where_clause} AND {seek_clause}"
+        params.update(seek_params)
+
     # Get items with movie details
-    query_sql = text("""
+    query_sql = text(f"""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
-            ct.poster_path,
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
+            tc.poster_path,
             ci.position,
-            cr.rt_critic_score
+            tc.rt_critic_score,
+            {keyset_select(CURATED_KEYSET)}
         FROM collection_items ci
-        JOIN catalog_titles ct ON ct.id = ci.title_id
-        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
-        WHERE ci.collection_id = :collection_id
-        ORDER BY ci.position ASC
+        JOIN title_cards tc ON tc.title_id = ci.title_id
+        WHERE {where_clause}
+        ORDER BY {keyset_order_by(CURATED_KEYSET)}
         LIMIT :limit OFFSET :offset
     """)
 
-    rows = db.execute(
-        query_sql,
-        {"collection_id": collection_id, "limit": limit, "offset": offset}
-    ).fetchall()
+    rows = db.execute(query_sql, params).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("curated", list(rows[-1][10:]))
 
     return [
         CollectionTitle(
@@ -100,7 +144,7 @@ def _get_curated_collection_movies(
             rt_critic_score=row[9],
         )
         for row in rows
-    ], total
+    ], total, next_cursor
 
 
 def _get_auto_collection_movies(
@@ -108,76 +152,81 @@ def _get_auto_collection_movies(
     query_params: dict[str, Any],
     page: int,
     limit: int,
-) -> tuple[list[CollectionTitle], int]:
+    cursor: str | None = None,
+) -> tuple[list[CollectionTitle], int, str | None]:
     """Get movies for an auto-generated collection based on query_params."""
-    offset = (page - 1) * limit
+    sort_by = query_params.get("sort_by", "popularity")
+    if sort_by not in AUTO_KEYSETS:
+        sort_by = "popularity"
+    keyset = AUTO_KEYSETS[sort_by]
+    after = decode_cursor(cursor, sort_by, len(keyset)) if cursor else None
+    offset = 0 if after is not None else (page - 1) * limit
 
-    filters = []
-    params: dict = {"limit": limit, "offset": offset}
+    filters = ["tc.has_rating"]
+    params: dict = {"limit": limit + 1, "offset": offset}
 
     # Parse query_params for filtering
     if genre := query_params.get("genre"):
-        filters.append("ct.genres ILIKE :genre")
+        filters.append("tc.genres ILIKE :genre")
         params["genre"] = f"%{genre}%"
 
     if (min_year := query_params.get("min_year")) is not None:
-        filters.append("ct.start_year >= :min_year")
+        filters.append("tc.start_year >= :min_year")
         params["min_year"] = min_year
 
     if (max_year := query_params.get("max_year")) is not None:
-        filters.append("ct.start_year <= :max_year")
+        filters.append("tc.start_year <= :max_year")
         params["max_year"] = max_year
 
     if (min_rating := query_params.get("min_rating")) is not None:
-        filters.append("cr.average_rating >= :min_rating")
+        filters.append("tc.average_rating >= :min_rating")
         params["min_rating"] = min_rating
 
     if (min_votes := query_params.get("min_votes")) is not None:
-        filters.append("cr.num_votes >= :min_votes")
+        filters.append("tc.num_votes >= :min_votes")
         params["min_votes"] = min_votes
 
-    where_clause = " AND ".join(filters) if filters else "TRUE"
-
-    # Determine sort order
-    sort_by = query_params.get("sort_by", "popularity")
-    sort_clauses = {
-        "popularity": "cr.average_rating * LN(cr.num_votes + 1) DESC",
-        "rating": "cr.average_rating DESC NULLS LAST",
-        "year_desc": "ct.start_year DESC NULLS LAST",
-        "votes": "cr.num_votes DESC NULLS LAST",
-    }
-    order_by = sort_clauses.get(sort_by, sort_clauses["popularity"])
+    where_clause = " AND ".join(filters)
 
     # Get total count
     count_sql = text(f"""
         SELECT COUNT(*)
-        FROM catalog_titles ct
-        JOIN catalog_ratings cr ON cr.title_id = ct.id
+        FROM title_cards tc
         WHERE {where_clause}
     """)
     total = db.execute(count_sql, params).scalar() or 0
 
+    if after is not None:
+        seek_clause, seek_params = keyset_clause(keyset, after)
+        where_clause = f"{where_clause} AND {seek_clause}"
+        params.update(seek_params)
+
     # Get results
     query_sql = text(f"""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
-            ct.poster_path,
-            cr.rt_critic_score
-        FROM catalog_titles ct
-        JOIN catalog_ratings cr ON cr.title_id = ct.id
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
+            tc.poster_path,
+            tc.rt_critic_score,
+            {keyset_select(keyset)}
+        FROM title_cards tc
         WHERE {where_clause}
-        ORDER BY {order_by}
+        ORDER BY {keyset_order_by(keyset)}
         LIMIT :limit OFFSET :offset
     """)
 
     rows = db.execute(query_sql, params).fetchall()
 
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort_by, list(rows[-1][9:]))
+
     return [
         CollectionTitle(
             title_id=row[0],
@@ -191,7 +240,7 @@ def _get_auto_collection_movies(
             rt_critic_score=row[8],
         )
         for row in rows
-    ], total
+    ], total, next_cursor
 
 
 def seed_default_collections(db: Session) -> None:
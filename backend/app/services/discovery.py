@@ -2,16 +2,32 @@ from dataclasses import dataclass
 import logging
 from typing import Literal
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models.catalog import CatalogPerson, CatalogTitle
+from app.services.cache import TTLCache
+from app.services.enrichment import enqueue_omdb_ratings
+from app.services.enrichment_state import OMDB_RATINGS
+from app.services.omdb import omdb_ratings_stale
+from app.services.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_clause,
+    keyset_order_by,
+    keyset_select,
+)
+from app.services.snapshot import CatalogSnapshot, get_snapshot
 
 logger = logging.getLogger(__name__)
 
 MODEL_ID = settings.EMBEDDING_MODEL
 
+# Facet counts and the language list are full-catalog aggregates; cache them
+facet_cache = TTLCache(ttl_seconds=settings.FACET_CACHE_TTL_SECONDS)
+
 
 @dataclass
 class BrowseResult:
@@ -59,6 +75,41 @@ class PersonFilmography:
 
 SortOption = Literal["popularity", "rating", "year_desc", "year_asc"]
 
+# Keyset for each browse sort: NULLs are mapped to sentinels so they sort last
+# (matching NULLS LAST) and the title id makes the order total for cursors.
+BROWSE_KEYSETS = {
+    "popularity": [
+        ("tc.popularity", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+    "rating": [
+        ("COALESCE(tc.average_rating, -1)", "desc"),
+        ("COALESCE(tc.num_votes, -1)", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+    "year_desc": [
+        ("COALESCE(tc.start_year, -1)", "desc"),
+        ("COALESCE(tc.num_votes, -1)", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+    "year_asc": [
+        ("COALESCE(tc.start_year, 2147483647)", "asc"),
+        ("COALESCE(tc.num_votes, -1)", "desc"),
+        ("tc.title_id", "desc"),
+    ],
+}
+
+
+def _available_on_sql(provider_ids, region: str, params: dict) -> str:
+    """Predicate: title streams (flatrate) on any of provider_ids in region."""
+    params["provider_ids"] = list(provider_ids)
+    params["region"] = region
+    return (
+        "EXISTS (SELECT 1 FROM title_availability ta WHERE ta.title_id = tc.title_id "
+        "AND ta.region = :region "
+        "AND ta.flatrate_provider_ids && CAST(:provider_ids AS integer[]))"
+    )
+
 
 def browse_catalog(
     db: Session,
@@ -73,21 +124,55 @@ def browse_catalog(
     max_runtime: int | None = None,
     language: str | None = None,
     provider_ids: list[int] | None = None,
+    region: str = "US",
     sort_by: SortOption = "popularity",
     page: int = 1,
     limit: int = 20,
     exclude_watched_profile_id: int | None = None,
-) -> tuple[list[BrowseResult], int]:
-    """Browse the catalog with filters and sorting."""
-    offset = (page - 1) * limit
+    cursor: str | None = None,
+) -> tuple[list[BrowseResult], int, str | None]:
+    """Browse the catalog with filters and sorting.
+
+    Served from the in-memory catalog snapshot when one is loaded; otherwise
+    filters and sorts in Postgres. When `cursor` is given, the page starts
+    right after the cursor's row (keyset pagination) and `page` is ignored.
+    Returns (results, total, next_cursor).
+    """
+    if sort_by not in BROWSE_KEYSETS:
+        sort_by = "popularity"
+    keyset = BROWSE_KEYSETS[sort_by]
+    after = decode_cursor(cursor, sort_by, len(keyset)) if cursor else None
+    offset = 0 if after is not None else (page - 1) * limit
+
+    snapshot = get_snapshot()
+    if snapshot is not None and (not provider_ids or region == snapshot.provider_region):
+        return _browse_from_snapshot(
+            db,
+            snapshot,
+            genres=genres or ([genre] if genre else None),
+            min_year=decade if decade is not None else min_year,
+            max_year=decade + 9 if decade is not None else max_year,
+            min_rating=min_rating,
+            min_rt_score=min_rt_score,
+            min_runtime=min_runtime,
+            max_runtime=max_runtime,
+            language=language,
+            provider_ids=provider_ids,
+            sort_by=sort_by,
+            offset=offset,
+            limit=limit,
+            exclude_watched_profile_id=exclude_watched_profile_id,
+            after=after,
+        )
 
     filters = []
-    params: dict = {"limit": limit, "offset": offset}
+    # Fetch one extra row to learn whether another page exists
+    params: dict = {"limit": limit + 1, "offset": offset}
 
     # Exclude watched movies if profile_id is provided
     if exclude_watched_profile_id is not None:
         filters.append(
-            "ct.id NOT IN (SELECT title_id FROM watches WHERE profile_id = :exclude_profile_id)"
+            "tc.title_id NOT IN (SELECT title_id FROM watches WHERE profile_id = :exclude_profile_id)"
         )
         params["exclude_profile_id"] = exclude_watched_profile_id
 
@@ -101,84 +186,80 @@ def browse_catalog(
         genre_clauses = []
         for i, g in enumerate(genres):
             param_name = f"genre_{i}"
-            genre_clauses.append(f"ct.genres ILIKE :{param_name}")
+            genre_clauses.append(f"tc.genres ILIKE :{param_name}")
             params[param_name] = f"%{g}%"
         filters.append(f"({' OR '.join(genre_clauses)})")
     elif genre:
-        filters.append("ct.genres ILIKE :genre")
+        filters.append("tc.genres ILIKE :genre")
         params["genre"] = f"%{genre}%"
 
     if min_year is not None:
-        filters.append("ct.start_year >= :min_year")
+        filters.append("tc.start_year >= :min_year")
         params["min_year"] = min_year
     if max_year is not None:
-        filters.append("ct.start_year <= :max_year")
+        filters.append("tc.start_year <= :max_year")
         params["max_year"] = max_year
     if min_rating is not None:
-        filters.append("cr.average_rating >= :min_rating")  # This implicitly excludes NULLs
+        filters.append("tc.average_rating >= :min_rating")  # This implicitly excludes NULLs
         params["min_rating"] = min_rating
     if min_rt_score is not None:
-        filters.append("cr.rt_critic_score >= :min_rt_score")
+        filters.append("tc.rt_critic_score >= :min_rt_score")
         params["min_rt_score"] = min_rt_score
     if min_runtime is not None:
-        filters.append("ct.runtime_minutes >= :min_runtime")
+        filters.append("tc.runtime_minutes >= :min_runtime")
         params["min_runtime"] = min_runtime
     if max_runtime is not None:
-        filters.append("ct.runtime_minutes <= :max_runtime")
+        filters.append("tc.runtime_minutes <= :max_runtime")
         params["max_runtime"] = max_runtime
     if language is not None:
-        filters.append("ct.original_language = :language")
+        filters.append("tc.original_language = :language")
         params["language"] = language
     if provider_ids:
-        pid_placeholders = ", ".join(f":pid_{i}" for i in range(len(provider_ids)))
-        for i, pid in enumerate(provider_ids):
-            params[f"pid_{i}"] = pid
-        filters.append(
-            f"EXISTS (SELECT 1 FROM watch_providers wp WHERE wp.title_id = ct.id AND wp.provider_id IN ({pid_placeholders}) AND wp.provider_type = 'flatrate')"
-        )
+        filters.append(_available_on_sql(provider_ids, region, params))
 
     where_clause = " AND ".join(filters) if filters else "TRUE"
 
-    # Determine sort order (NULLS LAST for ratings since we use LEFT JOIN)
-    sort_clauses = {
-        "popularity": "COALESCE(cr.average_rating * LN(cr.num_votes + 1), 0) DESC",
-        "rating": "cr.average_rating DESC NULLS LAST, cr.num_votes DESC NULLS LAST",
-        "year_desc": "ct.start_year DESC NULLS LAST, cr.num_votes DESC NULLS LAST",
-        "year_asc": "ct.start_year ASC NULLS LAST, cr.num_votes DESC NULLS LAST",
-    }
-    order_by = sort_clauses.get(sort_by, sort_clauses["popularity"])
-
     # Get total count
     count_sql = text(f"""
         SELECT COUNT(*)
-        FROM catalog_titles ct
-        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+        FROM title_cards tc
         WHERE {where_clause}
     """)
     total = db.execute(count_sql, params).scalar() or 0
 
+    # Seek past the cursor row instead of scanning and discarding OFFSET rows
+    if after is not None:
+        seek_clause, seek_params = keyset_clause(keyset, after)
+        where_clause = f"{where_clause} AND {seek_clause}"
+        params.update(seek_params)
+
     # Get results
     query_sql = text(f"""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.runtime_minutes,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
-            ct.poster_path,
-            cr.rt_critic_score
-        FROM catalog_titles ct
-        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.runtime_minutes,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
+            tc.poster_path,
+            tc.rt_critic_score,
+            {keyset_select(keyset)}
+        FROM title_cards tc
         WHERE {where_clause}
-        ORDER BY {order_by}
+        ORDER BY {keyset_order_by(keyset)}
         LIMIT :limit OFFSET :offset
     """)
 
     rows = db.execute(query_sql, params).fetchall()
 
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort_by, list(rows[-1][10:]))
+
     results = [
         BrowseResult(
             title_id=row[0],
@@ -195,7 +276,99 @@ def browse_catalog(
         for row in rows
     ]
 
-    return results, total
+    return results, total, next_cursor
+
+
+def _browse_from_snapshot(
+    db: Session,
+    snapshot: CatalogSnapshot,
+    genres: list[str] | None,
+    min_year: int | None,
+    max_year: int | None,
+    min_rating: float | None,
+    min_rt_score: int | None,
+    min_runtime: int | None,
+    max_runtime: int | None,
+    language: str | None,
+    provider_ids: list[int] | None,
+    sort_by: SortOption,
+    offset: int,
+    limit: int,
+    exclude_watched_profile_id: int | None,
+    after: list | None = None,
+) -> tuple[list[BrowseResult], int, str | None]:
+    """Evaluate browse filters as vectorized masks, then fetch only the page's cards."""
+    watched_ids = None
+    if exclude_watched_profile_id is not None:
+        watched_ids = [
+            row[0]
+            for row in db.execute(
+                text("SELECT title_id FROM watches WHERE profile_id = :profile_id"),
+                {"profile_id": exclude_watched_profile_id},
+            )
+        ]
+
+    mask = snapshot.base_mask(
+        min_rating=min_rating,
+        min_rt_score=min_rt_score,
+        min_runtime=min_runtime,
+        max_runtime=max_runtime,
+        exclude_title_ids=watched_ids,
+    )
+    if genres:
+        mask &= snapshot.genre_mask(genres)
+    if min_year is not None or max_year is not None:
+        mask &= snapshot.year_mask(min_year, max_year)
+    if language is not None:
+        mask &= snapshot.language_mask(language)
+    if provider_ids:
+        mask &= snapshot.provider_mask(provider_ids)
+
+    page_ids, total, next_keys = snapshot.page(mask, sort_by, offset, limit, after=after)
+    next_cursor = encode_cursor(sort_by, next_keys) if next_keys is not None else None
+    return _fetch_browse_results(db, page_ids), total, next_cursor
+
+
+def _fetch_browse_results(db: Session, title_ids: list[int]) -> list[BrowseResult]:
+    """Load card data for the given titles, preserving the order of title_ids."""
+    if not title_ids:
+        return []
+
+    rows = db.execute(
+        text("""
+            SELECT
+                tc.title_id,
+                tc.imdb_tconst,
+                tc.primary_title,
+                tc.start_year,
+                tc.runtime_minutes,
+                tc.genres,
+                tc.average_rating,
+                tc.num_votes,
+                tc.poster_path,
+                tc.rt_critic_score
+            FROM title_cards tc
+            WHERE tc.title_id = ANY(:title_ids)
+        """),
+        {"title_ids": title_ids},
+    ).fetchall()
+
+    by_id = {
+        row[0]: BrowseResult(
+            title_id=row[0],
+            imdb_tconst=row[1],
+            primary_title=row[2],
+            start_year=row[3],
+            runtime_minutes=row[4],
+            genres=row[5],
+            average_rating=row[6],
+            num_votes=row[7],
+            poster_path=row[8],
+            rt_critic_score=row[9],
+        )
+        for row in rows
+    }
+    return [by_id[tid] for tid in title_ids if tid in by_id]
 
 
 def get_similar_movies(
@@ -218,21 +391,21 @@ def get_similar_movies(
     # Use vector similarity
     query_sql = text("""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.runtime_minutes,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.runtime_minutes,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
             1 - (me.embedding <=> (SELECT embedding FROM movie_embeddings WHERE title_id = :title_id AND model_id = :model_id)) AS similarity_score,
-            ct.poster_path,
-            cr.rt_critic_score
+            tc.poster_path,
+            tc.rt_critic_score
         FROM movie_embeddings me
-        JOIN catalog_titles ct ON ct.id = me.title_id
-        JOIN catalog_ratings cr ON cr.title_id = ct.id
+        JOIN title_cards tc ON tc.title_id = me.title_id
         WHERE me.model_id = :model_id
+          AND tc.has_rating
           AND me.title_id != :title_id
         ORDER BY me.embedding <=> (SELECT embedding FROM movie_embeddings WHERE title_id = :title_id AND model_id = :model_id) ASC
         LIMIT :limit
@@ -269,18 +442,18 @@ def _get_similar_by_metadata(
     if not source:
         return []
 
-    filters = ["ct.id != :title_id"]
+    filters = ["tc.has_rating", "tc.title_id != :title_id"]
     params: dict = {"title_id": title_id, "limit": limit}
 
     # Match primary genre if available
     if source.genres:
         primary_genre = source.genres.split(",")[0].strip()
-        filters.append("ct.genres ILIKE :genre")
+        filters.append("tc.genres ILIKE :genre")
         params["genre"] = f"%{primary_genre}%"
 
     # Similar year range (+/- 10 years)
     if source.start_year:
-        filters.append("ct.start_year BETWEEN :min_year AND :max_year")
+        filters.append("tc.start_year BETWEEN :min_year AND :max_year")
         params["min_year"] = source.start_year - 10
         params["max_year"] = source.start_year + 10
 
@@ -288,21 +461,20 @@ def _get_similar_by_metadata(
 
     query_sql = text(f"""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.runtime_minutes,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.runtime_minutes,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
             0.0 AS similarity_score,
-            ct.poster_path,
-            cr.rt_critic_score
-        FROM catalog_titles ct
-        JOIN catalog_ratings cr ON cr.title_id = ct.id
+            tc.poster_path,
+            tc.rt_critic_score
+        FROM title_cards tc
         WHERE {where_clause}
-        ORDER BY cr.average_rating * LN(cr.num_votes + 1) DESC
+        ORDER BY tc.popularity DESC, tc.title_id DESC
         LIMIT :limit
     """)
 
@@ -338,22 +510,21 @@ def get_person_filmography(
     """Get a person's filmography with all their movie credits."""
     query_sql = text("""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.genres,
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.genres,
             cp.category,
             cp.characters,
-            cr.average_rating,
-            cr.num_votes,
-            ct.poster_path,
-            cr.rt_critic_score
+            tc.average_rating,
+            tc.num_votes,
+            tc.poster_path,
+            tc.rt_critic_score
         FROM catalog_principals cp
-        JOIN catalog_titles ct ON ct.id = cp.title_id
-        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+        JOIN title_cards tc ON tc.title_id = cp.title_id
         WHERE cp.person_id = :person_id
-        ORDER BY ct.start_year DESC NULLS LAST, cr.num_votes DESC NULLS LAST
+        ORDER BY tc.start_year DESC NULLS LAST, tc.num_votes DESC NULLS LAST
     """)
 
     rows = db.execute(query_sql, {"person_id": person_id}).fetchall()
@@ -520,21 +691,21 @@ def _get_trending_row(
             db,
             "trending",
             "Trending Now",
-            "COALESCE(cr.average_rating * LN(cr.num_votes + 1), 0) DESC",
+            "tc.popularity DESC",
             limit=limit,
             exclude_watched_profile_id=exclude_watched_profile_id,
         )
 
     # Build query with the specific title_ids in order (parameterized)
-    params: dict = {"limit": limit}
+    params: dict = {"limit": limit, "omdb_field": OMDB_RATINGS}
     tid_placeholders = ", ".join(f":tid_{i}" for i in range(len(title_ids)))
     for i, tid in enumerate(title_ids):
         params[f"tid_{i}"] = tid
-    filters = [f"ct.id IN ({tid_placeholders})"]
+    filters = [f"tc.title_id IN ({tid_placeholders})"]
 
     if exclude_watched_profile_id is not None:
         filters.append(
-            "ct.id NOT IN (SELECT title_id FROM watches WHERE profile_id = :exclude_profile_id)"
+            "tc.title_id NOT IN (SELECT title_id FROM watches WHERE profile_id = :exclude_profile_id)"
         )
         params["exclude_profile_id"] = exclude_watched_profile_id
 
@@ -542,22 +713,29 @@ def _get_trending_row(
 
     # Build CASE statement to maintain TMDB trending order (parameterized)
     order_cases = " ".join(f"WHEN :tid_{i} THEN {i}" for i in range(len(title_ids)))
-    order_clause = f"CASE ct.id {order_cases} END"
+    order_clause = f"CASE tc.title_id {order_cases} END"
+
+    # Cards carry no fetch times: catalog_ratings is joined only for the OMDb staleness check
 
     query_sql = text(f"""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.runtime_minutes,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
-            ct.poster_path,
-            cr.rt_critic_score
-        FROM catalog_titles ct
-        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.runtime_minutes,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
+            tc.poster_path,
+            tc.rt_critic_score,
+            tc.has_rating,
+            cr.omdb_fetched_at,
+            COALESCE(tes.next_check_at > now(), false) AS omdb_suppressed
+        FROM title_cards tc
+        LEFT JOIN catalog_ratings cr ON cr.title_id = tc.title_id
+        LEFT JOIN title_enrichment_state tes
+            ON tes.title_id = tc.title_id AND tes.field = :omdb_field AND tes.not_available
         WHERE {where_clause}
         ORDER BY {order_clause}
         LIMIT :limit
@@ -584,23 +762,11 @@ def _get_trending_row(
         for row in rows
     ]
 
-    # Lazy-fetch OMDb ratings for trending movies missing RT scores
-    missing = [m for m in movies if m.rt_critic_score is None]
-    if missing:
-        from app.services.omdb import get_or_fetch_omdb_ratings
-
-        missing_ids = [m.title_id for m in missing]
-        titles = db.query(CatalogTitle).filter(CatalogTitle.id.in_(missing_ids)).all()
-        scores_map = {}
-        for title in titles:
-            try:
-                scores = get_or_fetch_omdb_ratings(db, title)
-                scores_map[title.id] = scores.get("rt_critic_score")
-            except Exception:
-                logger.debug("OMDb fetch failed for %s", title.imdb_tconst)
-        for m in missing:
-            if m.title_id in scores_map:
-                m.rt_critic_score = scores_map[m.title_id]
+    # Fill missing or stale RT scores in the background for a later request
+    enqueue_omdb_ratings([
+        (row[0], row[1]) for row in rows
+        if row[10] and omdb_ratings_stale(row[11]) and not row[12]
+    ])
 
     return FeaturedRow(id="trending", title="Trending Now", movies=movies)
 
@@ -627,7 +793,7 @@ def get_featured_rows(
         db,
         "new-releases",
         "New Releases",
-        "COALESCE(cr.average_rating * LN(cr.num_votes + 1), 0) DESC",
+        "tc.popularity DESC",
         min_year=2024,
         limit=limit,
         exclude_watched_profile_id=exclude_watched_profile_id,
@@ -641,7 +807,7 @@ def get_featured_rows(
             db,
             genre.lower().replace("-", ""),
             genre,
-            "COALESCE(cr.average_rating * LN(cr.num_votes + 1), 0) DESC",
+            "tc.popularity DESC",
             genre_filter=genre,
             limit=limit,
             exclude_watched_profile_id=exclude_watched_profile_id,
@@ -667,16 +833,16 @@ def _get_row_by_query(
     params: dict = {"limit": limit}
 
     if genre_filter:
-        filters.append("ct.genres ILIKE :row_genre")
+        filters.append("tc.genres ILIKE :row_genre")
         params["row_genre"] = f"%{genre_filter}%"
     if min_year is not None:
-        filters.append("ct.start_year >= :row_min_year")
+        filters.append("tc.start_year >= :row_min_year")
         params["row_min_year"] = min_year
 
     # Exclude watched movies if profile_id is provided
     if exclude_watched_profile_id is not None:
         filters.append(
-            "ct.id NOT IN (SELECT title_id FROM watches WHERE profile_id = :exclude_profile_id)"
+            "tc.title_id NOT IN (SELECT title_id FROM watches WHERE profile_id = :exclude_profile_id)"
         )
         params["exclude_profile_id"] = exclude_watched_profile_id
 
@@ -684,18 +850,17 @@ def _get_row_by_query(
 
     query_sql = text(f"""
         SELECT
-            ct.id AS title_id,
-            ct.imdb_tconst,
-            ct.primary_title,
-            ct.start_year,
-            ct.runtime_minutes,
-            ct.genres,
-            cr.average_rating,
-            cr.num_votes,
-            ct.poster_path,
-            cr.rt_critic_score
-        FROM catalog_titles ct
-        LEFT JOIN catalog_ratings cr ON cr.title_id = ct.id
+            tc.title_id,
+            tc.imdb_tconst,
+            tc.primary_title,
+            tc.start_year,
+            tc.runtime_minutes,
+            tc.genres,
+            tc.average_rating,
+            tc.num_votes,
+            tc.poster_path,
+            tc.rt_critic_score
+        FROM title_cards tc
         WHERE {where_clause}
         ORDER BY {order_by}
         LIMIT :limit
@@ -733,6 +898,10 @@ class LanguageOption:
 
 def get_available_languages(db: Session) -> list[LanguageOption]:
     """Get available original languages from catalog_titles with at least 10 titles."""
+    return facet_cache.get_or_compute(("languages",), lambda: _query_available_languages(db))
+
+
+def _query_available_languages(db: Session) -> list[LanguageOption]:
     query_sql = text("""
         SELECT original_language, COUNT(*) AS cnt
         FROM catalog_titles
@@ -743,3 +912,229 @@ def get_available_languages(db: Session) -> list[LanguageOption]:
     """)
     rows = db.execute(query_sql).fetchall()
     return [LanguageOption(code=row[0], count=row[1]) for row in rows]
+
+
+@dataclass
+class FacetCount:
+    value: str
+    count: int
+
+
+@dataclass
+class CatalogFacets:
+    genres: list[FacetCount]
+    decades: list[FacetCount]
+    languages: list[FacetCount]
+    providers: list[FacetCount]
+
+
+def get_catalog_facets(
+    db: Session,
+    genre: str | None = None,
+    genres: list[str] | None = None,
+    min_year: int | None = None,
+    max_year: int | None = None,
+    decade: int | None = None,
+    min_rating: float | None = None,
+    min_rt_score: int | None = None,
+    min_runtime: int | None = None,
+    max_runtime: int | None = None,
+    language: str | None = None,
+    provider_ids: list[int] | None = None,
+    region: str = "US",
+) -> CatalogFacets:
+    """Count titles per genre, decade, language and provider for a filter state.
+
+    Each facet applies every active filter except its own dimension, so the
+    sidebar can show how many titles each alternative option would give.
+    Results are cached by the normalized filter key.
+    """
+    # Normalize the filter state the same way browse_catalog interprets it
+    if decade is not None:
+        min_year = decade
+        max_year = decade + 9
+    genre_list = genres or ([genre] if genre else [])
+    key = (
+        "facets",
+        tuple(sorted({g.strip().lower() for g in genre_list if g.strip()})),
+        min_year,
+        max_year,
+        min_rating,
+        min_rt_score,
+        min_runtime,
+        max_runtime,
+        language,
+        tuple(sorted(set(provider_ids or []))),
+        region,
+    )
+    return facet_cache.get_or_compute(key, lambda: _query_catalog_facets(db, *key[1:]))
+
+
+def _query_catalog_facets(
+    db: Session,
+    genres: tuple[str, ...],
+    min_year: int | None,
+    max_year: int | None,
+    min_rating: float | None,
+    min_rt_score: int | None,
+    min_runtime: int | None,
+    max_runtime: int | None,
+    language: str | None,
+    provider_ids: tuple[int, ...],
+    region: str,
+) -> CatalogFacets:
+    """Compute all four facets in a single grouped query over one filtered scan."""
+    snapshot = get_snapshot()
+    if snapshot is not None and region == snapshot.provider_region:
+        return _facets_from_snapshot(
+            snapshot, genres, min_year, max_year, min_rating, min_rt_score,
+            min_runtime, max_runtime, language, provider_ids,
+        )
+
+    filters = []
+    params: dict = {}
+
+    # Non-facet filters restrict the base set for every facet
+    if min_rating is not None:
+        filters.append("tc.average_rating >= :min_rating")
+        params["min_rating"] = min_rating
+    if min_rt_score is not None:
+        filters.append("tc.rt_critic_score >= :min_rt_score")
+        params["min_rt_score"] = min_rt_score
+    if min_runtime is not None:
+        filters.append("tc.runtime_minutes >= :min_runtime")
+        params["min_runtime"] = min_runtime
+    if max_runtime is not None:
+        filters.append("tc.runtime_minutes <= :max_runtime")
+        params["max_runtime"] = max_runtime
+
+    # Facet dimensions become per-row match flags instead of WHERE clauses
+    genre_pred = "TRUE"
+    if genres:
+        genre_clauses = []
+        for i, g in enumerate(genres):
+            genre_clauses.append(f"tc.genres ILIKE :genre_{i}")
+            params[f"genre_{i}"] = f"%{g}%"
+        genre_pred = f"COALESCE({' OR '.join(genre_clauses)}, FALSE)"
+
+    year_clauses = []
+    if min_year is not None:
+        year_clauses.append("tc.start_year >= :min_year")
+        params["min_year"] = min_year
+    if max_year is not None:
+        year_clauses.append("tc.start_year <= :max_year")
+        params["max_year"] = max_year
+    year_pred = f"COALESCE({' AND '.join(year_clauses)}, FALSE)" if year_clauses else "TRUE"
+
+    language_pred = "TRUE"
+    if language is not None:
+        language_pred = "COALESCE(tc.original_language = :language, FALSE)"
+        params["language"] = language
+
+    provider_pred = "TRUE"
+    if provider_ids:
+        provider_pred = _available_on_sql(provider_ids, region, params)
+    params["region"] = region
+
+    where_clause = " AND ".join(filters) if filters else "TRUE"
+
+    query_sql = text(f"""
+        WITH base AS MATERIALIZED (
+            SELECT
+                tc.title_id AS id,
+                tc.genres,
+                tc.start_year,
+                tc.original_language,
+                {genre_pred} AS m_genre,
+                {year_pred} AS m_year,
+                {language_pred} AS m_language,
+                {provider_pred} AS m_provider
+            FROM title_cards tc
+            WHERE {where_clause}
+        )
+        SELECT 'genre' AS facet, TRIM(g) AS value, COUNT(*) AS cnt
+        FROM base, LATERAL unnest(string_to_array(base.genres, ',')) AS g
+        WHERE m_year AND m_language AND m_provider
+        GROUP BY TRIM(g)
+        UNION ALL
+        SELECT 'decade', ((start_year / 10) * 10)::text, COUNT(*)
+        FROM base
+        WHERE start_year IS NOT NULL AND m_genre AND m_language AND m_provider
+        GROUP BY (start_year / 10) * 10
+        UNION ALL
+        SELECT 'language', original_language, COUNT(*)
+        FROM base
+        WHERE original_language IS NOT NULL AND original_language != ''
+          AND m_genre AND m_year AND m_provider
+        GROUP BY original_language
+        UNION ALL
+        SELECT 'provider', pid::text, COUNT(*)
+        FROM base
+        JOIN title_availability ta ON ta.title_id = base.id AND ta.region = :region,
+        LATERAL unnest(ta.flatrate_provider_ids) AS pid
+        WHERE m_genre AND m_year AND m_language
+        GROUP BY pid
+    """)
+
+    rows = db.execute(query_sql, params).fetchall()
+
+    buckets: dict[str, list[FacetCount]] = {"genre": [], "decade": [], "language": [], "provider": []}
+    for facet, value, count in rows:
+        buckets[facet].append(FacetCount(value=value, count=count))
+
+    # Decades read chronologically; everything else by descending count
+    for facet, items in buckets.items():
+        if facet == "decade":
+            items.sort(key=lambda f: int(f.value))
+        else:
+            items.sort(key=lambda f: (-f.count, f.value))
+
+    return CatalogFacets(
+        genres=buckets["genre"],
+        decades=buckets["decade"],
+        languages=buckets["language"],
+        providers=buckets["provider"],
+    )
+
+
+def _facets_from_snapshot(
+    snapshot: CatalogSnapshot,
+    genres: tuple[str, ...],
+    min_year: int | None,
+    max_year: int | None,
+    min_rating: float | None,
+    min_rt_score: int | None,
+    min_runtime: int | None,
+    max_runtime: int | None,
+    language: str | None,
+    provider_ids: tuple[int, ...],
+) -> CatalogFacets:
+    """Compute facet counts from the columnar snapshot instead of Postgres."""
+    n = len(snapshot.ids)
+    counts = snapshot.facet_counts(
+        base=snapshot.base_mask(
+            min_rating=min_rating,
+            min_rt_score=min_rt_score,
+            min_runtime=min_runtime,
+            max_runtime=max_runtime,
+        ),
+        m_genre=snapshot.genre_mask(list(genres)) if genres else np.ones(n, dtype=bool),
+        m_year=snapshot.year_mask(min_year, max_year),
+        m_language=snapshot.language_mask(language) if language is not None else np.ones(n, dtype=bool),
+        m_provider=snapshot.provider_mask(list(provider_ids)) if provider_ids else np.ones(n, dtype=bool),
+    )
+
+    buckets = {
+        facet: [FacetCount(value=value, count=count) for value, count in items]
+        for facet, items in counts.items()
+    }
+    buckets["decade"].sort(key=lambda f: int(f.value))
+    for facet in ("genre", "language", "provider"):
+        buckets[facet].sort(key=lambda f: (-f.count, f.value))
+
+    return CatalogFacets(
+        genres=buckets["genre"],
+        decades=buckets["decade"],
+        languages=buckets["language"],
+        providers=buckets["provider"],
+    )
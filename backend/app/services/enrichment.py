@@ -0,0 +1,236 @@
+"""Background enrichment of catalog titles from TMDB and OMDb.
+
+Request handlers serve whatever is cached and enqueue titles with missing or
+stale third-party data here. A small worker pool fetches them with bounded
+concurrency, and results are written back in batches on a separate session,
+so request latency never depends on an upstream API.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.background import PeriodicTask
+from app.services.cache import TTLCache
+from app.services.circuit import latency_budget
+from app.services.omdb import fetch_omdb_ratings_on_demand, store_omdb_ratings
+from app.services.ratelimit import rate_limit_lane
+from app.services.tmdb import fetch_movie_details_from_tmdb, store_movie_details
+
+logger = logging.getLogger(__name__)
+
+# fetch key (what the queue's fetch takes) -> fetched payload, or None to skip the write
+FetchFn = Callable[[Any], dict | None]
+WriteBatchFn = Callable[[list[tuple[int, dict]]], None]
+
+
+class EnrichmentQueue:
+    """Deduplicated, bounded queue of titles to enrich in the background.
+
+    A title id is accepted once while pending and is not re-accepted until
+    `retry_seconds` after its last attempt. Workers start on the first
+    enqueue; when `max_pending` ids are pending new ids are dropped and
+    picked up again on a later request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: FetchFn,
+        write_batch: WriteBatchFn,
+        enabled: Callable[[], bool],
+        workers: int,
+        batch_size: int,
+        flush_seconds: float,
+        max_pending: int,
+        retry_seconds: float,
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.write_batch = write_batch
+        self.enabled = enabled
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # Unbounded, so stop() can always queue its sentinels; enqueue() caps it
+        self._queue: queue.Queue[tuple[int, Any] | None] = queue.Queue()
+        self._pending: set[int] = set()
+        self._attempted = TTLCache(ttl_seconds=retry_seconds, max_entries=max_pending * 10)
+        self._results: list[tuple[int, dict]] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._stop_deadline = 0.0
+        self._flusher = PeriodicTask(
+            f"{name}-flush", flush_seconds, self.flush, run_immediately=False
+        )
+
+    def enqueue(self, items: list[tuple[int, Any]]) -> int:
+        """Queue (title_id, fetch key) pairs for enrichment. Returns how many were accepted."""
+        if not items or not self.enabled():
+            return 0
+        self._ensure_started()
+
+        accepted = 0
+        with self._lock:
+            for title_id, key in items:
+                if title_id in self._pending or self._attempted.get(title_id) is not None:
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    break
+                self._queue.put_nowait((title_id, key))
+                self._pending.add(title_id)
+                accepted += 1
+        return accepted
+
+    def flush(self) -> None:
+        """Write all buffered results in one batch."""
+        with self._lock:
+            results, self._results = self._results, []
+        if not results:
+            return
+        with self._write_lock:
+            try:
+                self.write_batch(results)
+            except Exception:
+                logger.exception("Enrichment queue %s failed to write %d results", self.name, len(results))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop workers within `timeout`, then write whatever has been fetched so far.
+
+        Workers keep fetching queued titles until the deadline, each fetch
+        capped by what is left of it; titles still queued then are dropped.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop_deadline = time.monotonic() + timeout
+        self._stopping.set()
+        for _ in threads:
+            self._queue.put_nowait(None)  # behind the backlog, drained once past the deadline
+        for t in threads:
+            t.join(timeout=max(0.0, self._stop_deadline - time.monotonic()))
+        self._flusher.stop(timeout=timeout)
+        self.flush()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            if self._stopping.is_set():
+                # Workers a stop() gave up on may still hold the old queue and its sentinels
+                self._queue = queue.Queue()
+                self._pending.clear()
+                self._stopping.clear()
+            for i in range(self.workers):
+                t = threading.Thread(
+                    target=self._work, args=(self._queue,), name=f"{self.name}-{i}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+        self._flusher.start()
+
+    def _work(self, work: "queue.Queue[tuple[int, Any] | None]") -> None:
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            title_id, key = item
+            budget = nullcontext()
+            if self._stopping.is_set():
+                remaining = self._stop_deadline - time.monotonic()
+                if remaining <= 0:
+                    # Past the stop deadline: drain without fetching
+                    with self._lock:
+                        self._pending.discard(title_id)
+                    continue
+                budget = latency_budget(remaining)
+            try:
+                # Background fills yield upstream budget to interactive requests
+                with rate_limit_lane("bulk"), budget:
+                    payload = self.fetch(key)
+            except Exception:
+                logger.exception("Enrichment queue %s failed to fetch %s", self.name, key)
+                payload = None
+
+            full = False
+            with self._lock:
+                self._pending.discard(title_id)
+                self._attempted.set(title_id, True)
+                if payload is not None:
+                    self._results.append((title_id, payload))
+                    full = len(self._results) >= self.batch_size
+            if full:
+                self.flush()
+
+
+def _fetch_movie_details(key: tuple[str, int | None]) -> dict | None:
+    # A stored tmdb_id skips the /find lookup
+    imdb_tconst, tmdb_id = key
+    return fetch_movie_details_from_tmdb(imdb_tconst, tmdb_id)
+
+
+def _write_movie_details(results: list[tuple[int, dict]]) -> None:
+    db = SessionLocal()
+    try:
+        store_movie_details(db, results)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _write_omdb_ratings(results: list[tuple[int, dict]]) -> None:
+    db = SessionLocal()
+    try:
+        store_omdb_ratings(db, results)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _queue_kwargs() -> dict:
+    return {
+        "workers": settings.ENRICHMENT_WORKERS,
+        "batch_size": settings.ENRICHMENT_BATCH_SIZE,
+        "flush_seconds": settings.ENRICHMENT_FLUSH_SECONDS,
+        "max_pending": settings.ENRICHMENT_MAX_PENDING,
+        "retry_seconds": settings.ENRICHMENT_RETRY_SECONDS,
+    }
+
+
+tmdb_details_queue = EnrichmentQueue(
+    "tmdb-details",
+    fetch=_fetch_movie_details,
+    write_batch=_write_movie_details,
+    enabled=lambda: settings.ENRICHMENT_ENABLED and bool(settings.TMDB_API_KEY),
+    **_queue_kwargs(),
+)
+
+omdb_ratings_queue = EnrichmentQueue(
+    "omdb-ratings",
+    fetch=fetch_omdb_ratings_on_demand,
+    write_batch=_write_omdb_ratings,
+    enabled=lambda: settings.ENRICHMENT_ENABLED and bool(settings.OMDB_API_KEY),
+    **_queue_kwargs(),
+)
+
+
+def enqueue_movie_details(items: list[tuple[int, str, int | None]]) -> int:
+    """Queue (title_id, imdb_tconst, tmdb_id) triples for a TMDB details fill."""
+    return tmdb_details_queue.enqueue(
+        [(title_id, (imdb_tconst, tmdb_id)) for title_id, imdb_tconst, tmdb_id in items]
+    )
+
+
+def enqueue_omdb_ratings(items: list[tuple[int, str]]) -> int:
+    return omdb_ratings_queue.enqueue(items)
+
+
+def stop_enrichment_queues() -> None:
+    tmdb_details_queue.stop()
+    omdb_ratings_queue.stop()
@@ -0,0 +1,89 @@
+"""Per-field negative caching for TMDB and OMDb enrichment.
+
+Every fetch records, per (title, field), when it ran and whether upstream had
+a value. A field upstream does not have is not re-fetched until its
+next_check_at, which backs off exponentially from NEGATIVE_CACHE_BASE_SECONDS
+up to NEGATIVE_CACHE_MAX_SECONDS, so obscure titles without a trailer or
+scores stop costing an API call on every page view.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+TMDB_DETAIL_FIELDS = ("tmdb_id", "poster_path", "overview", "trailer_key", "original_language")
+OMDB_RATINGS = "omdb_ratings"
+
+
+def watch_providers_field(region: str) -> str:
+    return f"watch_providers:{region}"
+
+
+def suppressed_fields(db: Session, title_id: int, fields: Iterable[str]) -> set[str]:
+    """Fields of a title known to be unavailable upstream and not yet due for a re-check."""
+    fields = list(fields)
+    if not fields:
+        return set()
+    rows = db.execute(
+        text("""
+            SELECT field FROM title_enrichment_state
+            WHERE title_id = :title_id
+              AND field = ANY(:fields)
+              AND not_available
+              AND next_check_at > now()
+        """),
+        {"title_id": title_id, "fields": fields},
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def record_fields(
+    db: Session,
+    results: list[tuple[int, str, bool]],
+    base_seconds: float | None = None,
+) -> None:
+    """Record (title_id, field, available) outcomes of a fetch, in the caller's transaction.
+
+    An unavailable field's re-check is pushed out to base * 2^(attempts - 1)
+    seconds; an available one resets the backoff.
+    """
+    if not results:
+        return
+    base = base_seconds if base_seconds is not None else settings.NEGATIVE_CACHE_BASE_SECONDS
+    db.execute(
+        text("""
+            INSERT INTO title_enrichment_state
+                (title_id, field, fetched_at, not_available, attempts, next_check_at)
+            VALUES (
+                :title_id, :field, now(), NOT :available,
+                CASE WHEN :available THEN 0 ELSE 1 END,
+                CASE WHEN :available THEN NULL
+                     ELSE now() + make_interval(secs => LEAST(CAST(:max AS double precision), :base))
+                END
+            )
+            ON CONFLICT (title_id, field) DO UPDATE SET
+                fetched_at = EXCLUDED.fetched_at,
+                not_available = EXCLUDED.not_available,
+                attempts = CASE WHEN EXCLUDED.not_available
+                                THEN title_enrichment_state.attempts + 1 ELSE 0 END,
+                next_check_at = CASE WHEN EXCLUDED.not_available
+                    THEN now() + make_interval(secs => LEAST(
+                        CAST(:max AS double precision),
+                        :base * power(2, title_enrichment_state.attempts)
+                    ))
+                    ELSE NULL END
+        """),
+        [
+            {
+                "title_id": title_id,
+                "field": field,
+                "available": available,
+                "base": base,
+                "max": settings.NEGATIVE_CACHE_MAX_SECONDS,
+            }
+            for title_id, field, available in results
+        ],
+    )
@@ -0,0 +1,250 @@
+"""Shared, pooled HTTP clients for third-party APIs.
+
+One long-lived client per upstream keeps TCP/TLS connections alive between
+calls instead of paying a fresh handshake per request. HTTP/2 is used when
+the optional `h2` package is installed. Every request goes through the
+upstream's circuit breaker and shared rate limiter and respects the current
+latency budget, and is traced so the connection-reuse rate per upstream can
+be reported on /metrics.
+"""
+
+import asyncio
+import importlib.util
+import json
+import threading
+from dataclasses import dataclass
+
+import httpx
+
+from app.config import settings
+from app.services.circuit import apply_budget, get_breaker, is_failure, remaining_budget
+from app.services.ratelimit import embedding_costs, limiter
+
+TMDB = "tmdb"
+OMDB = "omdb"
+OPENAI = "openai"
+
+UPSTREAMS = (TMDB, OMDB)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class UpstreamStats:
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served on an already-open connection."""
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests)
+
+
+_stats: dict[str, UpstreamStats] = {name: UpstreamStats() for name in UPSTREAMS}
+_stats_lock = threading.Lock()
+
+_clients: dict[str, httpx.Client] = {}
+_async_clients: dict[str, httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _record(upstream: str, event: str) -> None:
+    with _stats_lock:
+        stats = _stats[upstream]
+        if event == "request":
+            stats.requests += 1
+        elif event == "connection":
+            stats.connections_opened += 1
+
+
+def upstream_base_url(upstream: str) -> str:
+    return {TMDB: settings.TMDB_BASE_URL, OMDB: settings.OMDB_BASE_URL}[upstream]
+
+
+def rate_limit_costs(upstream: str, request: httpx.Request) -> list[tuple[str, float]]:
+    """(bucket, cost) pairs a request takes from the shared rate limiter."""
+    if upstream != OPENAI:
+        return [(upstream, 1.0)]
+    # Of the OpenAI calls only embeddings have buckets, shared with generate_embeddings
+    if not request.url.path.endswith("/embeddings"):
+        return []
+    texts = json.loads(request.content or b"{}").get("input", [])
+    return embedding_costs([texts] if isinstance(texts, str) else [str(t) for t in texts])
+
+
+class GuardedTransport(httpx.BaseTransport):
+    """Wraps a transport with the upstream's circuit breaker, rate limiter and latency budget."""
+
+    def __init__(self, upstream: str, transport: httpx.BaseTransport, rate_limited: bool = True):
+        self.upstream = upstream
+        self.rate_limited = rate_limited
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get_breaker(self.upstream)
+        breaker.before_request()
+        if self.rate_limited:
+            for bucket, cost in rate_limit_costs(self.upstream, request):
+                limiter.acquire(bucket, cost, max_wait=remaining_budget())
+        shrunk = apply_budget(request)
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.TimeoutException:
+            # A timeout we imposed from the budget says nothing about upstream health
+            if not shrunk:
+                breaker.record(False)
+            raise
+        except httpx.TransportError:
+            breaker.record(False)
+            raise
+        breaker.record(not is_failure(response))
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncGuardedTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of GuardedTransport."""
+
+    def __init__(self, upstream: str, transport: httpx.AsyncBaseTransport, rate_limited: bool = True):
+        self.upstream = upstream
+        self.rate_limited = rate_limited
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get_breaker(self.upstream)
+        breaker.before_request()
+        if self.rate_limited:
+            for bucket, cost in rate_limit_costs(self.upstream, request):
+                await asyncio.to_thread(limiter.acquire, bucket, cost, max_wait=remaining_budget())
+        shrunk = apply_budget(request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            if not shrunk:
+                breaker.record(False)
+            raise
+        except httpx.TransportError:
+            breaker.record(False)
+            raise
+        breaker.record(not is_failure(response))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _client_options(upstream: str) -> dict:
+    return {
+        "base_url": upstream_base_url(upstream),
+        "timeout": httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        ),
+    }
+
+
+def get_client(upstream: str) -> httpx.Client:
+    """Return the shared sync client for an upstream ("tmdb" or "omdb")."""
+    client = _clients.get(upstream)
+    if client is not None and not client.is_closed:
+        return client
+    with _clients_lock:
+        client = _clients.get(upstream)
+        if client is None or client.is_closed:
+
+            def trace(event_name: str, info: dict) -> None:
+                if event_name == "connection.connect_tcp.complete":
+                    _record(upstream, "connection")
+
+            def on_request(request: httpx.Request) -> None:
+                _record(upstream, "request")
+                request.extensions["trace"] = trace
+
+            transport = GuardedTransport(
+                upstream, httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+            )
+            client = httpx.Client(
+                transport=transport, event_hooks={"request": [on_request]}, **_client_options(upstream)
+            )
+            _clients[upstream] = client
+        return client
+
+
+def get_async_client(upstream: str) -> httpx.AsyncClient:
+    """Return the shared async client for an upstream.
+
+    Async clients are bound to the event loop that first uses them; close
+    them with aclose_async_clients() before that loop shuts down.
+    """
+    client = _async_clients.get(upstream)
+    if client is not None and not client.is_closed:
+        return client
+    with _clients_lock:
+        client = _async_clients.get(upstream)
+        if client is None or client.is_closed:
+
+            async def trace(event_name: str, info: dict) -> None:
+                if event_name == "connection.connect_tcp.complete":
+                    _record(upstream, "connection")
+
+            async def on_request(request: httpx.Request) -> None:
+                _record(upstream, "request")
+                request.extensions["trace"] = trace
+
+            transport = AsyncGuardedTransport(
+                upstream, httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+            )
+            client = httpx.AsyncClient(
+                transport=transport, event_hooks={"request": [on_request]}, **_client_options(upstream)
+            )
+            _async_clients[upstream] = client
+        return client
+
+
+def get_openai_http_client() -> httpx.Client:
+    """httpx client for the OpenAI SDK, guarded by the "openai" breaker, rate limiter and latency budget."""
+    return httpx.Client(
+        transport=GuardedTransport(OPENAI, httpx.HTTPTransport(limits=_limits())),
+        timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_async_clients() -> None:
+    with _clients_lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def get_http_metrics() -> dict[str, dict]:
+    """Per-upstream request and connection counts since process start."""
+    with _stats_lock:
+        return {
+            name: {
+                "requests": s.requests,
+                "connections_opened": s.connections_opened,
+                "connection_reuse_ratio": round(s.reuse_ratio, 4),
+                "http2": HTTP2_AVAILABLE,
+            }
+            for name, s in _stats.items()
+        }
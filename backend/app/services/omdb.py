@@ -2,14 +2,20 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 import httpx
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 from app.config import settings
 from app.models.catalog import CatalogRating, CatalogTitle
+from app.services.enrichment_state import OMDB_RATINGS, record_fields, suppressed_fields
+from app.services.http import OMDB, get_client
+from app.services.quota import take_interactive_quota
 
 OMDB_CACHE_DAYS = 90
+# Titles OMDb has no scores for are re-checked after 90, 180, 360... days
+OMDB_NEGATIVE_BASE_SECONDS = OMDB_CACHE_DAYS * 86400.0
 
 
 def parse_rt_percentage(value: str | None) -> int | None:
@@ -41,11 +47,10 @@ def fetch_omdb_ratings(imdb_id: str) -> dict | None:
     if not settings.OMDB_API_KEY:
         return None
 
-    url = "https://www.omdbapi.com/"
     params = {"apikey": settings.OMDB_API_KEY, "i": imdb_id}
 
     try:
-        resp = httpx.get(url, params=params, timeout=10.0)
+        resp = get_client(OMDB).get("/", params=params)
         resp.raise_for_status()
         data = resp.json()
     except (httpx.HTTPError, ValueError) as e:
@@ -79,40 +84,74 @@ def fetch_omdb_ratings(imdb_id: str) -> dict | None:
     }
 
 
-def get_or_fetch_omdb_ratings(db: Session, title: CatalogTitle) -> dict:
-    """Return cached OMDb ratings, or fetch and cache them.
+def omdb_ratings_stale(omdb_fetched_at: datetime | None) -> bool:
+    """True if OMDb scores were never fetched or are older than OMDB_CACHE_DAYS."""
+    if omdb_fetched_at is None:
+        return True
+    return omdb_fetched_at <= datetime.now(timezone.utc) - timedelta(days=OMDB_CACHE_DAYS)
 
-    Returns dict with rt_critic_score, rt_audience_score, metacritic_score.
-    """
+
+def omdb_scores_available(scores: dict) -> bool:
+    return any(v is not None for v in scores.values())
+
+
+def omdb_ratings_due(db: Session, title: CatalogTitle) -> bool:
+    """True if a title's OMDb scores are stale and OMDb is not known to lack them."""
+    rating = title.rating
+    if not rating or not omdb_ratings_stale(rating.omdb_fetched_at):
+        return False
+    return not suppressed_fields(db, title.id, [OMDB_RATINGS])
+
+
+def cached_omdb_ratings(title: CatalogTitle) -> dict:
+    """OMDb scores as currently stored, without calling OMDb."""
     rating = title.rating
     if not rating:
         return {"rt_critic_score": None, "rt_audience_score": None, "metacritic_score": None}
+    return {
+        "rt_critic_score": rating.rt_critic_score,
+        "rt_audience_score": rating.rt_audience_score,
+        "metacritic_score": rating.metacritic_score,
+    }
+
 
-    # Check if cache is fresh
-    if rating.omdb_fetched_at is not None:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=OMDB_CACHE_DAYS)
-        if rating.omdb_fetched_at > cutoff:
-            return {
-                "rt_critic_score": rating.rt_critic_score,
-                "rt_audience_score": rating.rt_audience_score,
-                "metacritic_score": rating.metacritic_score,
+def store_omdb_ratings(db: Session, results: list[tuple[int, dict]]) -> None:
+    """Write fetched OMDb scores for many titles in the caller's transaction."""
+    if not results:
+        return
+    db.execute(
+        text("""
+            UPDATE catalog_ratings SET
+                rt_critic_score = :rt_critic_score,
+                rt_audience_score = :rt_audience_score,
+                metacritic_score = :metacritic_score,
+                omdb_fetched_at = now()
+            WHERE title_id = :title_id
+        """),
+        [
+            {
+                "title_id": title_id,
+                "rt_critic_score": s["rt_critic_score"],
+                "rt_audience_score": s["rt_audience_score"],
+                "metacritic_score": s["metacritic_score"],
             }
+            for title_id, s in results
+        ],
+    )
+    record_fields(
+        db,
+        [(title_id, OMDB_RATINGS, omdb_scores_available(s)) for title_id, s in results],
+        OMDB_NEGATIVE_BASE_SECONDS,
+    )
+
+
+def fetch_omdb_ratings_on_demand(imdb_id: str) -> dict | None:
+    """fetch_omdb_ratings for user-triggered fills, within the unreserved daily quota.
+
+    Returns None without calling OMDb when the rest of the day's quota is
+    reserved for the scheduled refresh plan.
+    """
+    if not settings.OMDB_API_KEY or not take_interactive_quota(OMDB):
+        return None
+    return fetch_omdb_ratings(imdb_id)
 
-    # Fetch from OMDb
-    scores = fetch_omdb_ratings(title.imdb_tconst)
-    if scores is None:
-        # API error — return whatever we have cached (may be None)
-        return {
-            "rt_critic_score": rating.rt_critic_score,
-            "rt_audience_score": rating.rt_audience_score,
-            "metacritic_score": rating.metacritic_score,
-        }
-
-    # Store in DB
-    rating.rt_critic_score = scores["rt_critic_score"]
-    rating.rt_audience_score = scores["rt_audience_score"]
-    rating.metacritic_score = scores["metacritic_score"]
-    rating.omdb_fetched_at = datetime.now(timezone.utc)
-    db.commit()
-
-    return scores
@@ -0,0 +1,210 @@
+"""Demand-driven OMDb refresh plan that spends the daily quota on the titles that matter.
+
+Detail views are counted in memory and flushed in batches into title_demand
+as an exponentially decaying score. Once a day the plan ranks every title
+with stale or missing OMDb scores by that demand, trending membership and
+popularity and refreshes the top of the list within the share of the day's
+quota reserved for it, writing scores back in batches. Interactive fills
+only spend what is not reserved (see app.services.quota). Run one plan at a
+time, e.g. from a daily cron job.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.background import PeriodicTask
+from app.services.enrichment_state import OMDB_RATINGS
+from app.services.http import OMDB
+from app.services.omdb import OMDB_CACHE_DAYS, fetch_omdb_ratings, store_omdb_ratings
+from app.services.quota import reserved_quota, spend_reserved
+from app.services.ratelimit import rate_limit_lane
+
+logger = logging.getLogger(__name__)
+
+DEMAND_HALF_LIFE_SECONDS = 7 * 86400.0
+# Priority = decayed views + boosts; one view a week ago is worth ~0.5
+TRENDING_BOOST = 5.0
+NEVER_FETCHED_BOOST = 2.0
+POPULARITY_WEIGHT = 0.25  # per unit of ln(1 + num_votes); ~3.5 for a blockbuster
+
+
+@dataclass
+class RefreshCandidate:
+    title_id: int
+    imdb_tconst: str
+    priority: float
+
+
+@dataclass
+class RefreshSummary:
+    planned: int
+    reserved: int
+    fetched: int
+    written: int
+
+
+def store_demand(db: Session, views: dict[int, int]) -> None:
+    """Add detail views to title_demand, decaying the existing scores first."""
+    if not views:
+        return
+    db.execute(
+        text("""
+            INSERT INTO title_demand (title_id, score, views, updated_at)
+            SELECT v.title_id, v.views, v.views, now()
+            FROM unnest(CAST(:title_ids AS integer[]), CAST(:views AS integer[])) AS v(title_id, views)
+            JOIN catalog_titles ct ON ct.id = v.title_id
+            ON CONFLICT (title_id) DO UPDATE SET
+                score = title_demand.score * power(
+                    0.5, EXTRACT(EPOCH FROM now() - title_demand.updated_at) / :half_life
+                ) + EXCLUDED.score,
+                views = title_demand.views + EXCLUDED.views,
+                updated_at = now()
+        """),
+        {
+            "title_ids": list(views),
+            "views": list(views.values()),
+            "half_life": DEMAND_HALF_LIFE_SECONDS,
+        },
+    )
+
+
+class DemandTracker:
+    """Counts detail views in memory and writes them to title_demand in batches."""
+
+    def __init__(self, flush_seconds: float):
+        self._views: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flusher = PeriodicTask("demand-flush", flush_seconds, self.flush, run_immediately=False)
+
+    def record_view(self, title_id: int) -> None:
+        if not settings.ENRICHMENT_ENABLED:
+            return
+        with self._lock:
+            self._views[title_id] = self._views.get(title_id, 0) + 1
+        self._flusher.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            views, self._views = self._views, {}
+        if not views:
+            return
+        db = SessionLocal()
+        try:
+            store_demand(db, views)
+            db.commit()
+        except Exception:
+            logger.exception("Failed to write demand for %d titles", len(views))
+        finally:
+            db.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._flusher.stop(timeout=timeout)
+        self.flush()
+
+
+demand_tracker = DemandTracker(settings.DEMAND_FLUSH_SECONDS)
+
+
+def record_title_view(title_id: int) -> None:
+    demand_tracker.record_view(title_id)
+
+
+def stop_demand_tracker() -> None:
+    demand_tracker.stop()
+
+
+def plan_omdb_refreshes(db: Session, limit: int) -> list[RefreshCandidate]:
+    """Titles with stale or missing OMDb scores, highest priority first.
+
+    Titles OMDb is known to lack scores for are left out until their
+    negative-cache re-check is due.
+    """
+    rows = db.execute(
+        text("""
+            SELECT ct.id, ct.imdb_tconst, (
+                COALESCE(td.score * power(
+                    0.5, EXTRACT(EPOCH FROM now() - td.updated_at) / :half_life
+                ), 0)
+                + CASE WHEN EXISTS (SELECT 1 FROM trending_cache tc WHERE tc.title_id = ct.id)
+                       THEN :trending_boost ELSE 0 END
+                + CASE WHEN cr.omdb_fetched_at IS NULL THEN :never_boost ELSE 0 END
+                + :popularity_weight * ln(1 + COALESCE(cr.num_votes, 0))
+            ) AS priority
+            FROM catalog_ratings cr
+            JOIN catalog_titles ct ON ct.id = cr.title_id
+            LEFT JOIN title_demand td ON td.title_id = ct.id
+            LEFT JOIN title_enrichment_state tes
+                ON tes.title_id = ct.id AND tes.field = :omdb_field AND tes.not_available
+            WHERE (cr.omdb_fetched_at IS NULL
+                   OR cr.omdb_fetched_at <= now() - make_interval(days => :cache_days))
+              AND NOT COALESCE(tes.next_check_at > now(), false)
+            ORDER BY priority DESC, ct.id
+            LIMIT :limit
+        """),
+        {
+            "half_life": DEMAND_HALF_LIFE_SECONDS,
+            "trending_boost": TRENDING_BOOST,
+            "never_boost": NEVER_FETCHED_BOOST,
+            "popularity_weight": POPULARITY_WEIGHT,
+            "omdb_field": OMDB_RATINGS,
+            "cache_days": OMDB_CACHE_DAYS,
+            "limit": limit,
+        },
+    ).fetchall()
+    return [RefreshCandidate(title_id=r[0], imdb_tconst=r[1], priority=float(r[2])) for r in rows]
+
+
+def run_omdb_refresh_plan(limit: int | None = None, batch_size: int = 50) -> RefreshSummary:
+    """Refresh the highest-priority stale titles within today's reserved quota.
+
+    When there are fewer stale titles than reserved calls, the surplus is
+    handed back to interactive fills for the rest of the day.
+    """
+    db = SessionLocal()
+    try:
+        granted = reserved_quota(db, OMDB)
+        db.commit()
+        wanted = min(limit, granted) if limit is not None else granted
+        candidates = plan_omdb_refreshes(db, wanted) if wanted > 0 else []
+        logger.info("OMDb refresh plan: %d candidates, %d calls reserved", len(candidates), granted)
+        # Nothing more to refresh today: release what the plan cannot use
+        surplus = granted - len(candidates) if len(candidates) < wanted else 0
+
+        fetched = written = spent = 0
+        results: list[tuple[int, dict]] = []
+
+        def flush() -> None:
+            nonlocal written, spent
+            store_omdb_ratings(db, results)
+            spend_reserved(db, OMDB, spent)
+            db.commit()
+            written += len(results)
+            results.clear()
+            spent = 0
+
+        try:
+            with rate_limit_lane("bulk"):
+                for candidate in candidates:
+                    scores = fetch_omdb_ratings(candidate.imdb_tconst)
+                    spent += 1
+                    if scores is not None:
+                        fetched += 1
+                        results.append((candidate.title_id, scores))
+                    if len(results) >= batch_size:
+                        flush()
+            flush()
+        finally:
+            # Count calls made since the last write and hand back the surplus
+            db.rollback()
+            spend_reserved(db, OMDB, spent, released=surplus)
+            db.commit()
+
+        return RefreshSummary(planned=len(candidates), reserved=granted, fetched=fetched, written=written)
+    finally:
+        db.close()
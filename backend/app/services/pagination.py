@@ -0,0 +1,92 @@
+"""Keyset (seek) pagination helpers.
+
+A keyset is the ordered list of sort keys for a listing, ending with a unique
+column (the row id) so the order is total. The cursor handed to clients is an
+opaque, URL-safe encoding of the sort option plus the last row's key values;
+the next page is fetched with a WHERE clause that seeks past those values, so
+every page costs the same regardless of depth.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+Direction = Literal["asc", "desc"]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another sort."""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(sort: str, values: list[Any]) -> str:
+    payload = json.dumps({"s": sort, "k": values}, separators=(",", ":"), default=_json_default)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, num_keys: int) -> list[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort option."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+    if cursor_sort != sort:
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    if not isinstance(values, list) or len(values) != num_keys:
+        raise InvalidCursorError("Malformed pagination cursor")
+    return values
+
+
+def keyset_order_by(keys: list[tuple[str, Direction]]) -> str:
+    """Build an ORDER BY body for raw SQL from keyset expressions."""
+    return ", ".join(f"{expr} {direction.upper()}" for expr, direction in keys)
+
+
+def keyset_select(keys: list[tuple[str, Direction]]) -> str:
+    """Build extra SELECT columns (sort_k0, sort_k1, ...) exposing the key values."""
+    return ", ".join(f"{expr} AS sort_k{i}" for i, (expr, _) in enumerate(keys))
+
+
+def keyset_clause(
+    keys: list[tuple[str, Direction]],
+    values: list[Any],
+    prefix: str = "after_k",
+) -> tuple[str, dict]:
+    """Raw-SQL predicate selecting rows strictly after `values` in keyset order.
+
+    Expands to (k0 > v0) OR (k0 = v0 AND k1 > v1) OR ... with the comparison
+    flipped for descending keys, which works for mixed directions.
+    """
+    params = {f"{prefix}{i}": v for i, v in enumerate(values)}
+    clauses = []
+    for i, (expr, direction) in enumerate(keys):
+        op = "<" if direction == "desc" else ">"
+        terms = [f"{keys[j][0]} = :{prefix}{j}" for j in range(i)]
+        terms.append(f"{expr} {op} :{prefix}{i}")
+        clauses.append("(" + " AND ".join(terms) + ")")
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def keyset_filter(keys: list[tuple[ColumnElement, Direction]], values: list[Any]) -> ColumnElement:
+    """ORM equivalent of keyset_clause for SQLAlchemy column expressions."""
+    clauses = []
+    for i, (expr, direction) in enumerate(keys):
+        terms = [keys[j][0] == values[j] for j in range(i)]
+        terms.append(expr < values[i] if direction == "desc" else expr > values[i])
+        clauses.append(and_(*terms))
+    return or_(*clauses)
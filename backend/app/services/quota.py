@@ -0,0 +1,93 @@
+"""Daily call quotas for third-party APIs, shared across processes.
+
+The rate limiter paces calls; this caps how many a day may spend. Each day
+starts with a share of the quota reserved for the scheduled refresh plan,
+which draws it down as it goes and hands back what it has no work for.
+Interactive fetches, made by the background omdb_ratings_queue when users
+open titles, only get what is neither used nor reserved, so they cannot
+starve the plan.
+
+Days are UTC, matching when OMDb resets its free-tier counter.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+
+_TODAY = "CAST(timezone('UTC', now()) AS date)"
+
+
+def daily_quota(upstream: str) -> int:
+    if upstream == "omdb":
+        return settings.OMDB_DAILY_QUOTA
+    raise ValueError(f"No daily quota configured for {upstream}")
+
+
+def scheduled_share(upstream: str) -> int:
+    """Calls reserved for the scheduled plan at the start of each day."""
+    if upstream == "omdb":
+        return int(settings.OMDB_DAILY_QUOTA * settings.OMDB_SCHEDULED_QUOTA_FRACTION)
+    raise ValueError(f"No daily quota configured for {upstream}")
+
+
+def _ensure_today(db: Session, upstream: str) -> None:
+    db.execute(
+        text(f"""
+            INSERT INTO upstream_quota_usage (upstream, day, used, reserved, updated_at)
+            VALUES (:upstream, {_TODAY}, 0, :reserved, now())
+            ON CONFLICT (upstream, day) DO NOTHING
+        """),
+        {"upstream": upstream, "reserved": scheduled_share(upstream)},
+    )
+
+
+def reserved_quota(db: Session, upstream: str) -> int:
+    """Calls still reserved for the scheduled plan today. Runs in the caller's transaction."""
+    _ensure_today(db, upstream)
+    return db.execute(
+        text(f"SELECT reserved FROM upstream_quota_usage WHERE upstream = :upstream AND day = {_TODAY}"),
+        {"upstream": upstream},
+    ).scalar_one()
+
+
+def spend_reserved(db: Session, upstream: str, spent: int, released: int = 0) -> None:
+    """Turn `spent` reserved calls into used ones and hand `released` back."""
+    if not spent and not released:
+        return
+    db.execute(
+        text(f"""
+            UPDATE upstream_quota_usage SET
+                used = used + :spent,
+                reserved = GREATEST(reserved - :spent - :released, 0),
+                updated_at = now()
+            WHERE upstream = :upstream AND day = {_TODAY}
+        """),
+        {"upstream": upstream, "spent": spent, "released": released},
+    )
+
+
+def try_take_quota(db: Session, upstream: str) -> bool:
+    """Take one unreserved call of today's quota. False if none is left."""
+    _ensure_today(db, upstream)
+    row = db.execute(
+        text(f"""
+            UPDATE upstream_quota_usage SET used = used + 1, updated_at = now()
+            WHERE upstream = :upstream AND day = {_TODAY} AND used + reserved < :quota
+            RETURNING used
+        """),
+        {"upstream": upstream, "quota": daily_quota(upstream)},
+    ).fetchone()
+    return row is not None
+
+
+def take_interactive_quota(upstream: str) -> bool:
+    """try_take_quota on its own session, committed immediately."""
+    db = SessionLocal()
+    try:
+        taken = try_take_quota(db, upstream)
+        db.commit()
+        return taken
+    finally:
+        db.close()
@@ -0,0 +1,250 @@
+"""Token-bucket rate limiting for third-party APIs, shared across processes.
+
+Each upstream has one bucket row in Postgres (rate_limit_buckets). Taking a
+token is a single locked read-modify-write, so every uvicorn worker,
+background queue and seed script draws from the same budget. If the
+database is unreachable, each process falls back to a local in-memory
+bucket with the same settings.
+
+Requests run in a priority lane. "interactive" callers (a user is waiting)
+may drain the bucket completely, while "bulk" callers (scripts, background
+enrichment) stop once only the reserved share is left.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Literal
+
+import httpx
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+Lane = Literal["interactive", "bulk"]
+
+# Seconds to stay on the in-memory bucket before retrying Postgres
+FALLBACK_RETRY_SECONDS = 30.0
+
+# OpenAI embedding requests are metered both per request and per input token
+OPENAI_EMBEDDINGS = "openai_embeddings"
+OPENAI_EMBEDDING_TOKENS = "openai_embedding_tokens"
+
+_lane_var: ContextVar[Lane | None] = ContextVar("rate_limit_lane", default=None)
+_default_lane: Lane = "interactive"
+
+
+class RateLimitTimeout(httpx.HTTPError):
+    """No token became available within the lane's wait budget."""
+
+
+@dataclass(frozen=True)
+class BucketConfig:
+    capacity: float
+    refill_per_second: float
+
+
+def bucket_config(upstream: str) -> BucketConfig:
+    if upstream == "omdb":
+        return BucketConfig(settings.OMDB_RATE_LIMIT_BURST, settings.OMDB_RATE_LIMIT_PER_SECOND)
+    # OpenAI meters per minute: a minute's worth may burst, refilled evenly
+    if upstream == OPENAI_EMBEDDINGS:
+        per_minute = settings.OPENAI_EMBEDDING_REQUESTS_PER_MINUTE
+        return BucketConfig(per_minute, per_minute / 60)
+    if upstream == OPENAI_EMBEDDING_TOKENS:
+        per_minute = settings.OPENAI_EMBEDDING_TOKENS_PER_MINUTE
+        return BucketConfig(per_minute, per_minute / 60)
+    return BucketConfig(settings.TMDB_RATE_LIMIT_BURST, settings.TMDB_RATE_LIMIT_PER_SECOND)
+
+
+def embedding_costs(texts: list[str]) -> list[tuple[str, float]]:
+    """(bucket, cost) pairs an embeddings request for `texts` takes.
+
+    Tokens are estimated high, at ~3 characters each (English runs ~4), so
+    the bucket never undercounts what OpenAI will meter.
+    """
+    tokens = sum(len(t) // 3 + 1 for t in texts)
+    return [(OPENAI_EMBEDDINGS, 1.0), (OPENAI_EMBEDDING_TOKENS, float(tokens))]
+
+
+def set_default_lane(lane: Lane) -> None:
+    """Set the process-wide lane, e.g. "bulk" at the top of a seed script."""
+    global _default_lane
+    _default_lane = lane
+
+
+@contextmanager
+def rate_limit_lane(lane: Lane) -> Iterator[None]:
+    """Run the enclosed calls in the given lane."""
+    token = _lane_var.set(lane)
+    try:
+        yield
+    finally:
+        _lane_var.reset(token)
+
+
+def current_lane() -> Lane:
+    return _lane_var.get() or _default_lane
+
+
+def _reserve(config: BucketConfig, lane: Lane) -> float:
+    if lane == "bulk":
+        return config.capacity * settings.RATE_LIMIT_BULK_RESERVE_FRACTION
+    return 0.0
+
+
+def _wait_seconds(available: float, cost: float, reserve: float, config: BucketConfig) -> float:
+    if config.refill_per_second <= 0:
+        return float("inf")
+    return max(0.0, (reserve + cost - available) / config.refill_per_second)
+
+
+class LocalBucket:
+    """In-process token bucket, used when the shared store is unavailable."""
+
+    def __init__(self, config: BucketConfig):
+        self.config = config
+        self.tokens = config.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self, cost: float, reserve: float) -> float:
+        """Take `cost` tokens if that leaves at least `reserve`. Returns 0 or seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.config.capacity,
+                self.tokens + (now - self.updated_at) * self.config.refill_per_second,
+            )
+            self.updated_at = now
+            if self.tokens - cost >= reserve:
+                self.tokens -= cost
+                return 0.0
+            return _wait_seconds(self.tokens, cost, reserve, self.config)
+
+
+class PostgresBucketStore:
+    """Token buckets stored as rows in rate_limit_buckets."""
+
+    def __init__(self, bind: Engine | None = None):
+        self._engine = bind or engine
+        self._ensured: set[str] = set()
+
+    def _ensure(self, conn, upstream: str, config: BucketConfig) -> None:
+        if upstream in self._ensured:
+            return
+        conn.execute(
+            text("""
+                INSERT INTO rate_limit_buckets (upstream, tokens, capacity, refill_per_second, updated_at)
+                VALUES (:upstream, :capacity, :capacity, :refill, clock_timestamp())
+                ON CONFLICT (upstream) DO UPDATE
+                SET capacity = EXCLUDED.capacity,
+                    refill_per_second = EXCLUDED.refill_per_second,
+                    tokens = LEAST(rate_limit_buckets.tokens, EXCLUDED.capacity)
+            """),
+            {"upstream": upstream, "capacity": config.capacity, "refill": config.refill_per_second},
+        )
+        self._ensured.add(upstream)
+
+    def try_take(self, upstream: str, config: BucketConfig, cost: float, reserve: float) -> float:
+        with self._engine.begin() as conn:
+            self._ensure(conn, upstream, config)
+            row = conn.execute(
+                text("""
+                    WITH cur AS (
+                        SELECT
+                            upstream,
+                            refill_per_second,
+                            LEAST(
+                                capacity,
+                                tokens + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * refill_per_second
+                            ) AS available
+                        FROM rate_limit_buckets
+                        WHERE upstream = :upstream
+                        FOR UPDATE
+                    ), taken AS (
+                        UPDATE rate_limit_buckets b
+                        SET tokens = cur.available - :cost, updated_at = clock_timestamp()
+                        FROM cur
+                        WHERE b.upstream = cur.upstream AND cur.available - :cost >= :reserve
+                        RETURNING b.upstream
+                    )
+                    SELECT cur.available, EXISTS (SELECT 1 FROM taken)
+                    FROM cur
+                """),
+                {"upstream": upstream, "cost": cost, "reserve": reserve},
+            ).one()
+        available, taken = row
+        return 0.0 if taken else _wait_seconds(available, cost, reserve, config)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._store = PostgresBucketStore()
+        self._local: dict[str, LocalBucket] = {}
+        self._fallback_until = 0.0
+        self._lock = threading.Lock()
+
+    def _local_bucket(self, upstream: str, config: BucketConfig) -> LocalBucket:
+        with self._lock:
+            bucket = self._local.get(upstream)
+            if bucket is None or bucket.config != config:
+                bucket = self._local[upstream] = LocalBucket(config)
+            return bucket
+
+    def _try_take(self, upstream: str, config: BucketConfig, cost: float, reserve: float) -> float:
+        if time.monotonic() >= self._fallback_until:
+            try:
+                return self._store.try_take(upstream, config, cost, reserve)
+            except SQLAlchemyError as e:
+                logger.warning("Rate limit store unavailable, using local bucket: %s", e)
+                self._fallback_until = time.monotonic() + FALLBACK_RETRY_SECONDS
+        return self._local_bucket(upstream, config).try_take(cost, reserve)
+
+    def acquire(
+        self,
+        upstream: str,
+        cost: float = 1.0,
+        lane: Lane | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        """Block until `cost` tokens are taken for upstream.
+
+        Interactive callers give up with RateLimitTimeout after
+        RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS (or `max_wait`, if shorter);
+        bulk callers wait as long as needed unless `max_wait` is given.
+        Raises ValueError if `cost` can never fit in the lane's share of the bucket.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        lane = lane or current_lane()
+        config = bucket_config(upstream)
+        reserve = _reserve(config, lane)
+        if cost > config.capacity - reserve:
+            raise ValueError(
+                f"Cost {cost} for {upstream} exceeds the {lane} lane's {config.capacity - reserve} of "
+                f"{config.capacity} tokens"
+            )
+        waits = [max_wait] if max_wait is not None else []
+        if lane == "interactive":
+            waits.append(settings.RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS)
+        deadline = time.monotonic() + min(waits) if waits else None
+
+        while True:
+            wait = self._try_take(upstream, config, cost, reserve)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"Rate limit budget for {upstream} exhausted")
+            # Re-check at least once a second; other processes share the bucket
+            time.sleep(min(wait, 1.0))
+
+
+limiter = RateLimiter()
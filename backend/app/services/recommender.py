@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models.recommender import ProfileTaste
+from app.services.http import get_openai_http_client
 
 MODEL_ID = settings.EMBEDDING_MODEL
 MIN_RATED = settings.RECOMMEND_MIN_RATED_MOVIES
@@ -20,7 +21,14 @@ _openai_client: OpenAI | None = None
 def _get_openai_client() -> OpenAI:
     global _openai_client
     if _openai_client is None:
-        _openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # No SDK retries: the circuit breaker and the request's latency budget
+        # decide when to give up, and a retry sleep would outlast the budget
+        _openai_client = OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            http_client=get_openai_http_client(),
+            max_retries=0,
+        )
     return _openai_client
 
 
@@ -422,7 +430,7 @@ def get_recommendations(
     excluded_ids = {row[0] for row in db.execute(exclusion_query, {"profile_id": profile_id})}
 
     # Build filter conditions
-    filters = []
+    filters = ["tc.has_rating"]
     params: dict = {
         "profile_id": profile_id,
         "limit": limit,
@@ -430,33 +438,33 @@ def get_recommendations(
     }
 
     if genre:
-        filters.append("ct.genres ILIKE :genre")
+        filters.append("tc.genres ILIKE :genre")
         params["genre"] = f"%{genre}%"
     if min_year is not None:
-        filters.append("ct.start_year >= :min_year")
+        filters.append("tc.start_year >= :min_year")
         params["min_year"] = min_year
     if max_year is not None:
-        filters.append("ct.start_year <= :max_year")
+        filters.append("tc.start_year <= :max_year")
         params["max_year"] = max_year
     if min_runtime is not None:
-        filters.append("ct.runtime_minutes >= :min_runtime")
+        filters.append("tc.runtime_minutes >= :min_runtime")
         params["min_runtime"] = min_runtime
     if max_runtime is not None:
-        filters.append("ct.runtime_minutes <= :max_runtime")
+        filters.append("tc.runtime_minutes <= :max_runtime")
         params["max_runtime"] = max_runtime
     if min_imdb_rating is not None:
-        filters.append("cr.average_rating >= :min_imdb_rating")
+        filters.append("tc.average_rating >= :min_imdb_rating")
         params["min_imdb_rating"] = min_imdb_rating
     if min_votes is not None:
-        filters.append("cr.num_votes >= :min_votes")
+        filters.append("tc.num_votes >= :min_votes")
         params["min_votes"] = min_votes
 
     # Always exclude already-watched/flagged movies
     if excluded_ids:
-        filters.append("ct.id != ALL(:excluded_ids)")
+        filters.append("tc.title_id != ALL(:excluded_ids)")
         params["excluded_ids"] = list(excluded_ids)
 
-    where_clause = " AND ".join(filters) if filters else "TRUE"
+    where_clause = " AND ".join(filters)
 
     if search_vector is not None or not fallback_mode:
         # Vector similarity search (mood vector or taste vector)
@@ -475,30 +483,28 @@ def get_recommendations(
         count_sql = text(f"""
             SELECT COUNT(*)
             FROM movie_embeddings me
-            JOIN catalog_titles ct ON ct.id = me.title_id
-            JOIN catalog_ratings cr ON cr.title_id = ct.id
+            JOIN title_cards tc ON tc.title_id = me.title_id
             WHERE me.model_id = :model_id AND {where_clause}
         """)
         total = db.execute(count_sql, params).scalar()
 
         query_sql = text(f"""
             SELECT
-                ct.id AS title_id,
-                ct.imdb_tconst,
-                ct.primary_title,
-                ct.start_year,
-                ct.runtime_minutes,
-                ct.genres,
-                cr.average_rating,
-                cr.num_votes,
+                tc.title_id,
+                tc.imdb_tconst,
+                tc.primary_title,
+                tc.start_year,
+                tc.runtime_minutes,
+                tc.genres,
+                tc.average_rating,
+                tc.num_votes,
                 (1 - :pop_weight) * (1 - (me.embedding <=> CAST(:taste_vector AS vector)))
-                  + :pop_weight * COALESCE(cr.rt_critic_score / 100.0, cr.average_rating / 10.0, 0.5)
+                  + :pop_weight * COALESCE(tc.rt_critic_score / 100.0, tc.average_rating / 10.0, 0.5)
                 AS blended_score,
-                ct.poster_path,
-                cr.rt_critic_score
+                tc.poster_path,
+                tc.rt_critic_score
             FROM movie_embeddings me
-            JOIN catalog_titles ct ON ct.id = me.title_id
-            JOIN catalog_ratings cr ON cr.title_id = ct.id
+            JOIN title_cards tc ON tc.title_id = me.title_id
             WHERE me.model_id = :model_id AND {where_clause}
             ORDER BY blended_score DESC
             LIMIT :limit OFFSET :offset
@@ -507,29 +513,27 @@ def get_recommendations(
         # Fallback: popularity ranking
         count_sql = text(f"""
             SELECT COUNT(*)
-            FROM catalog_titles ct
-            JOIN catalog_ratings cr ON cr.title_id = ct.id
+            FROM title_cards tc
             WHERE {where_clause}
         """)
         total = db.execute(count_sql, params).scalar()
 
         query_sql = text(f"""
             SELECT
-                ct.id AS title_id,
-                ct.imdb_tconst,
-                ct.primary_title,
-                ct.start_year,
-                ct.runtime_minutes,
-                ct.genres,
-                cr.average_rating,
-                cr.num_votes,
+                tc.title_id,
+                tc.imdb_tconst,
+                tc.primary_title,
+                tc.start_year,
+                tc.runtime_minutes,
+                tc.genres,
+                tc.average_rating,
+                tc.num_votes,
                 NULL AS similarity_score,
-                ct.poster_path,
-                cr.rt_critic_score
-            FROM catalog_titles ct
-            JOIN catalog_ratings cr ON cr.title_id = ct.id
+                tc.poster_path,
+                tc.rt_critic_score
+            FROM title_cards tc
             WHERE {where_clause}
-            ORDER BY cr.average_rating * LN(cr.num_votes + 1) DESC
+            ORDER BY tc.popularity DESC, tc.title_id DESC
             LIMIT :limit OFFSET :offset
         """)
 
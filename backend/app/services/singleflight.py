@@ -0,0 +1,59 @@
+"""Single-flight coalescing for lazy third-party fetches.
+
+When many requests miss the cache for the same title at once, only the first
+one should call the upstream API; the rest wait for it and then read what it
+stored. Callers on the same worker wait on an in-process lock, and callers
+in other workers wait on a Postgres advisory lock keyed by the same
+(scope, key).
+
+Usage:
+
+    with single_flight(db, "tmdb-title", title.id):
+        db.refresh(title)           # a previous holder may have filled it
+        if still_missing(title):
+            fetch_and_store(...)
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+_locks: dict[Hashable, list] = {}  # key -> [threading.Lock, holders + waiters]
+_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _local_flight(key: Hashable) -> Iterator[None]:
+    with _locks_guard:
+        entry = _locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _locks[key]
+
+
+@contextmanager
+def single_flight(db: Session, scope: str, key: int) -> Iterator[None]:
+    """Hold the flight for (scope, key) across threads and worker processes.
+
+    The advisory lock is taken on its own connection so it is independent of
+    the caller's transaction: committing inside the block does not release
+    it, and waiting callers do not hold the caller's transaction open.
+    """
+    with _local_flight((scope, key)):
+        with db.get_bind().engine.connect() as conn:
+            params = {"scope": scope, "key": key}
+            conn.execute(text("SELECT pg_advisory_lock(hashtext(:scope), :key)"), params)
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:scope), :key)"), params)
+                conn.commit()
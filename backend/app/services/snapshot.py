@@ -0,0 +1,403 @@
+"""In-memory columnar snapshot of the catalog's filterable columns.
+
+Browse and facet queries only ever filter on a handful of small columns, so we
+keep them as NumPy arrays (a few tens of MB for the full catalog) and evaluate
+filters as vectorized masks. Only the final page's card data is read from
+Postgres. The snapshot is rebuilt in the background whenever the catalog
+tables change and swapped in atomically; readers always see a complete one.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.background import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+BUILD_CHUNK_SIZE = 50000
+
+# Tables whose writes invalidate the snapshot; title_cards only changes when a
+# title's card columns do, not on search text or overview updates
+WATCHED_TABLES = ("title_cards", "title_availability")
+
+# Streaming availability held in memory is for one region; other regions are
+# filtered in Postgres
+PROVIDER_REGION = "US"
+
+
+@dataclass
+class CatalogSnapshot:
+    ids: np.ndarray  # int64, ascending
+    start_year: np.ndarray  # float32, NaN for NULL
+    runtime_minutes: np.ndarray  # float32, NaN for NULL
+    average_rating: np.ndarray  # float64, NaN for NULL
+    num_votes: np.ndarray  # float64, NaN for NULL
+    rt_critic_score: np.ndarray  # float32, NaN for NULL
+    language_codes: np.ndarray  # int16 index into `languages`, -1 for NULL
+    languages: list[str]
+    genre_bits: np.ndarray  # uint64 bitmask over `genre_names`
+    genre_names: list[str]
+    provider_rows: dict[int, np.ndarray]  # provider_id -> row indices (flatrate)
+    provider_region: str
+    orders: dict[str, np.ndarray]  # sort option -> row indices in sort order
+    change_marker: int
+    built_at: float
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [
+            self.ids, self.start_year, self.runtime_minutes, self.average_rating,
+            self.num_votes, self.rt_critic_score, self.language_codes, self.genre_bits,
+        ]
+        arrays += list(self.provider_rows.values()) + list(self.orders.values())
+        return sum(a.nbytes for a in arrays)
+
+    def genre_mask(self, genres: list[str]) -> np.ndarray:
+        """Rows matching any of the genres (OR), with ILIKE '%genre%' semantics per token."""
+        bits = np.uint64(0)
+        for g in genres:
+            needle = g.strip().lower()
+            for i, name in enumerate(self.genre_names):
+                if needle in name.lower():
+                    bits |= np.uint64(1) << np.uint64(i)
+        return (self.genre_bits & bits) != 0
+
+    def year_mask(self, min_year: int | None, max_year: int | None) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+        if min_year is not None:
+            mask &= self.start_year >= min_year
+        if max_year is not None:
+            mask &= self.start_year <= max_year
+        return mask
+
+    def language_mask(self, language: str) -> np.ndarray:
+        try:
+            code = self.languages.index(language)
+        except ValueError:
+            return np.zeros(len(self.ids), dtype=bool)
+        return self.language_codes == code
+
+    def provider_mask(self, provider_ids: list[int]) -> np.ndarray:
+        mask = np.zeros(len(self.ids), dtype=bool)
+        for pid in provider_ids:
+            rows = self.provider_rows.get(pid)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+    def base_mask(
+        self,
+        min_rating: float | None = None,
+        min_rt_score: int | None = None,
+        min_runtime: int | None = None,
+        max_runtime: int | None = None,
+        exclude_title_ids: list[int] | None = None,
+    ) -> np.ndarray:
+        """Mask for the filters that are not facet dimensions."""
+        mask = np.ones(len(self.ids), dtype=bool)
+        # NaN comparisons are False, matching SQL's NULL semantics
+        if min_rating is not None:
+            mask &= self.average_rating >= min_rating
+        if min_rt_score is not None:
+            mask &= self.rt_critic_score >= min_rt_score
+        if min_runtime is not None:
+            mask &= self.runtime_minutes >= min_runtime
+        if max_runtime is not None:
+            mask &= self.runtime_minutes <= max_runtime
+        if exclude_title_ids:
+            wanted = np.asarray(exclude_title_ids, dtype=np.int64)
+            pos = np.searchsorted(self.ids, wanted)
+            in_range = pos < len(self.ids)
+            pos, wanted = pos[in_range], wanted[in_range]
+            mask[pos[self.ids[pos] == wanted]] = False
+        return mask
+
+    def page(
+        self,
+        mask: np.ndarray,
+        sort_by: str,
+        offset: int,
+        limit: int,
+        after: list | None = None,
+    ) -> tuple[list[int], int, list | None]:
+        """Return (title ids for the page, total matches, next page's cursor keys).
+
+        With `after`, the page starts right after the row with those keyset
+        values instead of at `offset`.
+        """
+        if sort_by not in self.orders:
+            sort_by = "popularity"
+        order = self.orders[sort_by]
+        ordered = order[mask[order]]
+        total = int(ordered.size)
+
+        if after is not None:
+            keys = _sort_keys(sort_by, self.ids, self.start_year, self.average_rating, self.num_votes)
+            offset = _seek(ordered, keys, after)
+
+        rows = ordered[offset:offset + limit + 1]
+        next_keys = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_keys = [
+                int(arr[last]) if arr.dtype.kind == "i" else float(arr[last])
+                for arr, _ in _sort_keys(sort_by, self.ids, self.start_year, self.average_rating, self.num_votes)
+            ]
+        return self.ids[rows].tolist(), total, next_keys
+
+    def facet_counts(
+        self,
+        base: np.ndarray,
+        m_genre: np.ndarray,
+        m_year: np.ndarray,
+        m_language: np.ndarray,
+        m_provider: np.ndarray,
+    ) -> dict[str, list[tuple[str, int]]]:
+        """Count rows per facet value, each facet ignoring its own dimension mask."""
+        result: dict[str, list[tuple[str, int]]] = {}
+
+        rows = base & m_year & m_language & m_provider
+        bits = self.genre_bits[rows]
+        result["genre"] = [
+            (name, int(np.count_nonzero(bits & (np.uint64(1) << np.uint64(i)))))
+            for i, name in enumerate(self.genre_names)
+        ]
+
+        rows = base & m_genre & m_language & m_provider
+        years = self.start_year[rows]
+        years = years[~np.isnan(years)]
+        decades, counts = np.unique((years // 10 * 10).astype(np.int64), return_counts=True)
+        result["decade"] = [(str(d), int(c)) for d, c in zip(decades, counts)]
+
+        rows = base & m_genre & m_year & m_provider
+        codes = self.language_codes[rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.languages))
+        result["language"] = [
+            (lang, int(c)) for lang, c in zip(self.languages, counts) if lang
+        ]
+
+        rows = base & m_genre & m_year & m_language
+        result["provider"] = [
+            (str(pid), int(np.count_nonzero(rows[idx])))
+            for pid, idx in self.provider_rows.items()
+        ]
+
+        return {facet: [(v, c) for v, c in items if c > 0] for facet, items in result.items()}
+
+
+_snapshot: CatalogSnapshot | None = None
+_refresher: PeriodicTask | None = None
+
+
+def get_snapshot() -> CatalogSnapshot | None:
+    """Return the current snapshot, or None if none has been built yet."""
+    return _snapshot
+
+
+def set_snapshot(snapshot: CatalogSnapshot | None) -> None:
+    """Atomically install a new snapshot (a single reference swap)."""
+    global _snapshot
+    _snapshot = snapshot
+
+
+def get_change_marker(db: Session) -> int:
+    """Cheap fingerprint of writes to the catalog tables since stats reset."""
+    return db.execute(
+        text("""
+            SELECT COALESCE(SUM(n_tup_ins + n_tup_upd + n_tup_del), 0)
+            FROM pg_stat_user_tables
+            WHERE relname = ANY(:tables)
+        """),
+        {"tables": list(WATCHED_TABLES)},
+    ).scalar() or 0
+
+
+def build_snapshot(db: Session) -> CatalogSnapshot:
+    """Read the filterable columns for the whole catalog into NumPy arrays."""
+    start = time.time()
+    change_marker = get_change_marker(db)
+
+    ids, years, runtimes, ratings, votes, rt_scores = [], [], [], [], [], []
+    language_codes, genre_bits = [], []
+    language_index: dict[str, int] = {}
+    genre_index: dict[str, int] = {}
+
+    result = db.execute(
+        text("""
+            SELECT title_id, start_year, runtime_minutes, genres, original_language,
+                   average_rating, num_votes, rt_critic_score
+            FROM title_cards
+            ORDER BY title_id
+        """).execution_options(stream_results=True, yield_per=BUILD_CHUNK_SIZE)
+    )
+    for chunk in result.partitions(BUILD_CHUNK_SIZE):
+        for row in chunk:
+            ids.append(row[0])
+            years.append(row[1])
+            runtimes.append(row[2])
+            ratings.append(row[5])
+            votes.append(row[6])
+            rt_scores.append(row[7])
+
+            mask = 0
+            if row[3]:
+                for g in row[3].split(","):
+                    g = g.strip()
+                    if g not in genre_index:
+                        if len(genre_index) >= 64:
+                            raise ValueError("More than 64 distinct genres; cannot build snapshot bitmask")
+                        genre_index[g] = len(genre_index)
+                    mask |= 1 << genre_index[g]
+            genre_bits.append(mask)
+
+            lang = row[4]
+            if lang:
+                language_codes.append(language_index.setdefault(lang, len(language_index)))
+            else:
+                language_codes.append(-1)
+
+    def as_float(values: list, dtype) -> np.ndarray:
+        return np.array([np.nan if v is None else v for v in values], dtype=dtype)
+
+    ids_arr = np.array(ids, dtype=np.int64)
+    rating_arr = as_float(ratings, np.float64)
+    votes_arr = as_float(votes, np.float64)
+    year_arr = as_float(years, np.float32)
+
+    provider_rows: dict[int, np.ndarray] = {}
+    provider_pairs = db.execute(
+        text("""
+            SELECT pid, ta.title_id
+            FROM title_availability ta, unnest(ta.flatrate_provider_ids) AS pid
+            WHERE ta.region = :region
+            ORDER BY pid, ta.title_id
+        """),
+        {"region": PROVIDER_REGION},
+    ).fetchall()
+    if provider_pairs and len(ids_arr):
+        pairs = np.array(provider_pairs, dtype=np.int64)
+        rows = np.minimum(np.searchsorted(ids_arr, pairs[:, 1]), len(ids_arr) - 1)
+        valid = ids_arr[rows] == pairs[:, 1]
+        for pid in np.unique(pairs[valid, 0]):
+            provider_rows[int(pid)] = rows[valid & (pairs[:, 0] == pid)].astype(np.int32)
+
+    snapshot = CatalogSnapshot(
+        ids=ids_arr,
+        start_year=year_arr,
+        runtime_minutes=as_float(runtimes, np.float32),
+        average_rating=rating_arr,
+        num_votes=votes_arr,
+        rt_critic_score=as_float(rt_scores, np.float32),
+        language_codes=np.array(language_codes, dtype=np.int16),
+        languages=list(language_index),
+        genre_bits=np.array(genre_bits, dtype=np.uint64),
+        genre_names=list(genre_index),
+        provider_rows=provider_rows,
+        provider_region=PROVIDER_REGION,
+        orders=_build_orders(ids_arr, year_arr, rating_arr, votes_arr),
+        change_marker=change_marker,
+        built_at=time.time(),
+    )
+    logger.info(
+        "Built catalog snapshot: %d titles, %.1f MB in %.1fs",
+        len(ids_arr), snapshot.nbytes / 1024 / 1024, time.time() - start,
+    )
+    return snapshot
+
+
+def _sort_keys(
+    sort_by: str,
+    ids: np.ndarray,
+    years: np.ndarray,
+    ratings: np.ndarray,
+    votes: np.ndarray,
+) -> list[tuple[np.ndarray, str]]:
+    """Keyset arrays for a sort option, mirroring BROWSE_KEYSETS in discovery.
+
+    NULLs map to the same sentinels the SQL keysets use, so ordering and
+    cursor values agree between the snapshot and the Postgres path.
+    """
+    votes_key = np.nan_to_num(votes, nan=-1.0)
+    years64 = years.astype(np.float64)
+    if sort_by == "rating":
+        return [(np.nan_to_num(ratings, nan=-1.0), "desc"), (votes_key, "desc"), (ids, "desc")]
+    if sort_by == "year_desc":
+        return [(np.nan_to_num(years64, nan=-1.0), "desc"), (votes_key, "desc"), (ids, "desc")]
+    if sort_by == "year_asc":
+        return [(np.nan_to_num(years64, nan=2147483647.0), "asc"), (votes_key, "desc"), (ids, "desc")]
+    popularity = np.nan_to_num(ratings * np.log(votes + 1), nan=0.0)
+    return [(popularity, "desc"), (ids, "desc")]
+
+
+def _seek(ordered: np.ndarray, keys: list[tuple[np.ndarray, str]], after: list) -> int:
+    """Index of the first row in `ordered` that sorts strictly after `after`."""
+    is_after = np.zeros(len(ordered), dtype=bool)
+    tied = np.ones(len(ordered), dtype=bool)
+    for (arr, direction), value in zip(keys, after):
+        vals = arr[ordered]
+        beyond = vals < value if direction == "desc" else vals > value
+        is_after |= tied & beyond
+        tied &= vals == value
+    # `ordered` is sorted by the same keys, so is_after is False...False, True...True
+    return int(np.argmax(is_after)) if is_after.any() else len(ordered)
+
+
+def _build_orders(
+    ids: np.ndarray,
+    years: np.ndarray,
+    ratings: np.ndarray,
+    votes: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Precompute the row order for every browse sort option.
+
+    Filtering a precomputed order with a mask keeps it sorted, so browse never
+    sorts at request time.
+    """
+    orders = {}
+    for sort_by in ("popularity", "rating", "year_desc", "year_asc"):
+        keys = _sort_keys(sort_by, ids, years, ratings, votes)
+        # np.lexsort sorts by the last key first
+        lex_keys = [-arr if direction == "desc" else arr for arr, direction in reversed(keys)]
+        orders[sort_by] = np.lexsort(lex_keys).astype(np.int32)
+    return orders
+
+
+def refresh_snapshot(force: bool = False) -> bool:
+    """Rebuild and swap in the snapshot if the catalog changed. Returns True if rebuilt."""
+    db = SessionLocal()
+    try:
+        current = get_snapshot()
+        if not force and current is not None and get_change_marker(db) == current.change_marker:
+            return False
+        set_snapshot(build_snapshot(db))
+        return True
+    finally:
+        db.close()
+
+
+def start_snapshot_refresher() -> None:
+    """Start the background build/refresh loop (no-op unless enabled)."""
+    global _refresher
+    if not settings.CATALOG_SNAPSHOT_ENABLED or _refresher is not None:
+        return
+    _refresher = PeriodicTask(
+        "catalog-snapshot",
+        settings.CATALOG_SNAPSHOT_REFRESH_SECONDS,
+        refresh_snapshot,
+    )
+    _refresher.start()
+
+
+def stop_snapshot_refresher() -> None:
+    global _refresher
+    if _refresher is not None:
+        _refresher.stop()
+        _refresher = None
@@ -30,11 +30,11 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
             SELECT
                 COUNT(*),
                 AVG(w.rating_1_10),
-                COALESCE(SUM(ct.runtime_minutes), 0),
-                COUNT(DISTINCT ct.original_language),
+                COALESCE(SUM(tc.runtime_minutes), 0),
+                COUNT(DISTINCT tc.original_language),
                 COALESCE(SUM(w.rewatch_count), 0)
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id
+            JOIN title_cards tc ON tc.title_id = w.title_id
             WHERE w.profile_id = :profile_id
         """),
         params,
@@ -70,9 +70,9 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
         text("""
             SELECT TRIM(g) AS genre, COUNT(*) AS cnt
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id,
-            LATERAL unnest(string_to_array(ct.genres, ',')) AS g
-            WHERE w.profile_id = :profile_id AND ct.genres IS NOT NULL
+            JOIN title_cards tc ON tc.title_id = w.title_id,
+            LATERAL unnest(string_to_array(tc.genres, ',')) AS g
+            WHERE w.profile_id = :profile_id AND tc.genres IS NOT NULL
             GROUP BY TRIM(g)
             ORDER BY cnt DESC
         """),
@@ -143,16 +143,15 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
     critic_rows = db.execute(
         text("""
             SELECT
-                ct.id,
-                ct.primary_title,
+                tc.title_id,
+                tc.primary_title,
                 w.rating_1_10 * 10.0 AS user_score,
-                COALESCE(cr.rt_critic_score, cr.average_rating * 10) AS critic_score
+                COALESCE(tc.rt_critic_score, tc.average_rating * 10) AS critic_score
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id
-            JOIN catalog_ratings cr ON cr.title_id = ct.id
+            JOIN title_cards tc ON tc.title_id = w.title_id
             WHERE w.profile_id = :profile_id
               AND w.rating_1_10 IS NOT NULL
-              AND (cr.rt_critic_score IS NOT NULL OR cr.average_rating IS NOT NULL)
+              AND (tc.rt_critic_score IS NOT NULL OR tc.average_rating IS NOT NULL)
         """),
         params,
     ).fetchall()
@@ -211,10 +210,10 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
     # 9. Decade distribution
     decade_rows = db.execute(
         text("""
-            SELECT (ct.start_year / 10) * 10 AS decade, COUNT(*)
+            SELECT (tc.start_year / 10) * 10 AS decade, COUNT(*)
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id
-            WHERE w.profile_id = :profile_id AND ct.start_year IS NOT NULL
+            JOIN title_cards tc ON tc.title_id = w.title_id
+            WHERE w.profile_id = :profile_id AND tc.start_year IS NOT NULL
             GROUP BY decade
             ORDER BY decade
         """),
@@ -227,10 +226,10 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
     # 10. Highest and lowest rated
     highest_rows = db.execute(
         text("""
-            SELECT ct.id, ct.primary_title, ct.start_year,
-                   w.rating_1_10, ct.poster_path
+            SELECT tc.title_id, tc.primary_title, tc.start_year,
+                   w.rating_1_10, tc.poster_path
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id
+            JOIN title_cards tc ON tc.title_id = w.title_id
             WHERE w.profile_id = :profile_id AND w.rating_1_10 IS NOT NULL
             ORDER BY w.rating_1_10 DESC, w.updated_at DESC
             LIMIT 5
@@ -250,10 +249,10 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
 
     lowest_rows = db.execute(
         text("""
-            SELECT ct.id, ct.primary_title, ct.start_year,
-                   w.rating_1_10, ct.poster_path
+            SELECT tc.title_id, tc.primary_title, tc.start_year,
+                   w.rating_1_10, tc.poster_path
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id
+            JOIN title_cards tc ON tc.title_id = w.title_id
             WHERE w.profile_id = :profile_id AND w.rating_1_10 IS NOT NULL
             ORDER BY w.rating_1_10 ASC, w.updated_at DESC
             LIMIT 5
@@ -274,13 +273,13 @@ def get_profile_stats(db: Session, profile_id: int) -> ProfileStats:
     # 11. Language diversity
     lang_rows = db.execute(
         text("""
-            SELECT ct.original_language, COUNT(*) AS cnt
+            SELECT tc.original_language, COUNT(*) AS cnt
             FROM watches w
-            JOIN catalog_titles ct ON ct.id = w.title_id
+            JOIN title_cards tc ON tc.title_id = w.title_id
             WHERE w.profile_id = :profile_id
-              AND ct.original_language IS NOT NULL
-              AND ct.original_language != ''
-            GROUP BY ct.original_language
+              AND tc.original_language IS NOT NULL
+              AND tc.original_language != ''
+            GROUP BY tc.original_language
             ORDER BY cnt DESC
             LIMIT 10
         """),
@@ -1,13 +1,25 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import httpx
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 from app.config import settings
+from app.database import SessionLocal
 from app.models.catalog import CatalogTitle, ProviderMaster, TrendingCache, WatchProvider
+from app.services.enrichment_state import (
+    TMDB_DETAIL_FIELDS,
+    record_fields,
+    suppressed_fields,
+    watch_providers_field,
+)
+from app.services.background import PeriodicTask
+from app.services.http import TMDB, get_async_client, get_client
+from app.services.singleflight import single_flight
 
 
 def get_poster_url(poster_path: str | None) -> str | None:
@@ -17,172 +29,159 @@ def get_poster_url(poster_path: str | None) -> str | None:
     return f"{settings.TMDB_IMAGE_BASE_URL}w300{poster_path}"
 
 
-def fetch_poster_path_from_tmdb(imdb_id: str) -> str | None:
-    """Fetch poster_path from TMDb API using an IMDb ID.
+# Sub-resources fetched together with a title in one TMDB round trip
+BUNDLE_APPENDS = "videos,watch/providers,external_ids"
 
-    Uses the "find by external ID" endpoint.
-    Returns the poster_path string (e.g. "/abc123.jpg") or None.
+
+def _pick_trailer_key(videos: list[dict]) -> str | None:
+    """Pick the best YouTube video: official Trailer > Teaser > any YouTube video."""
+    for video_type in ["Trailer", "Teaser"]:
+        for video in videos:
+            if (
+                video.get("site") == "YouTube"
+                and video.get("type") == video_type
+                and video.get("official", True)
+            ):
+                return video.get("key")
+
+    # Fallback to any YouTube video if no official trailer
+    for video in videos:
+        if video.get("site") == "YouTube":
+            return video.get("key")
+    return None
+
+
+def _bundle_from_response(data: dict, tmdb_id: int) -> dict:
+    return {
+        "tmdb_id": data.get("id", tmdb_id),
+        "imdb_id": (data.get("external_ids") or {}).get("imdb_id") or data.get("imdb_id"),
+        "poster_path": data.get("poster_path"),
+        "overview": data.get("overview"),
+        "trailer_key": _pick_trailer_key((data.get("videos") or {}).get("results", [])),
+        "original_language": data.get("original_language"),
+        "providers": (data.get("watch/providers") or {}).get("results", {}),
+    }
+
+
+def _unknown_title(imdb_id: str) -> dict:
+    """Bundle-shaped result for a title TMDB has no record of."""
+    return {
+        "tmdb_id": None,
+        "imdb_id": imdb_id,
+        "poster_path": None,
+        "overview": None,
+        "trailer_key": None,
+        "original_language": None,
+        "providers": None,
+    }
+
+
+def _find_match(find_data: dict) -> tuple[int, str] | None:
+    """(tmdb_id, media_type) of the first find result, movies before TV."""
+    for key, media_type in [("movie_results", "movie"), ("tv_results", "tv")]:
+        results = find_data.get(key, [])
+        if results and results[0].get("id"):
+            return results[0]["id"], media_type
+    return None
+
+
+def fetch_tmdb_bundle(tmdb_id: int, media_type: str = "movie") -> dict | None:
+    """Fetch a title's details, videos, watch providers and external ids in one call.
+
+    Returns dict with tmdb_id, imdb_id, poster_path, overview, trailer_key,
+    original_language and providers ({region: {"flatrate": [...], ...}}),
+    or None on error.
     """
     if not settings.TMDB_API_KEY:
         return None
 
-    url = f"https://api.themoviedb.org/3/find/{imdb_id}"
-    params = {
-        "api_key": settings.TMDB_API_KEY,
-        "external_source": "imdb_id",
-    }
+    url = f"/{media_type}/{tmdb_id}"
+    params = {"api_key": settings.TMDB_API_KEY, "append_to_response": BUNDLE_APPENDS}
 
     try:
-        resp = httpx.get(url, params=params, timeout=10.0)
+        resp = get_client(TMDB).get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
-
-        # Check movie_results first, then tv_results
-        for key in ("movie_results", "tv_results"):
-            results = data.get(key, [])
-            if results and results[0].get("poster_path"):
-                return results[0]["poster_path"]
-    except (httpx.HTTPError, KeyError, IndexError) as e:
-        logger.warning("Failed to fetch poster from TMDB for %s: %s", imdb_id, e)
-
-    return None
+        return _bundle_from_response(resp.json(), tmdb_id)
+    except (httpx.HTTPError, KeyError) as e:
+        logger.warning("Failed to fetch TMDB bundle for %s %s: %s", media_type, tmdb_id, e)
+        return None
 
 
-def fetch_movie_details_from_tmdb(imdb_id: str) -> dict | None:
-    """Fetch full movie details from TMDb API using an IMDb ID.
+def fetch_movie_details_from_tmdb(imdb_id: str, tmdb_id: int | None = None) -> dict | None:
+    """Fetch full movie details from TMDb, by TMDb ID when known or else by IMDb ID.
 
-    Uses the "find by external ID" endpoint to get TMDb ID,
-    then fetches movie details with videos appended.
-    Returns dict with tmdb_id, poster_path, overview, trailer_key (or None for each).
+    Without a tmdb_id, the "find by external ID" endpoint resolves it first.
+    Details, trailer and all regions' watch providers then come from a single
+    fetch_tmdb_bundle call. Returns the bundle dict, or None on error.
     """
     if not settings.TMDB_API_KEY:
         return None
+    if tmdb_id:
+        return fetch_tmdb_bundle(tmdb_id)
 
-    # First find the movie by IMDb ID
-    find_url = f"https://api.themoviedb.org/3/find/{imdb_id}"
+    find_url = f"/find/{imdb_id}"
     params = {
         "api_key": settings.TMDB_API_KEY,
         "external_source": "imdb_id",
     }
 
     try:
-        resp = httpx.get(find_url, params=params, timeout=10.0)
+        resp = get_client(TMDB).get(find_url, params=params)
         resp.raise_for_status()
-        find_data = resp.json()
-
-        tmdb_id = None
-        media_type = None
-        result = {"tmdb_id": None, "poster_path": None, "overview": None, "trailer_key": None, "original_language": None}
-
-        # Check movie_results first, then tv_results
-        for key, mtype in [("movie_results", "movie"), ("tv_results", "tv")]:
-            results = find_data.get(key, [])
-            if results:
-                item = results[0]
-                tmdb_id = item.get("id")
-                media_type = mtype
-                result["tmdb_id"] = tmdb_id
-                result["poster_path"] = item.get("poster_path")
-                result["overview"] = item.get("overview")
-                result["original_language"] = item.get("original_language")
-                break
-
-        if not tmdb_id:
-            return result
-
-        # Fetch videos to get trailer
-        videos_url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}/videos"
-        videos_resp = httpx.get(videos_url, params={"api_key": settings.TMDB_API_KEY}, timeout=10.0)
-        videos_resp.raise_for_status()
-        videos_data = videos_resp.json()
-
-        # Find YouTube trailer (prefer official trailers)
-        videos = videos_data.get("results", [])
-        trailer_key = None
-
-        # Priority: Official Trailer > Trailer > Teaser > any YouTube video
-        for video_type in ["Trailer", "Teaser"]:
-            for video in videos:
-                if (
-                    video.get("site") == "YouTube"
-                    and video.get("type") == video_type
-                    and video.get("official", True)
-                ):
-                    trailer_key = video.get("key")
-                    break
-            if trailer_key:
-                break
-
-        # Fallback to any YouTube video if no official trailer
-        if not trailer_key:
-            for video in videos:
-                if video.get("site") == "YouTube":
-                    trailer_key = video.get("key")
-                    break
-
-        result["trailer_key"] = trailer_key
-        return result
-
-    except (httpx.HTTPError, KeyError, IndexError) as e:
+        match = _find_match(resp.json())
+    except (httpx.HTTPError, KeyError) as e:
         logger.warning("Failed to fetch movie details from TMDB for %s: %s", imdb_id, e)
+        return None
 
-    return None
+    if match is None:
+        return _unknown_title(imdb_id)
+    return fetch_tmdb_bundle(*match)
 
 
-def get_or_fetch_poster_path(db: Session, title: CatalogTitle) -> str | None:
-    """Return cached poster_path, or fetch from TMDb and cache it.
+async def afetch_movie_details_from_tmdb(imdb_id: str, tmdb_id: int | None = None) -> dict:
+    """Async fetch_movie_details_from_tmdb for bulk pipelines.
 
-    This is the lazy-fill mechanism: if poster_path is null when a movie
-    is requested, we attempt to fetch it from TMDb and store it.
+    Unlike the sync version this raises httpx.HTTPError on failure, so the
+    caller can tell an outage from a title TMDB does not know (which returns
+    an empty bundle).
     """
-    if title.poster_path is not None:
-        return title.poster_path
-
-    poster_path = fetch_poster_path_from_tmdb(title.imdb_tconst)
-    if poster_path:
-        title.poster_path = poster_path
-        db.commit()
-
-    return poster_path
+    client = get_async_client(TMDB)
+    media_type = "movie"
+    if not tmdb_id:
+        resp = await client.get(
+            f"/find/{imdb_id}",
+            params={"api_key": settings.TMDB_API_KEY, "external_source": "imdb_id"},
+        )
+        resp.raise_for_status()
+        match = _find_match(resp.json())
+        if match is None:
+            return _unknown_title(imdb_id)
+        tmdb_id, media_type = match
+
+    resp = await client.get(
+        f"/{media_type}/{tmdb_id}",
+        params={"api_key": settings.TMDB_API_KEY, "append_to_response": BUNDLE_APPENDS},
+    )
+    if resp.status_code == 404:
+        return _unknown_title(imdb_id)
+    resp.raise_for_status()
+    return _bundle_from_response(resp.json(), tmdb_id)
 
 
-def get_or_fetch_movie_details(db: Session, title: CatalogTitle) -> dict:
-    """Return cached movie details, or fetch from TMDb and cache them.
+def missing_detail_fields(title: CatalogTitle) -> list[str]:
+    return [field for field in TMDB_DETAIL_FIELDS if getattr(title, field) is None]
 
-    Fetches poster_path, overview, trailer_key, and tmdb_id if not already cached.
-    Returns dict with poster_path, overview, trailer_key.
-    """
-    needs_fetch = (
-        title.poster_path is None
-        or title.overview is None
-        or title.trailer_key is None
-        or title.tmdb_id is None
-        or title.original_language is None
-    )
 
-    if not needs_fetch:
-        return {
-            "poster_path": title.poster_path,
-            "overview": title.overview,
-            "trailer_key": title.trailer_key,
-            "original_language": title.original_language,
-        }
+def movie_details_need_fetch(db: Session, title: CatalogTitle) -> bool:
+    """True if a detail field is NULL and TMDB is not known to lack it."""
+    missing = missing_detail_fields(title)
+    if not missing:
+        return False
+    return bool(set(missing) - suppressed_fields(db, title.id, missing))
 
-    details = fetch_movie_details_from_tmdb(title.imdb_tconst)
-    if details:
-        # Only update fields that are currently null
-        if title.tmdb_id is None and details.get("tmdb_id"):
-            title.tmdb_id = details["tmdb_id"]
-        if title.poster_path is None and details.get("poster_path"):
-            title.poster_path = details["poster_path"]
-        if title.overview is None and details.get("overview"):
-            title.overview = details["overview"]
-        if title.trailer_key is None and details.get("trailer_key"):
-            title.trailer_key = details["trailer_key"]
-        if title.original_language is None and details.get("original_language"):
-            title.original_language = details["original_language"]
-        db.commit()
 
+def cached_movie_details(title: CatalogTitle) -> dict:
+    """Movie details as currently stored, without calling TMDb."""
     return {
         "poster_path": title.poster_path,
         "overview": title.overview,
@@ -191,6 +190,20 @@ def get_or_fetch_movie_details(db: Session, title: CatalogTitle) -> dict:
     }
 
 
+def _apply_movie_details(title: CatalogTitle, details: dict) -> None:
+    """Fill only the detail fields that are currently null."""
+    if title.tmdb_id is None and details.get("tmdb_id"):
+        title.tmdb_id = details["tmdb_id"]
+    if title.poster_path is None and details.get("poster_path"):
+        title.poster_path = details["poster_path"]
+    if title.overview is None and details.get("overview"):
+        title.overview = details["overview"]
+    if title.trailer_key is None and details.get("trailer_key"):
+        title.trailer_key = details["trailer_key"]
+    if title.original_language is None and details.get("original_language"):
+        title.original_language = details["original_language"]
+
+
 # Trending cache settings
 TRENDING_CACHE_DAYS = 7
 
@@ -203,11 +216,11 @@ def fetch_tmdb_trending() -> list[dict]:
     if not settings.TMDB_API_KEY:
         return []
 
-    url = "https://api.themoviedb.org/3/trending/movie/week"
+    url = "/trending/movie/week"
     params = {"api_key": settings.TMDB_API_KEY}
 
     try:
-        resp = httpx.get(url, params=params, timeout=10.0)
+        resp = get_client(TMDB).get(url, params=params)
         resp.raise_for_status()
         data = resp.json()
         return data.get("results", [])
@@ -216,72 +229,91 @@ def fetch_tmdb_trending() -> list[dict]:
         return []
 
 
-def get_imdb_id_from_tmdb(tmdb_id: int) -> str | None:
-    """Get IMDB ID for a TMDB movie ID."""
-    if not settings.TMDB_API_KEY:
-        return None
-
-    url = f"https://api.themoviedb.org/3/movie/{tmdb_id}/external_ids"
-    params = {"api_key": settings.TMDB_API_KEY}
+def store_movie_details(db: Session, results: list[tuple[int, dict]]) -> None:
+    """Write fetched TMDB payloads for many titles in the caller's transaction.
 
-    try:
-        resp = httpx.get(url, params=params, timeout=10.0)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("imdb_id")
-    except (httpx.HTTPError, KeyError) as e:
-        logger.warning("Failed to get IMDB ID from TMDB for tmdb_id %s: %s", tmdb_id, e)
-        return None
+    Fills only detail fields that are still NULL, matching the lazy-fill rules,
+    stores the watch providers that came with each payload, and records which
+    fields TMDB had for negative caching.
+    """
+    if not results:
+        return
+    params: dict = {}
+    values = []
+    for i, (title_id, d) in enumerate(results):
+        params[f"id{i}"] = title_id
+        params.update({f"{f}{i}": d.get(f) for f in TMDB_DETAIL_FIELDS})
+        values.append(
+            f"(CAST(:id{i} AS integer), CAST(:tmdb_id{i} AS integer), :poster_path{i}, "
+            f":overview{i}, :trailer_key{i}, :original_language{i})"
+        )
+    db.execute(
+        text(f"""
+            UPDATE catalog_titles ct SET
+                tmdb_id = COALESCE(ct.tmdb_id, v.tmdb_id),
+                poster_path = COALESCE(ct.poster_path, v.poster_path),
+                overview = COALESCE(ct.overview, v.overview),
+                trailer_key = COALESCE(ct.trailer_key, v.trailer_key),
+                original_language = COALESCE(ct.original_language, v.original_language)
+            FROM (VALUES {", ".join(values)})
+                AS v(id, tmdb_id, poster_path, overview, trailer_key, original_language)
+            WHERE ct.id = v.id
+        """),
+        params,
+    )
+    store_watch_providers_many(db, [(title_id, d["providers"]) for title_id, d in results if d.get("providers") is not None])
+    record_fields(db, [
+        (title_id, field, d.get(field) is not None)
+        for title_id, d in results
+        for field in TMDB_DETAIL_FIELDS
+    ])
 
 
 def refresh_trending_cache(db: Session) -> int:
     """Refresh the trending cache from TMDB.
 
+    Trending tmdb_ids are matched to the catalog in one query. Misses are
+    looked up concurrently on TMDB (the bundle carries the imdb id, details
+    and providers), matched by imdb_tconst in a second query, and filled in.
     Returns the number of movies successfully matched to catalog.
     """
-    trending = fetch_tmdb_trending()
+    trending = [m["id"] for m in fetch_tmdb_trending() if m.get("id")]
     if not trending:
         return 0
 
-    # Build new entries first before deleting old ones
-    new_entries = []
-    matched_count = 0
-
-    for rank, movie in enumerate(trending, start=1):
-        tmdb_id = movie.get("id")
-        if not tmdb_id:
-            continue
-
-        # Try to find by tmdb_id first
-        title = db.query(CatalogTitle).filter(CatalogTitle.tmdb_id == tmdb_id).first()
-
-        # Fallback: get IMDB ID from TMDB and match by imdb_tconst
-        if not title:
-            imdb_id = get_imdb_id_from_tmdb(tmdb_id)
-            if imdb_id:
-                title = db.query(CatalogTitle).filter(
-                    CatalogTitle.imdb_tconst == imdb_id
-                ).first()
-                # If found, update the tmdb_id for future lookups
-                if title and not title.tmdb_id:
-                    title.tmdb_id = tmdb_id
-
-        new_entries.append(TrendingCache(
-            tmdb_id=tmdb_id,
-            title_id=title.id if title else None,
-            rank=rank,
-        ))
-
-        if title:
-            matched_count += 1
-
-    # Only delete old entries after successfully building new ones
-    db.query(TrendingCache).delete()
-    for entry in new_entries:
-        db.add(entry)
+    by_tmdb_id = dict(
+        db.execute(
+            text("SELECT tmdb_id, id FROM catalog_titles WHERE tmdb_id = ANY(:tmdb_ids)"),
+            {"tmdb_ids": trending},
+        ).fetchall()
+    )
 
+    # Fallback: get IMDB IDs from TMDB and match by imdb_tconst
+    misses = [tmdb_id for tmdb_id in trending if tmdb_id not in by_tmdb_id]
+    if misses:
+        with ThreadPoolExecutor(max_workers=settings.TRENDING_REFRESH_CONCURRENCY) as pool:
+            bundles = [b for b in pool.map(fetch_tmdb_bundle, misses) if b and b.get("imdb_id")]
+        by_tconst = dict(
+            db.execute(
+                text("SELECT imdb_tconst, id FROM catalog_titles WHERE imdb_tconst = ANY(:tconsts)"),
+                {"tconsts": [b["imdb_id"] for b in bundles]},
+            ).fetchall()
+        ) if bundles else {}
+        matched = [(by_tconst[b["imdb_id"]], b) for b in bundles if b["imdb_id"] in by_tconst]
+        store_movie_details(db, matched)
+        by_tmdb_id.update({b["tmdb_id"]: title_id for title_id, b in matched})
+
+    # Replace the cache in one statement pair; readers see the old rows until commit
+    db.execute(text("DELETE FROM trending_cache"))
+    db.execute(
+        text("INSERT INTO trending_cache (tmdb_id, title_id, rank) VALUES (:tmdb_id, :title_id, :rank)"),
+        [
+            {"tmdb_id": tmdb_id, "title_id": by_tmdb_id.get(tmdb_id), "rank": rank}
+            for rank, tmdb_id in enumerate(trending, start=1)
+        ],
+    )
     db.commit()
-    return matched_count
+    return sum(1 for tmdb_id in trending if tmdb_id in by_tmdb_id)
 
 
 def is_trending_cache_fresh(db: Session) -> bool:
@@ -294,15 +326,56 @@ def is_trending_cache_fresh(db: Session) -> bool:
     return latest.fetched_at > cutoff
 
 
+def refresh_trending_if_stale() -> bool:
+    """Background job: refresh the trending cache once it is older than TRENDING_CACHE_DAYS.
+
+    Every worker runs the job; the single-flight lock and re-check make
+    only one of them call TMDB. Returns True if it refreshed.
+    """
+    if not settings.TMDB_API_KEY:
+        return False
+    db = SessionLocal()
+    try:
+        if is_trending_cache_fresh(db):
+            return False
+        with single_flight(db, "tmdb-trending", 0):
+            if is_trending_cache_fresh(db):
+                return False
+            refresh_trending_cache(db)
+            return True
+    finally:
+        db.close()
+
+
+_trending_refresher: PeriodicTask | None = None
+
+
+def start_trending_refresher() -> None:
+    """Start the scheduled trending refresh (no-op unless enabled)."""
+    global _trending_refresher
+    if not settings.TRENDING_REFRESH_ENABLED or _trending_refresher is not None:
+        return
+    _trending_refresher = PeriodicTask(
+        "trending-refresh",
+        settings.TRENDING_REFRESH_CHECK_SECONDS,
+        refresh_trending_if_stale,
+    )
+    _trending_refresher.start()
+
+
+def stop_trending_refresher() -> None:
+    global _trending_refresher
+    if _trending_refresher is not None:
+        _trending_refresher.stop()
+        _trending_refresher = None
+
+
 def get_trending_title_ids(db: Session, limit: int = 20) -> list[int]:
-    """Get cached trending movie title IDs, refreshing if stale.
+    """Get cached trending movie title IDs.
 
+    Never calls TMDB; the cache is kept fresh by the background refresher.
     Returns list of title_ids in trending order.
     """
-    # Check if cache is fresh, refresh if not
-    if not is_trending_cache_fresh(db):
-        refresh_trending_cache(db)
-
     # Get cached results with matched titles
     results = (
         db.query(TrendingCache.title_id)
@@ -319,80 +392,147 @@ def get_trending_title_ids(db: Session, limit: int = 20) -> list[int]:
 PROVIDER_CACHE_DAYS = 30
 
 
-def fetch_watch_providers_from_tmdb(tmdb_id: int, region: str = "US") -> dict | None:
-    """Fetch watch providers for a movie from TMDB API.
+def sync_title_availability(db: Session, title_id: int, region: str) -> None:
+    """Rebuild the title_availability row for a title/region from watch_providers.
 
-    Returns dict with flatrate, rent, buy lists of provider dicts.
+    Call after changing a title's watch_providers rows, in the same transaction.
     """
-    if not settings.TMDB_API_KEY:
-        return None
+    sync_title_availability_many(db, [(title_id, region)])
+
+
+def sync_title_availability_many(db: Session, pairs: list[tuple[int, str]]) -> None:
+    """sync_title_availability for many (title_id, region) pairs in one statement."""
+    if not pairs:
+        return
+    db.execute(
+        text("""
+            INSERT INTO title_availability (title_id, region, flatrate_provider_ids, updated_at)
+            SELECT
+                k.title_id,
+                k.region,
+                COALESCE(
+                    array_agg(DISTINCT wp.provider_id ORDER BY wp.provider_id)
+                        FILTER (WHERE wp.provider_type = 'flatrate'),
+                    '{}'
+                ),
+                now()
+            FROM unnest(CAST(:title_ids AS integer[]), CAST(:regions AS varchar[])) AS k(title_id, region)
+            LEFT JOIN watch_providers wp ON wp.title_id = k.title_id AND wp.region = k.region
+            GROUP BY k.title_id, k.region
+            ON CONFLICT (title_id, region) DO UPDATE
+            SET flatrate_provider_ids = EXCLUDED.flatrate_provider_ids,
+                updated_at = EXCLUDED.updated_at
+        """),
+        {"title_ids": [p[0] for p in pairs], "regions": [p[1] for p in pairs]},
+    )
 
-    url = f"https://api.themoviedb.org/3/movie/{tmdb_id}/watch/providers"
-    params = {"api_key": settings.TMDB_API_KEY}
 
-    try:
-        resp = httpx.get(url, params=params, timeout=10.0)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("results", {}).get(region)
-    except (httpx.HTTPError, KeyError) as e:
-        logger.warning("Failed to fetch watch providers from TMDB for tmdb_id %s: %s", tmdb_id, e)
-        return None
+def store_watch_providers(db: Session, title_id: int, providers: dict[str, dict]) -> None:
+    """Replace a title's watch providers for every region in a TMDB providers payload.
+
+    `providers` maps region to {"flatrate": [...], "rent": [...], "buy": [...]},
+    as returned under "watch/providers" by fetch_tmdb_bundle. The payload is
+    authoritative: regions the title had before but that are missing from it are
+    cleared, and their availability synced to '{}'. Runs in the caller's transaction.
+    """
+    store_watch_providers_many(db, [(title_id, providers)])
+
+
+def store_watch_providers_many(db: Session, items: list[tuple[int, dict[str, dict]]]) -> None:
+    """store_watch_providers for many titles: one delete, one insert, one availability sync."""
+    if not items:
+        return
+    # Every region the titles had before, so the ones the payloads dropped get cleared
+    previous = db.execute(
+        text("""
+            WITH cleared AS (
+                DELETE FROM watch_providers WHERE title_id = ANY(:title_ids)
+                RETURNING title_id, region
+            )
+            SELECT title_id, region FROM cleared
+            UNION
+            SELECT title_id, region FROM title_availability WHERE title_id = ANY(:title_ids)
+        """),
+        {"title_ids": list({title_id for title_id, _ in items})},
+    ).fetchall()
+    pairs = {(title_id, region) for title_id, providers in items for region in providers}
+    pairs.update((title_id, region) for title_id, region in previous)
+    rows = {
+        (title_id, region, p["provider_id"], ptype): {
+            "title_id": title_id,
+            "provider_id": p["provider_id"],
+            "provider_name": p["provider_name"],
+            "logo_path": p.get("logo_path"),
+            "provider_type": ptype,
+            "region": region,
+            "display_priority": p.get("display_priority"),
+        }
+        for title_id, providers in items
+        for region, region_data in providers.items()
+        for ptype in ("flatrate", "rent", "buy")
+        for p in region_data.get(ptype, [])
+    }
+    if rows:
+        db.execute(
+            text("""
+                INSERT INTO watch_providers
+                    (title_id, provider_id, provider_name, logo_path, provider_type, region, display_priority)
+                VALUES
+                    (:title_id, :provider_id, :provider_name, :logo_path, :provider_type, :region, :display_priority)
+            """),
+            list(rows.values()),
+        )
+    sync_title_availability_many(db, sorted(pairs))
 
 
 def get_or_fetch_watch_providers(
     db: Session, title: CatalogTitle, region: str = "US"
 ) -> list[WatchProvider]:
-    """Return cached watch providers, or fetch from TMDB and cache them."""
-    # Check for cached providers that are still fresh
-    cutoff = datetime.now(timezone.utc) - timedelta(days=PROVIDER_CACHE_DAYS)
-    cached = (
-        db.query(WatchProvider)
-        .filter(
-            WatchProvider.title_id == title.id,
-            WatchProvider.region == region,
-            WatchProvider.fetched_at > cutoff,
-        )
-        .all()
-    )
+    """Return cached watch providers, or fetch from TMDB and cache them.
 
+    A miss refreshes every region, and any missing movie details, in one call.
+    """
+    cached = _fresh_cached_providers(db, title.id, region)
     if cached:
         return cached
 
-    # Need TMDB ID to fetch providers
-    if not title.tmdb_id:
-        # Try to get tmdb_id first via movie details fetch
-        details = get_or_fetch_movie_details(db, title)
-        if not title.tmdb_id:
+    # No providers in this region last time we asked; wait for the re-check
+    field = watch_providers_field(region)
+    if suppressed_fields(db, title.id, [field]):
+        return []
+
+    # Concurrent misses for the same title share one TMDB fetch
+    with single_flight(db, "tmdb-title", title.id):
+        cached = _fresh_cached_providers(db, title.id, region)
+        if cached:
+            return cached
+
+        db.refresh(title)
+        details = fetch_movie_details_from_tmdb(title.imdb_tconst, title.tmdb_id)
+        if not details:
             return []
 
-    provider_data = fetch_watch_providers_from_tmdb(title.tmdb_id, region)
-    if not provider_data:
-        return []
+        providers = details.get("providers")
+        _apply_movie_details(title, details)
+        if providers is not None:
+            store_watch_providers(db, title.id, providers)
+        record_fields(db, [(title.id, field, bool((providers or {}).get(region)))])
+        db.commit()
 
-    # Delete stale entries only after successful fetch
-    db.query(WatchProvider).filter(
-        WatchProvider.title_id == title.id,
-        WatchProvider.region == region,
-    ).delete()
-
-    providers = []
-    for ptype in ("flatrate", "rent", "buy"):
-        for p in provider_data.get(ptype, []):
-            wp = WatchProvider(
-                title_id=title.id,
-                provider_id=p["provider_id"],
-                provider_name=p["provider_name"],
-                logo_path=p.get("logo_path"),
-                provider_type=ptype,
-                region=region,
-                display_priority=p.get("display_priority"),
-            )
-            db.add(wp)
-            providers.append(wp)
+    return _fresh_cached_providers(db, title.id, region)
 
-    db.commit()
-    return providers
+
+def _fresh_cached_providers(db: Session, title_id: int, region: str) -> list[WatchProvider]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=PROVIDER_CACHE_DAYS)
+    return (
+        db.query(WatchProvider)
+        .filter(
+            WatchProvider.title_id == title_id,
+            WatchProvider.region == region,
+            WatchProvider.fetched_at > cutoff,
+        )
+        .all()
+    )
 
 
 def refresh_provider_master(db: Session, region: str = "US") -> int:
@@ -403,11 +543,11 @@ def refresh_provider_master(db: Session, region: str = "US") -> int:
     if not settings.TMDB_API_KEY:
         return 0
 
-    url = "https://api.themoviedb.org/3/watch/providers/movie"
+    url = "/watch/providers/movie"
     params = {"api_key": settings.TMDB_API_KEY, "watch_region": region}
 
     try:
-        resp = httpx.get(url, params=params, timeout=10.0)
+        resp = get_client(TMDB).get(url, params=params)
         resp.raise_for_status()
         data = resp.json()
     except (httpx.HTTPError, KeyError) as e:
@@ -1,7 +1,32 @@
+from datetime import date, datetime
+
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.personal import Tag, Watch
+from app.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+)
+
+# Keysets for watch history; NULL dates/ratings map to the lowest value so
+# they sort last, and the watch id breaks ties.
+HISTORY_KEYSETS = {
+    "watched_date": [
+        (func.coalesce(Watch.watched_date, date.min), "desc"),
+        (Watch.id, "desc"),
+    ],
+    "rating": [
+        (func.coalesce(Watch.rating_1_10, 0), "desc"),
+        (Watch.id, "desc"),
+    ],
+    "created_at": [
+        (Watch.created_at, "desc"),
+        (Watch.id, "desc"),
+    ],
+}
 
 
 def create_or_update_watch(
@@ -66,6 +91,26 @@ def update_watch(
     return watch
 
 
+def _history_key_values(watch: Watch, sort_by: str) -> list:
+    if sort_by == "rating":
+        return [watch.rating_1_10 or 0, watch.id]
+    if sort_by == "created_at":
+        return [watch.created_at, watch.id]
+    return [watch.watched_date or date.min, watch.id]
+
+
+def _parse_history_cursor(cursor: str, sort_by: str) -> list:
+    values = decode_cursor(cursor, sort_by, 2)
+    try:
+        if sort_by == "watched_date":
+            values[0] = date.fromisoformat(values[0])
+        elif sort_by == "created_at":
+            values[0] = datetime.fromisoformat(values[0])
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+    return values
+
+
 def get_watch_history(
     db: Session,
     profile_id: int,
@@ -75,7 +120,13 @@ def get_watch_history(
     tag: str | None = None,
     min_rating: int | None = None,
     max_rating: int | None = None,
-) -> tuple[list[Watch], int]:
+    cursor: str | None = None,
+) -> tuple[list[Watch], int, str | None]:
+    """Return (watches, total, next_cursor) for a profile's history."""
+    if sort_by not in HISTORY_KEYSETS:
+        sort_by = "watched_date"
+    keyset = HISTORY_KEYSETS[sort_by]
+
     base = (
         db.query(Watch)
         .options(joinedload(Watch.title), joinedload(Watch.tags))
@@ -92,16 +143,15 @@ def get_watch_history(
 
     total = base.count()
 
-    sort_column = {
-        "watched_date": Watch.watched_date.desc().nulls_last(),
-        "rating": Watch.rating_1_10.desc().nulls_last(),
-        "created_at": Watch.created_at.desc(),
-    }.get(sort_by, Watch.watched_date.desc().nulls_last())
+    if cursor:
+        after = _parse_history_cursor(cursor, sort_by)
+        base = base.filter(keyset_filter(keyset, after))
+    else:
+        base = base.offset((page - 1) * limit)
 
     results = (
-        base.order_by(sort_column)
-        .offset((page - 1) * limit)
-        .limit(limit)
+        base.order_by(*(expr.desc() for expr, _ in keyset))
+        .limit(limit + 1)
         .all()
     )
 
@@ -113,7 +163,12 @@ def get_watch_history(
             seen.add(w.id)
             unique_results.append(w)
 
-    return unique_results, total
+    next_cursor = None
+    if len(unique_results) > limit:
+        unique_results = unique_results[:limit]
+        next_cursor = encode_cursor(sort_by, _history_key_values(unique_results[-1], sort_by))
+
+    return unique_results, total, next_cursor
 
 
 def get_watch_by_title(db: Session, profile_id: int, title_id: int) -> Watch | None:
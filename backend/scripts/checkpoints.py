@@ -0,0 +1,72 @@
+"""Resumable progress for bulk scripts, kept in enrichment_checkpoints.
+
+A job reads titles in keyset pages and may finish them out of order (many
+concurrent fetchers), so its cursor only moves past a page once every title
+of that page has been written, in the same transaction as the write.
+"""
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+
+
+@dataclass
+class Page:
+    remaining: int
+    last_key: list
+    complete: bool = False  # every row of the page has been queued
+
+
+def load_checkpoint(job: str, restart: bool) -> str | None:
+    """Cursor to resume from; a finished or restarted job starts a fresh run."""
+    db = SessionLocal()
+    try:
+        row = db.execute(
+            text("SELECT cursor, finished_at FROM enrichment_checkpoints WHERE job = :job"),
+            {"job": job},
+        ).fetchone()
+        if row is not None and not restart and row[1] is None:
+            return row[0]
+        db.execute(
+            text("""
+                INSERT INTO enrichment_checkpoints (job, cursor, processed, written, errors, started_at, updated_at)
+                VALUES (:job, NULL, 0, 0, 0, now(), now())
+                ON CONFLICT (job) DO UPDATE SET
+                    cursor = NULL, processed = 0, written = 0, errors = 0,
+                    started_at = now(), updated_at = now(), finished_at = NULL
+            """),
+            {"job": job},
+        )
+        db.commit()
+        return None
+    finally:
+        db.close()
+
+
+def save_checkpoint(db, job: str, cursor: str | None, processed: int, written: int, errors: int) -> None:
+    """Advance the job's checkpoint in the caller's transaction."""
+    db.execute(
+        text("""
+            UPDATE enrichment_checkpoints SET
+                cursor = COALESCE(:cursor, cursor),
+                processed = processed + :processed,
+                written = written + :written,
+                errors = errors + :errors,
+                updated_at = now()
+            WHERE job = :job
+        """),
+        {"job": job, "cursor": cursor, "processed": processed, "written": written, "errors": errors},
+    )
+
+
+def finish_checkpoint(job: str) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            text("UPDATE enrichment_checkpoints SET finished_at = now(), updated_at = now() WHERE job = :job"),
+            {"job": job},
+        )
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,102 @@
+"""Delete people no movie credits from catalog_people.
+
+Usage:
+    cd backend
+    python -u -m scripts.compact_people [--batch-size 50000]
+
+One-off cleanup for databases loaded before ingest_imdb started loading
+only people credited on movies. A person is kept when they appear in
+catalog_principals or in any title's director/writer list in catalog_crew.
+Rows are deleted in id-ordered batches, each committed on its own so the
+table stays usable while it runs; run VACUUM (or let autovacuum) reclaim
+the space afterwards.
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+sys.path.insert(0, ".")
+from app.database import SessionLocal
+
+PEOPLE_SOURCE = "catalog_people"  # ingest_row_hashes source of the people TableSpec
+
+
+def compact_people(db, batch_size: int = 50_000) -> int:
+    """Delete unreferenced people in batches; returns how many were removed."""
+    # Credited crew nconsts, gathered once rather than unnesting per batch
+    db.execute(text("DROP TABLE IF EXISTS crew_nconsts"))
+    db.execute(
+        text("""
+            CREATE TEMP TABLE crew_nconsts AS
+            SELECT DISTINCT n AS imdb_nconst
+            FROM catalog_crew cc, unnest(cc.director_nconsts || cc.writer_nconsts) AS n
+        """)
+    )
+    db.execute(text("CREATE INDEX ON crew_nconsts (imdb_nconst)"))
+    db.execute(text("ANALYZE crew_nconsts"))
+    db.commit()
+
+    deleted = 0
+    after = 0
+    while True:
+        last = db.execute(
+            text("""
+                SELECT max(id) FROM (
+                    SELECT id FROM catalog_people WHERE id > :after ORDER BY id LIMIT :size
+                ) batch
+            """),
+            {"after": after, "size": batch_size},
+        ).scalar()
+        if last is None:
+            break
+        removed = db.execute(
+            text("""
+                DELETE FROM catalog_people cp
+                WHERE cp.id > :after AND cp.id <= :last
+                  AND NOT EXISTS (SELECT 1 FROM catalog_principals pr WHERE pr.person_id = cp.id)
+                  AND NOT EXISTS (SELECT 1 FROM crew_nconsts c WHERE c.imdb_nconst = cp.imdb_nconst)
+                RETURNING CAST(substr(cp.imdb_nconst, 3) AS bigint)
+            """),
+            {"after": after, "last": last},
+        ).scalars().all()
+        if removed:
+            # Forget their delta hashes so a later --all-people delta run re-adds them
+            db.execute(
+                text("""
+                    DELETE FROM ingest_row_hashes
+                    WHERE source = :source AND key1 = ANY(CAST(:keys AS bigint[]))
+                """),
+                {"source": PEOPLE_SOURCE, "keys": removed},
+            )
+        db.commit()
+        deleted += len(removed)
+        after = last
+    db.execute(text("DROP TABLE crew_nconsts"))
+    db.commit()
+    return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete people no movie credits from catalog_people")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="People ids scanned per transaction")
+    args = parser.parse_args()
+
+    start = time.time()
+    db = SessionLocal()
+    try:
+        before = db.execute(text("SELECT count(*) FROM catalog_people")).scalar()
+        deleted = compact_people(db, args.batch_size)
+    finally:
+        db.close()
+
+    print("\nDone!")
+    print(f"  People before: {before:,}")
+    print(f"  People deleted: {deleted:,}")
+    print(f"  People kept: {before - deleted:,}")
+    print(f"  Took {time.time() - start:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
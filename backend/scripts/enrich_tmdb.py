@@ -0,0 +1,266 @@
+"""Fill TMDB details and streaming availability for the catalog in one pass.
+
+Usage:
+    cd backend
+    python -u -m scripts.enrich_tmdb [--limit 10000] [--region US] [--concurrency 8]
+                                     [--batch-size 200] [--no-providers] [--restart]
+
+Replaces the old per-field seed scripts (posters, original language,
+providers). Titles are processed by popularity (num_votes DESC) and each one
+that is missing a TMDB detail field or has no availability row for --region
+costs one bundle call (two without a stored tmdb_id), which returns poster,
+overview, trailer, original language and every region's providers at once.
+
+Stages run concurrently:
+  1. a reader pages through titles that still need work,
+  2. --concurrency fetchers call TMDB, paced by the shared rate limiter in
+     the bulk lane so interactive traffic keeps priority,
+  3. a writer stores results in batches of --batch-size with a single
+     UPDATE ... FROM (VALUES ...) and batched provider writes.
+
+Progress is checkpointed in enrichment_checkpoints in the same transaction
+as each batch, so an interrupted run resumes after the last title it fully
+wrote. Use --restart to start over from the most popular title.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+from sqlalchemy import text
+
+sys.path.insert(0, ".")
+from app.config import settings
+from app.database import SessionLocal
+from app.services.circuit import UpstreamUnavailable
+from app.services.enrichment_state import TMDB_DETAIL_FIELDS
+from app.services.http import TMDB, aclose_async_clients, get_http_metrics
+from app.services.pagination import decode_cursor, encode_cursor, keyset_clause
+from app.services.ratelimit import set_default_lane
+from app.services.tmdb import afetch_movie_details_from_tmdb, store_movie_details
+from scripts.checkpoints import Page, finish_checkpoint, load_checkpoint, save_checkpoint
+
+logger = logging.getLogger(__name__)
+
+KEYS = [("COALESCE(cr.num_votes, 0)", "desc"), ("ct.id", "desc")]
+MAX_ATTEMPTS = 3
+REPORT_SECONDS = 10.0
+WRITE_FLUSH_SECONDS = 2.0
+
+_MISSING_DETAIL = " OR ".join(
+    f"(ct.{f} IS NULL AND NOT EXISTS ("
+    f"SELECT 1 FROM title_enrichment_state es WHERE es.title_id = ct.id AND es.field = '{f}' "
+    f"AND es.not_available AND es.next_check_at > now()))"
+    for f in TMDB_DETAIL_FIELDS
+)
+_MISSING_PROVIDERS = (
+    "NOT EXISTS (SELECT 1 FROM title_availability ta WHERE ta.title_id = ct.id AND ta.region = :region)"
+)
+
+
+@dataclass
+class Stats:
+    started: float = field(default_factory=time.monotonic)
+    api_calls_at_start: int = 0
+    read: int = 0
+    fetched: int = 0
+    written: int = 0
+    errors: int = 0
+
+    def api_calls(self) -> int:
+        return get_http_metrics()[TMDB]["requests"] - self.api_calls_at_start
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"read {self.read} ({self.read / elapsed:.1f}/s) | "
+            f"fetch {self.fetched} ({self.fetched / elapsed:.1f}/s, {self.api_calls()} API calls) | "
+            f"write {self.written} ({self.written / elapsed:.1f}/s) | "
+            f"errors {self.errors}"
+        )
+
+
+def read_page(after: list | None, region: str, providers: bool, size: int) -> list:
+    """Next page of (id, imdb_tconst, tmdb_id, num_votes) needing work, in keyset order."""
+    needs_work = f"({_MISSING_DETAIL} OR {_MISSING_PROVIDERS})" if providers else f"({_MISSING_DETAIL})"
+    params: dict = {"region": region, "size": size}
+    after_sql = ""
+    if after is not None:
+        clause, after_params = keyset_clause(KEYS, after)
+        after_sql = f"AND {clause}"
+        params.update(after_params)
+    db = SessionLocal()
+    try:
+        return db.execute(
+            text(f"""
+                SELECT ct.id, ct.imdb_tconst, ct.tmdb_id, COALESCE(cr.num_votes, 0)
+                FROM catalog_titles ct
+                JOIN catalog_ratings cr ON cr.title_id = ct.id
+                WHERE {needs_work} {after_sql}
+                ORDER BY COALESCE(cr.num_votes, 0) DESC, ct.id DESC
+                LIMIT :size
+            """),
+            params,
+        ).fetchall()
+    finally:
+        db.close()
+
+
+def write_batch(job: str, results: list[tuple[int, dict]], cursor: str | None, processed: int, errors: int) -> None:
+    db = SessionLocal()
+    try:
+        store_movie_details(db, results)
+        save_checkpoint(db, job, cursor, processed, len(results), errors)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def fetch_with_retries(imdb_tconst: str, tmdb_id: int | None) -> dict | None:
+    """TMDB bundle for a title, or None once retries are exhausted.
+
+    An open circuit means TMDB is down rather than this title being bad, so it
+    waits for the breaker instead of spending an attempt.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await afetch_movie_details_from_tmdb(imdb_tconst, tmdb_id)
+        except UpstreamUnavailable:
+            await asyncio.sleep(settings.CIRCUIT_OPEN_SECONDS)
+        except httpx.HTTPError as e:
+            attempt += 1
+            if attempt >= MAX_ATTEMPTS:
+                logger.warning("Giving up on %s after %d attempts: %s", imdb_tconst, attempt, e)
+                return None
+            await asyncio.sleep(2 ** attempt)
+
+
+async def run(args: argparse.Namespace) -> Stats:
+    providers = not args.no_providers
+    job = f"enrich-tmdb:{args.region}" if providers else "enrich-tmdb:details"
+    stats = Stats(api_calls_at_start=get_http_metrics()[TMDB]["requests"])
+
+    cursor = await asyncio.to_thread(load_checkpoint, job, args.restart)
+    after = decode_cursor(cursor, job, len(KEYS)) if cursor else None
+    if after is not None:
+        print(f"Resuming {job} after votes={after[0]}, id={after[1]}")
+
+    work: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 4)
+    done: asyncio.Queue = asyncio.Queue(maxsize=args.batch_size * 2)
+    pages: dict[int, Page] = {}
+
+    async def reader() -> None:
+        nonlocal after
+        seq = 0
+        while stats.read < args.limit:
+            size = min(args.batch_size, args.limit - stats.read)
+            rows = await asyncio.to_thread(read_page, after, args.region, providers, size)
+            if not rows:
+                break
+            after = [rows[-1][3], rows[-1][0]]
+            pages[seq] = Page(remaining=len(rows), last_key=after)
+            for row in rows:
+                await work.put((seq, row))
+                stats.read += 1
+            pages[seq].complete = True
+            seq += 1
+        for _ in range(args.concurrency):
+            await work.put(None)
+
+    async def fetcher() -> None:
+        while True:
+            item = await work.get()
+            if item is None:
+                await done.put(None)
+                return
+            seq, (title_id, imdb_tconst, tmdb_id, _) = item
+            payload = await fetch_with_retries(imdb_tconst, tmdb_id)
+            if payload is None:
+                stats.errors += 1
+            else:
+                stats.fetched += 1
+                # Record availability even when empty so the title counts as checked
+                payload["providers"] = payload.get("providers") or {}
+                payload["providers"].setdefault(args.region, {})
+            await done.put((seq, title_id, payload))
+
+    async def writer() -> None:
+        next_seq = 0
+        finished_fetchers = 0
+        while finished_fetchers < args.concurrency:
+            batch: list[tuple[int, int, dict | None]] = []
+            deadline = time.monotonic() + WRITE_FLUSH_SECONDS
+            while len(batch) < args.batch_size and finished_fetchers < args.concurrency:
+                try:
+                    item = await asyncio.wait_for(done.get(), max(deadline - time.monotonic(), 0.01))
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    finished_fetchers += 1
+                else:
+                    batch.append(item)
+            if not batch:
+                continue
+
+            for seq, _, _ in batch:
+                pages[seq].remaining -= 1
+            # Only move the checkpoint past pages whose titles are all written
+            new_cursor = None
+            while next_seq in pages and pages[next_seq].complete and pages[next_seq].remaining == 0:
+                new_cursor = encode_cursor(job, pages.pop(next_seq).last_key)
+                next_seq += 1
+
+            results = [(title_id, payload) for _, title_id, payload in batch if payload is not None]
+            errors = len(batch) - len(results)
+            await asyncio.to_thread(write_batch, job, results, new_cursor, len(batch), errors)
+            stats.written += len(results)
+
+    async def reporter() -> None:
+        while True:
+            await asyncio.sleep(REPORT_SECONDS)
+            print(f"  {stats.line()}")
+
+    report_task = asyncio.create_task(reporter())
+    try:
+        await asyncio.gather(reader(), writer(), *(fetcher() for _ in range(args.concurrency)))
+    finally:
+        report_task.cancel()
+        await aclose_async_clients()
+
+    if stats.read < args.limit:
+        await asyncio.to_thread(finish_checkpoint, job)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill TMDB details and streaming providers for popular titles")
+    parser.add_argument("--limit", type=int, default=10000, help="Number of titles to process this run")
+    parser.add_argument("--region", type=str, default="US", help="Region whose availability must be recorded")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent TMDB fetchers")
+    parser.add_argument("--batch-size", type=int, default=200, help="Titles per database write")
+    parser.add_argument("--no-providers", action="store_true", help="Only select titles missing detail fields")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    args = parser.parse_args()
+    set_default_lane("bulk")
+
+    if not settings.TMDB_API_KEY:
+        print("Error: TMDB_API_KEY not set in .env")
+        sys.exit(1)
+
+    stats = asyncio.run(run(args))
+
+    print("\nDone!")
+    print(f"  Titles read: {stats.read}")
+    print(f"  Titles fetched: {stats.fetched}")
+    print(f"  Titles written: {stats.written}")
+    print(f"  Fetch errors: {stats.errors}")
+    print(f"  API calls made: {stats.api_calls()}")
+    print(f"  {stats.line()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,76 @@
 """Generate movie embeddings using OpenAI text-embedding-3-small.
 
-Queries movies that have ratings (indicating they are popular enough to recommend),
-joins crew/principals for director and cast names, builds embedding text,
-and batch-calls OpenAI to generate embeddings. Upserts into movie_embeddings.
-
 Usage:
     cd backend
-    python -m scripts.generate_embeddings
+    python -u -m scripts.generate_embeddings [--limit 50000] [--concurrency 8]
+                                             [--batch-size 500] [--restart]
+
+Queries movies that have ratings (indicating they are popular enough to recommend)
+and no embedding yet, most voted first, joins crew/principals for director and
+cast names, builds embedding text, and batch-calls OpenAI to generate embeddings.
+Upserts into movie_embeddings.
+
+Stages run concurrently:
+  1. a reader prefetches the next pages of titles while earlier ones are
+     being embedded,
+  2. --concurrency requesters each send one page of --batch-size texts per
+     call, paced by the shared rate limiter against the account's
+     per-minute request and token limits (OPENAI_EMBEDDING_*_PER_MINUTE).
+     Live mood searches draw from the same buckets; this script runs in the
+     bulk lane, so it leaves them the reserved share,
+  3. a writer upserts each embedded page with one multi-row INSERT.
+
+Progress is checkpointed in enrichment_checkpoints in the same transaction
+as each write, so an interrupted run resumes after the last page it fully
+wrote. Titles of a page that failed are picked up by the next fresh run.
+Use --restart to start over from the most popular title.
 """
-
+import argparse
+import asyncio
+import logging
 import sys
 import time
+from dataclasses import dataclass, field
 
-import numpy as np
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI
 from sqlalchemy import text
 
+sys.path.insert(0, ".")
 from app.config import settings
 from app.database import SessionLocal
+from app.services.pagination import decode_cursor, encode_cursor, keyset_clause
+from app.services.ratelimit import embedding_costs, limiter, set_default_lane
+from scripts.checkpoints import Page, finish_checkpoint, load_checkpoint, save_checkpoint
+
+logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 500
 MODEL_ID = settings.EMBEDDING_MODEL
 DIMENSIONS = settings.EMBEDDING_DIMENSIONS
+JOB = f"embeddings:{MODEL_ID}"
+KEYS = [("COALESCE(cr.num_votes, 0)", "desc"), ("ct.id", "desc")]
+MAX_RETRIES = 5  # per request, left to the SDK so 429s honour Retry-After
+REPORT_SECONDS = 10.0
+
+
+@dataclass
+class Stats:
+    started: float = field(default_factory=time.monotonic)
+    read: int = 0
+    embedded: int = 0
+    written: int = 0
+    errors: int = 0
+    tokens: int = 0
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"read {self.read} ({self.read / elapsed:.1f}/s) | "
+            f"embed {self.embedded} ({self.embedded / elapsed:.1f}/s, "
+            f"{self.tokens * 60 / elapsed:,.0f} tokens/min) | "
+            f"write {self.written} ({self.written / elapsed:.1f}/s) | "
+            f"errors {self.errors}"
+        )
 
 
 def count_movies_needing_embeddings(db) -> int:
@@ -36,9 +85,15 @@ def count_movies_needing_embeddings(db) -> int:
     return db.execute(query, {"model_id": MODEL_ID}).scalar()
 
 
-def get_movies_needing_embeddings(db, limit: int = 500) -> list[dict]:
-    """Get a batch of movies with ratings that don't yet have embeddings."""
-    query = text("""
+def get_movies_needing_embeddings(db, after: list | None = None, limit: int = 500) -> list[dict]:
+    """Get the next page of movies with ratings that don't yet have embeddings, in keyset order."""
+    params: dict = {"model_id": MODEL_ID, "limit": limit}
+    after_sql = ""
+    if after is not None:
+        clause, after_params = keyset_clause(KEYS, after)
+        after_sql = f"AND {clause}"
+        params.update(after_params)
+    query = text(f"""
         SELECT
             ct.id AS title_id,
             ct.primary_title,
@@ -60,15 +115,16 @@ def get_movies_needing_embeddings(db, limit: int = 500) -> list[dict]:
                   AND cprin.category IN ('actor', 'actress')
                 ORDER BY cprin.ordering
                 LIMIT 5
-            ) AS cast_members
+            ) AS cast_members,
+            COALESCE(cr.num_votes, 0) AS num_votes
         FROM catalog_titles ct
         JOIN catalog_ratings cr ON cr.title_id = ct.id
         LEFT JOIN movie_embeddings me ON me.title_id = ct.id AND me.model_id = :model_id
-        WHERE me.title_id IS NULL
-        ORDER BY cr.num_votes DESC
+        WHERE me.title_id IS NULL {after_sql}
+        ORDER BY COALESCE(cr.num_votes, 0) DESC, ct.id DESC
         LIMIT :limit
     """)
-    result = db.execute(query, {"model_id": MODEL_ID, "limit": limit})
+    result = db.execute(query, params)
     return [dict(row._mapping) for row in result]
 
 
@@ -97,93 +153,181 @@ def build_embedding_text(movie: dict) -> str:
     return ". ".join(parts) + "."
 
 
-def generate_embeddings_batch(client: OpenAI, texts: list[str]) -> list[list[float]]:
-    """Call OpenAI embeddings API for a batch of texts."""
-    response = client.embeddings.create(
-        model=MODEL_ID,
-        input=texts,
-        dimensions=DIMENSIONS,
-    )
-    return [item.embedding for item in response.data]
+async def generate_embeddings_batch(client: AsyncOpenAI, texts: list[str], stats: Stats) -> list[list[float]] | None:
+    """Call OpenAI embeddings API for a batch of texts once the rate limits allow it; None on failure."""
+    for bucket, cost in embedding_costs(texts):
+        await asyncio.to_thread(limiter.acquire, bucket, cost)
+    try:
+        response = await client.embeddings.create(model=MODEL_ID, input=texts, dimensions=DIMENSIONS)
+    except openai.APIError as e:
+        logger.warning("Embedding request for %d texts failed: %s", len(texts), e)
+        return None
+    stats.tokens += response.usage.total_tokens
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
 
 
 def upsert_embeddings(db, rows: list[tuple[int, str, list[float]]]):
-    """Upsert embeddings into movie_embeddings table."""
-    for title_id, emb_text, embedding in rows:
-        vec_str = "[" + ",".join(str(x) for x in embedding) + "]"
-        db.execute(
-            text("""
-                INSERT INTO movie_embeddings (title_id, model_id, embedding, embedding_text, updated_at)
-                VALUES (:title_id, :model_id, :embedding, :embedding_text, now())
-                ON CONFLICT (title_id, model_id)
-                DO UPDATE SET embedding = :embedding, embedding_text = :embedding_text, updated_at = now()
-            """),
-            {
-                "title_id": title_id,
-                "model_id": MODEL_ID,
-                "embedding": vec_str,
-                "embedding_text": emb_text,
-            },
-        )
-    db.commit()
+    """Upsert a batch of embeddings into movie_embeddings with one statement."""
+    db.execute(
+        text("""
+            INSERT INTO movie_embeddings (title_id, model_id, embedding, embedding_text, updated_at)
+            SELECT t.title_id, :model_id, CAST(t.embedding AS vector), t.embedding_text, now()
+            FROM unnest(CAST(:title_ids AS integer[]), CAST(:embeddings AS text[]), CAST(:texts AS text[]))
+                AS t(title_id, embedding, embedding_text)
+            ON CONFLICT (title_id, model_id) DO UPDATE SET
+                embedding = EXCLUDED.embedding,
+                embedding_text = EXCLUDED.embedding_text,
+                updated_at = EXCLUDED.updated_at
+        """),
+        {
+            "model_id": MODEL_ID,
+            "title_ids": [title_id for title_id, _, _ in rows],
+            "embeddings": ["[" + ",".join(str(x) for x in embedding) + "]" for _, _, embedding in rows],
+            "texts": [emb_text for _, emb_text, _ in rows],
+        },
+    )
 
 
-def main():
-    if not settings.OPENAI_API_KEY:
-        print("ERROR: OPENAI_API_KEY not set in .env")
-        sys.exit(1)
-
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+def read_page(after: list | None, size: int) -> list[dict]:
     db = SessionLocal()
-
     try:
-        print(f"Model: {MODEL_ID}, Dimensions: {DIMENSIONS}")
-        print("Counting movies needing embeddings...")
+        return get_movies_needing_embeddings(db, after, size)
+    finally:
+        db.close()
 
-        total = count_movies_needing_embeddings(db)
-        print(f"Found {total} movies needing embeddings")
 
-        if total == 0:
-            print("All movies already have embeddings.")
-            return
+def write_batch(rows: list[tuple[int, str, list[float]]], cursor: str | None, processed: int, errors: int) -> None:
+    db = SessionLocal()
+    try:
+        if rows:
+            upsert_embeddings(db, rows)
+        save_checkpoint(db, JOB, cursor, processed, len(rows), errors)
+        db.commit()
+    finally:
+        db.close()
+
 
-        processed = 0
-        while True:
-            movies = get_movies_needing_embeddings(db, limit=BATCH_SIZE)
+async def run(args: argparse.Namespace) -> Stats:
+    client = AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL or None,
+        max_retries=MAX_RETRIES,
+    )
+    stats = Stats()
+    limit = args.limit if args.limit is not None else float("inf")
+
+    cursor = await asyncio.to_thread(load_checkpoint, JOB, args.restart)
+    after = decode_cursor(cursor, JOB, len(KEYS)) if cursor else None
+    if after is not None:
+        print(f"Resuming {JOB} after votes={after[0]}, id={after[1]}")
+
+    # Pages read ahead of the requesters, so they never wait on the database
+    work: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+    done: asyncio.Queue = asyncio.Queue()
+    pages: dict[int, Page] = {}
+
+    async def reader() -> None:
+        nonlocal after
+        seq = 0
+        while stats.read < limit:
+            size = int(min(args.batch_size, limit - stats.read))
+            movies = await asyncio.to_thread(read_page, after, size)
             if not movies:
                 break
-
+            after = [movies[-1]["num_votes"], movies[-1]["title_id"]]
+            pages[seq] = Page(remaining=len(movies), last_key=after, complete=True)
+            await work.put((seq, movies))
+            stats.read += len(movies)
+            seq += 1
+        for _ in range(args.concurrency):
+            await work.put(None)
+
+    async def requester() -> None:
+        while True:
+            item = await work.get()
+            if item is None:
+                await done.put(None)
+                return
+            seq, movies = item
             texts = [build_embedding_text(m) for m in movies]
+            embeddings = await generate_embeddings_batch(client, texts, stats)
+            if embeddings is None:
+                stats.errors += len(movies)
+                await done.put((seq, len(movies), []))
+                continue
+            stats.embedded += len(movies)
+            rows = [(m["title_id"], t, e) for m, t, e in zip(movies, texts, embeddings)]
+            await done.put((seq, len(movies), rows))
+
+    async def writer() -> None:
+        next_seq = 0
+        finished_requesters = 0
+        while finished_requesters < args.concurrency:
+            item = await done.get()
+            if item is None:
+                finished_requesters += 1
+                continue
+            seq, processed, rows = item
+            pages[seq].remaining -= processed
+            # Only move the checkpoint past pages that are all written
+            new_cursor = None
+            while next_seq in pages and pages[next_seq].remaining == 0:
+                new_cursor = encode_cursor(JOB, pages.pop(next_seq).last_key)
+                next_seq += 1
+            await asyncio.to_thread(write_batch, rows, new_cursor, processed, processed - len(rows))
+            stats.written += len(rows)
+
+    async def reporter() -> None:
+        while True:
+            await asyncio.sleep(REPORT_SECONDS)
+            print(f"  {stats.line()}")
 
-            retries = 0
-            while retries < 3:
-                try:
-                    embeddings = generate_embeddings_batch(client, texts)
-                    break
-                except Exception as e:
-                    retries += 1
-                    if retries >= 3:
-                        print(f"  ERROR: Failed after 3 retries: {e}")
-                        raise
-                    wait_time = 2 ** retries
-                    print(f"  Retry {retries}/3 after error: {e} (waiting {wait_time}s)")
-                    time.sleep(wait_time)
-
-            rows = [
-                (movies[j]["title_id"], texts[j], embeddings[j])
-                for j in range(len(movies))
-            ]
-            upsert_embeddings(db, rows)
-            processed += len(movies)
-            print(f"  Progress: {processed}/{total} ({processed * 100 // total}%)")
+    report_task = asyncio.create_task(reporter())
+    try:
+        await asyncio.gather(reader(), writer(), *(requester() for _ in range(args.concurrency)))
+    finally:
+        report_task.cancel()
+        await client.close()
 
-            # Rate limiting: brief pause between batches
-            time.sleep(0.5)
+    if stats.read < limit:
+        await asyncio.to_thread(finish_checkpoint, JOB)
+    return stats
 
-        print(f"Done! Generated embeddings for {processed} movies.")
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate OpenAI embeddings for rated movies")
+    parser.add_argument("--limit", type=int, default=None, help="Number of titles to process this run (default: all)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent embedding requests")
+    parser.add_argument("--batch-size", type=int, default=500, help="Titles per embedding request and write")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    args = parser.parse_args()
+    set_default_lane("bulk")
+
+    if not settings.OPENAI_API_KEY:
+        print("ERROR: OPENAI_API_KEY not set in .env")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        print(f"Model: {MODEL_ID}, Dimensions: {DIMENSIONS}")
+        print("Counting movies needing embeddings...")
+        total = count_movies_needing_embeddings(db)
     finally:
         db.close()
+    print(f"Found {total} movies needing embeddings")
+    if total == 0:
+        print("All movies already have embeddings.")
+        return
+
+    stats = asyncio.run(run(args))
+
+    print("\nDone!")
+    print(f"  Titles read: {stats.read}")
+    print(f"  Titles embedded: {stats.embedded}")
+    print(f"  Titles written: {stats.written}")
+    print(f"  Failed titles: {stats.errors}")
+    print(f"  Tokens used: {stats.tokens:,}")
+    print(f"  {stats.line()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+"""Compact IMDb id sets and id maps for the ingestion scripts.
+
+IMDb ids are a two-letter prefix plus an integer ("nm0000151"), so a set
+of them is kept as a sorted int64 numpy array of the numeric parts, and a
+map to catalog ids as two parallel arrays: 8 or 16 bytes per entry instead
+of a Python str (and int) in a set or dict, with membership and lookups
+done for whole blocks of rows at once via searchsorted.
+"""
+
+from itertools import compress, islice
+from typing import Iterable, Iterator
+
+import numpy as np
+from sqlalchemy import text
+
+FILTER_BLOCK = 50_000  # rows tested per vectorized membership check or lookup
+FETCH_SIZE = 100_000  # rows per server-side cursor round trip when loading an IdMap
+
+
+def imdb_num(imdb_id: str) -> int:
+    """Numeric part of an IMDb id: "tt0111161" -> 111161."""
+    return int(imdb_id[2:])
+
+
+def in_sorted(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Boolean mask of which values appear in the sorted keys array."""
+    if not len(keys):
+        return np.zeros(len(values), dtype=bool)
+    pos = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+    return keys[pos] == values
+
+
+class IdMap:
+    """IMDb id -> catalog id, as sorted numeric IMDb ids and the matching catalog ids."""
+
+    def __init__(self, keys: np.ndarray, ids: np.ndarray):
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.ids = ids[order]
+
+    @classmethod
+    def load(cls, db, table: str, column: str) -> "IdMap":
+        """Stream (imdb id, id) pairs from a catalog table through a server-side cursor."""
+        result = db.execute(
+            text(f"SELECT CAST(substr({column}, 3) AS bigint), id FROM {table}"),
+            execution_options={"stream_results": True, "yield_per": FETCH_SIZE},
+        )
+        keys: list[np.ndarray] = []
+        ids: list[np.ndarray] = []
+        for partition in result.partitions():
+            block = np.array(partition, dtype=np.int64).reshape(-1, 2)
+            keys.append(block[:, 0])
+            ids.append(block[:, 1])
+        if not keys:
+            return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        return cls(np.concatenate(keys), np.concatenate(ids))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, nums: np.ndarray) -> np.ndarray:
+        """Catalog ids for numeric IMDb ids, -1 where unknown."""
+        if not len(self.keys):
+            return np.full(len(nums), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.keys, nums), len(self.keys) - 1)
+        return np.where(self.keys[pos] == nums, self.ids[pos], -1)
+
+
+def _blocks(rows: Iterable[tuple]) -> Iterator[list[tuple]]:
+    rows = iter(rows)
+    while block := list(islice(rows, FILTER_BLOCK)):
+        yield block
+
+
+def keep_known(rows: Iterable[tuple], keys: np.ndarray, skipped: list[int]) -> Iterator[tuple]:
+    """Rows whose first column is an IMDb id in keys, tested a block at a time."""
+    for block in _blocks(rows):
+        nums = np.fromiter((imdb_num(r[0]) for r in block), dtype=np.int64, count=len(block))
+        mask = in_sorted(keys, nums)
+        skipped[0] += len(block) - int(mask.sum())
+        yield from compress(block, mask)
+
+
+def map_ids(rows: Iterable[tuple], maps: dict[int, IdMap], skipped: list[int]) -> Iterator[tuple]:
+    """Replace IMDb ids with catalog ids in the given columns, a block of rows at a time.
+
+    Rows with an id missing from its map are dropped and counted in skipped.
+    """
+    for block in _blocks(rows):
+        keep = np.ones(len(block), dtype=bool)
+        mapped = {}
+        for column, id_map in maps.items():
+            nums = np.fromiter((imdb_num(r[column]) for r in block), dtype=np.int64, count=len(block))
+            mapped[column] = id_map.lookup(nums)
+            keep &= mapped[column] >= 0
+        skipped[0] += len(block) - int(keep.sum())
+        for i in np.flatnonzero(keep):
+            row = list(block[i])
+            for column, ids in mapped.items():
+                row[column] = int(ids[i])
+            yield tuple(row)
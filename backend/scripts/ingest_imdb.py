@@ -4,30 +4,72 @@ IMDb data ingestion script.
 Downloads IMDb TSV.gz files and loads movie data into the MovieBrain catalog tables.
 Filters to titleType == "movie" only.
 
+Rows are streamed into a staging table with COPY and merged into each
+target table with a single INSERT ... SELECT; `--loader insert` runs the
+original chunked executemany path instead, for comparing throughput. Each
+table reports rows/second for parsing, loading and merging.
+
+`--loader delta` is for refreshing an existing catalog from new daily dumps:
+only rows whose content changed since the previous delta run are written,
+and vanished akas, principals and crew rows are deleted. Titles, people and
+ratings are never deleted, as user data and OMDb scores hang off them.
+
+With --workers > 1 (the default) independent files are decompressed, parsed
+and loaded in parallel worker processes, each on its own connection.
+
+`--rebuild` loads into unlogged shadow tables instead of the live ones,
+builds their indexes afterwards and swaps them in atomically, so the API
+never sees a half-loaded catalog; see scripts/rebuild.py.
+
+Only people credited on a movie in title.principals or title.crew are
+loaded; pass --all-people for the whole of name.basics. Databases loaded
+before this can be pruned with `python -m scripts.compact_people`.
+
+`--parser arrow` (requires `pip install pyarrow`, copy loader only) parses
+files in columnar chunks with vectorized filtering and id mapping instead of
+row by row in Python; see scripts/arrow_parse.py.
+
 Usage:
-    python -m scripts.ingest_imdb
+    python -m scripts.ingest_imdb [--loader copy|delta|insert] [--workers 4] [--parser python|arrow]
+                                  [--all-people] [--rebuild]
 """
 
+import argparse
 import csv
 import gzip
 import os
 import sys
 import time
 import urllib.request
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from io import TextIOWrapper
 from pathlib import Path
 
 # Add backend dir to path so we can import app modules
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+import numpy as np
 from sqlalchemy import text
 
 from app.config import settings
 from app.database import Base, engine, SessionLocal
+from scripts import arrow_parse
+from scripts.bulk_load import LOADERS, CsvChunks, LoadStats, TableSpec, copy_load
+from scripts.imdb_ids import IdMap, imdb_num, keep_known, map_ids
+from scripts.rebuild import (
+    finish_shadow_tables,
+    prepare_shadow_tables,
+    rebuild_load,
+    swap_shadow_tables,
+    use_build_schema,
+)
 
 IMDB_BASE_URL = "https://datasets.imdbws.com/"
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
+PARSERS = ["python", "arrow"]
+
 FILES = [
     "title.basics.tsv.gz",
     "title.ratings.tsv.gz",
@@ -37,8 +79,6 @@ FILES = [
     "name.basics.tsv.gz",
 ]
 
-CHUNK_SIZE = 5000
-
 
 def clean(val: str) -> str | None:
     """Convert IMDb '\\N' null markers to None."""
@@ -86,381 +126,280 @@ def open_tsv(filepath: Path):
     return f, reader
 
 
-def ingest_title_basics(db):
+TITLES = TableSpec(
+    "catalog_titles",
+    [
+        "imdb_tconst", "title_type", "primary_title", "original_title", "start_year",
+        "end_year", "runtime_minutes", "genres",
+    ],
+    conflict="ON CONFLICT (imdb_tconst) DO NOTHING",
+    key=["imdb_tconst"],
+    # title_search_text and ts_vector are generated columns
+    derived=["aka_search_text"],
+)
+RATINGS = TableSpec(
+    "catalog_ratings",
+    ["title_id", "average_rating", "num_votes"],
+    conflict="ON CONFLICT (title_id) DO NOTHING",
+    key=["title_id"],  # never deleted: the row also holds OMDb scores
+)
+CREW = TableSpec(
+    "catalog_crew",
+    ["title_id", "director_nconsts", "writer_nconsts"],
+    conflict="ON CONFLICT (title_id) DO NOTHING",
+    key=["title_id"],
+    delete_missing=True,
+)
+AKAS = TableSpec(
+    "catalog_akas",
+    ["title_id", "ordering", "localized_title", "region", "language", "is_original"],
+    conflict="ON CONFLICT (title_id, ordering) DO NOTHING",
+    key=["title_id", "ordering"],
+    delete_missing=True,
+)
+PEOPLE = TableSpec(
+    "catalog_people",
+    ["imdb_nconst", "primary_name", "birth_year", "death_year"],
+    conflict="ON CONFLICT (imdb_nconst) DO NOTHING",
+    key=["imdb_nconst"],
+)
+PRINCIPALS = TableSpec(
+    "catalog_principals",
+    ["title_id", "person_id", "ordering", "category", "job", "characters"],
+    conflict="ON CONFLICT (title_id, ordering) DO NOTHING",
+    key=["title_id", "ordering"],
+    delete_missing=True,
+)
+
+# Never loaded from a file: the triggers on catalog_titles and catalog_ratings
+# fill it, so a rebuild starts its shadow copy empty (delete_missing: not seeded)
+CARDS = TableSpec("title_cards", [], key=["title_id"], delete_missing=True)
+
+# In dependency order; --rebuild shadows all of them
+SPECS = [TITLES, PEOPLE, RATINGS, CREW, AKAS, PRINCIPALS, CARDS]
+
+# Loaders by name, as handed to worker processes
+INGEST_LOADERS = {**LOADERS, "rebuild": rebuild_load}
+
+
+def _load(db, loader, spec: TableSpec, rows, label: str, skipped: list[int] | None = None) -> LoadStats:
+    stats = loader(db, spec, rows)
+    suffix = f", skipped {skipped[0]}" if skipped is not None else ""
+    print(f"  Loaded {stats.rows} {label}{suffix}")
+    print(f"  {spec.table}: {stats.report()}")
+    return stats
+
+
+def title_basics_rows(filepath: Path, skipped: list[int]):
+    f, reader = open_tsv(filepath)
+    try:
+        for row in reader:
+            if row["titleType"] != "movie":
+                skipped[0] += 1
+                continue
+            yield (
+                row["tconst"],
+                row["titleType"],
+                clean(row["primaryTitle"]) or "",
+                clean(row["originalTitle"]),
+                clean_int(row["startYear"]),
+                clean_int(row["endYear"]),
+                clean_int(row["runtimeMinutes"]),
+                clean(row["genres"]),
+            )
+    finally:
+        f.close()
+
+
+def ingest_title_basics(db, loader=copy_load, parser: str = "python") -> LoadStats:
     """Load title.basics.tsv.gz -> catalog_titles (movies only)."""
     print("\n=== Ingesting title.basics (movies only) ===")
     filepath = download_file("title.basics.tsv.gz")
-    f, reader = open_tsv(filepath)
+    skipped = [0]
+    if parser == "arrow":
+        rows = CsvChunks(arrow_parse.title_basics_batches(filepath, skipped))
+    else:
+        rows = title_basics_rows(filepath, skipped)
+    return _load(db, loader, TITLES, rows, "movies", skipped)
 
-    count = 0
-    skipped = 0
-    chunk = []
-
-    for row in reader:
-        if row["titleType"] != "movie":
-            skipped += 1
-            continue
-
-        primary = clean(row["primaryTitle"]) or ""
-        original = clean(row["originalTitle"]) or ""
-        search_text = f"{primary} {original}".strip()
-
-        chunk.append({
-            "imdb_tconst": row["tconst"],
-            "title_type": row["titleType"],
-            "primary_title": primary,
-            "original_title": clean(row["originalTitle"]),
-            "start_year": clean_int(row["startYear"]),
-            "end_year": clean_int(row["endYear"]),
-            "runtime_minutes": clean_int(row["runtimeMinutes"]),
-            "genres": clean(row["genres"]),
-            "title_search_text": search_text,
-        })
-        count += 1
-
-        if len(chunk) >= CHUNK_SIZE:
-            db.execute(
-                text("""
-                    INSERT INTO catalog_titles
-                        (imdb_tconst, title_type, primary_title, original_title,
-                         start_year, end_year, runtime_minutes, genres, title_search_text,
-                         ts_vector)
-                    VALUES
-                        (:imdb_tconst, :title_type, :primary_title, :original_title,
-                         :start_year, :end_year, :runtime_minutes, :genres, :title_search_text,
-                         to_tsvector('english', :title_search_text))
-                    ON CONFLICT (imdb_tconst) DO NOTHING
-                """),
-                chunk,
-            )
-            db.commit()
-            chunk = []
-            print(f"  ... {count} movies loaded", end="\r")
-
-    if chunk:
-        db.execute(
-            text("""
-                INSERT INTO catalog_titles
-                    (imdb_tconst, title_type, primary_title, original_title,
-                     start_year, end_year, runtime_minutes, genres, title_search_text,
-                     ts_vector)
-                VALUES
-                    (:imdb_tconst, :title_type, :primary_title, :original_title,
-                     :start_year, :end_year, :runtime_minutes, :genres, :title_search_text,
-                     to_tsvector('english', :title_search_text))
-                ON CONFLICT (imdb_tconst) DO NOTHING
-            """),
-            chunk,
-        )
-        db.commit()
-
-    f.close()
-    print(f"  Loaded {count} movies, skipped {skipped} non-movie titles")
-    return count
-
-
-def build_tconst_to_id_map(db) -> dict[str, int]:
+
+def build_tconst_to_id_map(db) -> IdMap:
     """Build a lookup map from imdb_tconst -> catalog_titles.id."""
     print("  Building tconst -> id lookup map...")
-    rows = db.execute(text("SELECT id, imdb_tconst FROM catalog_titles")).fetchall()
-    return {row[1]: row[0] for row in rows}
+    return IdMap.load(db, "catalog_titles", "imdb_tconst")
 
 
-def build_nconst_to_id_map(db) -> dict[str, int]:
+def build_nconst_to_id_map(db) -> IdMap:
     """Build a lookup map from imdb_nconst -> catalog_people.id."""
     print("  Building nconst -> id lookup map...")
-    rows = db.execute(text("SELECT id, imdb_nconst FROM catalog_people")).fetchall()
-    return {row[1]: row[0] for row in rows}
+    return IdMap.load(db, "catalog_people", "imdb_nconst")
+
+
+def title_ratings_rows(filepath: Path):
+    """(tconst, rating, votes); tconsts are mapped to title ids by the caller."""
+    f, reader = open_tsv(filepath)
+    try:
+        for row in reader:
+            yield row["tconst"], clean_float(row["averageRating"]), clean_int(row["numVotes"])
+    finally:
+        f.close()
 
 
-def ingest_title_ratings(db, tconst_map: dict[str, int]):
+def ingest_title_ratings(db, tconst_map: IdMap, loader=copy_load, parser: str = "python") -> LoadStats:
     """Load title.ratings.tsv.gz -> catalog_ratings."""
     print("\n=== Ingesting title.ratings ===")
     filepath = download_file("title.ratings.tsv.gz")
-    f, reader = open_tsv(filepath)
+    skipped = [0]
+    if parser == "arrow":
+        rows = CsvChunks(arrow_parse.title_ratings_batches(filepath, tconst_map, skipped))
+    else:
+        rows = map_ids(title_ratings_rows(filepath), {0: tconst_map}, skipped)
+    return _load(db, loader, RATINGS, rows, "ratings", skipped)
+
 
-    count = 0
-    skipped = 0
-    chunk = []
-
-    for row in reader:
-        tconst = row["tconst"]
-        title_id = tconst_map.get(tconst)
-        if title_id is None:
-            skipped += 1
-            continue
-
-        chunk.append({
-            "title_id": title_id,
-            "average_rating": clean_float(row["averageRating"]),
-            "num_votes": clean_int(row["numVotes"]),
-        })
-        count += 1
-
-        if len(chunk) >= CHUNK_SIZE:
-            db.execute(
-                text("""
-                    INSERT INTO catalog_ratings (title_id, average_rating, num_votes)
-                    VALUES (:title_id, :average_rating, :num_votes)
-                    ON CONFLICT (title_id) DO NOTHING
-                """),
-                chunk,
+def title_crew_rows(filepath: Path):
+    f, reader = open_tsv(filepath)
+    try:
+        for row in reader:
+            directors = clean(row["directors"])
+            writers = clean(row["writers"])
+            yield (
+                row["tconst"],
+                directors.split(",") if directors else [],
+                writers.split(",") if writers else [],
             )
-            db.commit()
-            chunk = []
-            print(f"  ... {count} ratings loaded", end="\r")
-
-    if chunk:
-        db.execute(
-            text("""
-                INSERT INTO catalog_ratings (title_id, average_rating, num_votes)
-                VALUES (:title_id, :average_rating, :num_votes)
-                ON CONFLICT (title_id) DO NOTHING
-            """),
-            chunk,
-        )
-        db.commit()
-
-    f.close()
-    print(f"  Loaded {count} ratings, skipped {skipped}")
-
-
-def ingest_title_crew(db, tconst_map: dict[str, int]):
+    finally:
+        f.close()
+
+
+def ingest_title_crew(db, tconst_map: IdMap, loader=copy_load, parser: str = "python") -> LoadStats:
     """Load title.crew.tsv.gz -> catalog_crew."""
     print("\n=== Ingesting title.crew ===")
     filepath = download_file("title.crew.tsv.gz")
-    f, reader = open_tsv(filepath)
+    skipped = [0]
+    if parser == "arrow":
+        rows = CsvChunks(arrow_parse.title_crew_batches(filepath, tconst_map, skipped))
+    else:
+        rows = map_ids(title_crew_rows(filepath), {0: tconst_map}, skipped)
+    return _load(db, loader, CREW, rows, "crew records", skipped)
+
 
-    count = 0
-    skipped = 0
-    chunk = []
-
-    for row in reader:
-        tconst = row["tconst"]
-        title_id = tconst_map.get(tconst)
-        if title_id is None:
-            skipped += 1
-            continue
-
-        directors = clean(row["directors"])
-        writers = clean(row["writers"])
-        director_list = directors.split(",") if directors else []
-        writer_list = writers.split(",") if writers else []
-
-        chunk.append({
-            "title_id": title_id,
-            "director_nconsts": director_list,
-            "writer_nconsts": writer_list,
-        })
-        count += 1
-
-        if len(chunk) >= CHUNK_SIZE:
-            db.execute(
-                text("""
-                    INSERT INTO catalog_crew (title_id, director_nconsts, writer_nconsts)
-                    VALUES (:title_id, :director_nconsts, :writer_nconsts)
-                    ON CONFLICT (title_id) DO NOTHING
-                """),
-                chunk,
+def title_akas_rows(filepath: Path):
+    f, reader = open_tsv(filepath)
+    try:
+        for row in reader:
+            is_orig = clean(row.get("isOriginalTitle", "0"))
+            yield (
+                row["titleId"],
+                clean_int(row["ordering"]),
+                clean(row["title"]),
+                clean(row["region"]),
+                clean(row["language"]),
+                is_orig == "1" if is_orig else False,
             )
-            db.commit()
-            chunk = []
-            print(f"  ... {count} crew records loaded", end="\r")
-
-    if chunk:
-        db.execute(
-            text("""
-                INSERT INTO catalog_crew (title_id, director_nconsts, writer_nconsts)
-                VALUES (:title_id, :director_nconsts, :writer_nconsts)
-                ON CONFLICT (title_id) DO NOTHING
-            """),
-            chunk,
-        )
-        db.commit()
-
-    f.close()
-    print(f"  Loaded {count} crew records, skipped {skipped}")
-
-
-def ingest_title_akas(db, tconst_map: dict[str, int]):
+    finally:
+        f.close()
+
+
+def ingest_title_akas(db, tconst_map: IdMap, loader=copy_load, parser: str = "python") -> LoadStats:
     """Load title.akas.tsv.gz -> catalog_akas."""
     print("\n=== Ingesting title.akas ===")
     filepath = download_file("title.akas.tsv.gz")
+    skipped = [0]
+    if parser == "arrow":
+        rows = CsvChunks(arrow_parse.title_akas_batches(filepath, tconst_map, skipped))
+    else:
+        rows = map_ids(title_akas_rows(filepath), {0: tconst_map}, skipped)
+    return _load(db, loader, AKAS, rows, "aka records", skipped)
+
+
+def movie_nconsts(tconst_map: IdMap, parser: str = "python") -> np.ndarray:
+    """Sorted numeric nconsts credited on a movie in title.principals or title.crew."""
+    print("  Collecting people credited on movies...")
+    principals_path = download_file("title.principals.tsv.gz")
+    crew_path = download_file("title.crew.tsv.gz")
+    if parser == "arrow":
+        return arrow_parse.movie_nconsts(principals_path, crew_path, tconst_map)
+
+    found = array("q")
+    ignored = [0]
+    for _, nconst, *_ in keep_known(title_principals_rows(principals_path), tconst_map.keys, ignored):
+        found.append(imdb_num(nconst))
+    for _, directors, writers in keep_known(title_crew_rows(crew_path), tconst_map.keys, ignored):
+        found.extend(imdb_num(n) for n in directors + writers)
+    return np.unique(np.asarray(found, dtype=np.int64))
+
+
+def name_basics_rows(filepath: Path):
     f, reader = open_tsv(filepath)
-
-    count = 0
-    skipped = 0
-    chunk = []
-
-    for row in reader:
-        tconst = row["titleId"]
-        title_id = tconst_map.get(tconst)
-        if title_id is None:
-            skipped += 1
-            continue
-
-        is_orig = clean(row.get("isOriginalTitle", "0"))
-        chunk.append({
-            "title_id": title_id,
-            "ordering": clean_int(row["ordering"]),
-            "localized_title": clean(row["title"]),
-            "region": clean(row["region"]),
-            "language": clean(row["language"]),
-            "is_original": is_orig == "1" if is_orig else False,
-        })
-        count += 1
-
-        if len(chunk) >= CHUNK_SIZE:
-            db.execute(
-                text("""
-                    INSERT INTO catalog_akas
-                        (title_id, ordering, localized_title, region, language, is_original)
-                    VALUES
-                        (:title_id, :ordering, :localized_title, :region, :language, :is_original)
-                """),
-                chunk,
+    try:
+        for row in reader:
+            yield (
+                row["nconst"],
+                clean(row["primaryName"]) or "Unknown",
+                clean_int(row["birthYear"]),
+                clean_int(row["deathYear"]),
             )
-            db.commit()
-            chunk = []
-            print(f"  ... {count} aka records loaded", end="\r")
-
-    if chunk:
-        db.execute(
-            text("""
-                INSERT INTO catalog_akas
-                    (title_id, ordering, localized_title, region, language, is_original)
-                VALUES
-                    (:title_id, :ordering, :localized_title, :region, :language, :is_original)
-            """),
-            chunk,
-        )
-        db.commit()
-
-    f.close()
-    print(f"  Loaded {count} aka records, skipped {skipped}")
-
-
-def ingest_name_basics(db, tconst_map: dict[str, int]):
+    finally:
+        f.close()
+
+
+def ingest_name_basics(
+    db, tconst_map: IdMap | None, loader=copy_load, parser: str = "python"
+) -> LoadStats:
     """Load name.basics.tsv.gz -> catalog_people.
-    Only loads people who appear in knownForTitles that are in our movie set.
+
+    With a tconst map, runs in two passes: the people credited on those
+    movies in title.principals and title.crew are collected first, and only
+    they are loaded (a few hundred thousand of IMDb's ~13M people). Without
+    one, every person is loaded.
     """
-    print("\n=== Ingesting name.basics (people linked to movies) ===")
+    if tconst_map is None:
+        print("\n=== Ingesting name.basics (all people) ===")
+        people = skipped = None
+    else:
+        print("\n=== Ingesting name.basics (people credited on movies) ===")
+        people = movie_nconsts(tconst_map, parser)
+        print(f"  {len(people):,} people credited on movies")
+        skipped = [0]
     filepath = download_file("name.basics.tsv.gz")
-    f, reader = open_tsv(filepath)
+    if parser == "arrow":
+        rows = CsvChunks(arrow_parse.name_basics_batches(filepath, people, skipped))
+    elif people is not None:
+        rows = keep_known(name_basics_rows(filepath), people, skipped)
+    else:
+        rows = name_basics_rows(filepath)
+    return _load(db, loader, PEOPLE, rows, "people", skipped)
+
 
-    # Also collect all nconsts referenced from principals file to load
-    # For now, load all people (we'll filter via principals later)
-    # Actually, let's load all people referenced in principals
-    # We'll do a two-pass approach: first collect needed nconsts from principals,
-    # then load only those people. But that requires reading principals first.
-    # Simpler: load ALL people, which is ~13M rows but manageable.
-    # Actually let's be smarter: collect nconsts we need from title.principals first
-
-    # For simplicity, load all people - the ingestion is a one-time operation
-    count = 0
-    chunk = []
-
-    for row in reader:
-        chunk.append({
-            "imdb_nconst": row["nconst"],
-            "primary_name": clean(row["primaryName"]) or "Unknown",
-            "birth_year": clean_int(row["birthYear"]),
-            "death_year": clean_int(row["deathYear"]),
-        })
-        count += 1
-
-        if len(chunk) >= CHUNK_SIZE:
-            db.execute(
-                text("""
-                    INSERT INTO catalog_people (imdb_nconst, primary_name, birth_year, death_year)
-                    VALUES (:imdb_nconst, :primary_name, :birth_year, :death_year)
-                    ON CONFLICT (imdb_nconst) DO NOTHING
-                """),
-                chunk,
+def title_principals_rows(filepath: Path):
+    f, reader = open_tsv(filepath)
+    try:
+        for row in reader:
+            yield (
+                row["tconst"],
+                row["nconst"],
+                clean_int(row["ordering"]),
+                clean(row["category"]),
+                clean(row["job"]),
+                clean(row["characters"]),
             )
-            db.commit()
-            chunk = []
-            if count % 50000 == 0:
-                print(f"  ... {count} people loaded", end="\r")
-
-    if chunk:
-        db.execute(
-            text("""
-                INSERT INTO catalog_people (imdb_nconst, primary_name, birth_year, death_year)
-                VALUES (:imdb_nconst, :primary_name, :birth_year, :death_year)
-                ON CONFLICT (imdb_nconst) DO NOTHING
-            """),
-            chunk,
-        )
-        db.commit()
-
-    f.close()
-    print(f"  Loaded {count} people")
-    return count
-
-
-def ingest_title_principals(db, tconst_map: dict[str, int], nconst_map: dict[str, int]):
+    finally:
+        f.close()
+
+
+def ingest_title_principals(
+    db, tconst_map: IdMap, nconst_map: IdMap, loader=copy_load, parser: str = "python"
+) -> LoadStats:
     """Load title.principals.tsv.gz -> catalog_principals."""
     print("\n=== Ingesting title.principals ===")
     filepath = download_file("title.principals.tsv.gz")
-    f, reader = open_tsv(filepath)
-
-    count = 0
-    skipped = 0
-    chunk = []
-
-    for row in reader:
-        tconst = row["tconst"]
-        title_id = tconst_map.get(tconst)
-        if title_id is None:
-            skipped += 1
-            continue
-
-        nconst = row["nconst"]
-        person_id = nconst_map.get(nconst)
-        if person_id is None:
-            skipped += 1
-            continue
-
-        chunk.append({
-            "title_id": title_id,
-            "person_id": person_id,
-            "ordering": clean_int(row["ordering"]),
-            "category": clean(row["category"]),
-            "job": clean(row["job"]),
-            "characters": clean(row["characters"]),
-        })
-        count += 1
-
-        if len(chunk) >= CHUNK_SIZE:
-            db.execute(
-                text("""
-                    INSERT INTO catalog_principals
-                        (title_id, person_id, ordering, category, job, characters)
-                    VALUES
-                        (:title_id, :person_id, :ordering, :category, :job, :characters)
-                """),
-                chunk,
-            )
-            db.commit()
-            chunk = []
-            if count % 50000 == 0:
-                print(f"  ... {count} principals loaded", end="\r")
-
-    if chunk:
-        db.execute(
-            text("""
-                INSERT INTO catalog_principals
-                    (title_id, person_id, ordering, category, job, characters)
-                VALUES
-                    (:title_id, :person_id, :ordering, :category, :job, :characters)
-            """),
-            chunk,
-        )
-        db.commit()
-
-    f.close()
-    print(f"  Loaded {count} principals, skipped {skipped}")
+    skipped = [0]
+    if parser == "arrow":
+        rows = CsvChunks(arrow_parse.title_principals_batches(filepath, tconst_map, nconst_map, skipped))
+    else:
+        rows = map_ids(title_principals_rows(filepath), {0: tconst_map, 1: nconst_map}, skipped)
+    return _load(db, loader, PRINCIPALS, rows, "principals", skipped)
 
 
 def print_stats(db):
@@ -496,39 +435,165 @@ def print_stats(db):
         print(f"    genres: {no_genres/total*100:.1f}%")
 
 
-def main():
-    print("MovieBrain IMDb Data Ingestion")
-    print("=" * 50)
-    start = time.time()
+def run_serial(db, loader, parser: str = "python", all_people: bool = False) -> None:
+    """Load the six files one after another on a single connection."""
+    # Step 1: Title basics (movies only)
+    ingest_title_basics(db, loader, parser)
+
+    # Build tconst lookup
+    tconst_map = build_tconst_to_id_map(db)
+    print(f"  {len(tconst_map):,} movie tconsts in map")
+
+    # Step 2: Ratings
+    ingest_title_ratings(db, tconst_map, loader, parser)
+
+    # Step 3: Crew
+    ingest_title_crew(db, tconst_map, loader, parser)
+
+    # Step 4: AKAs
+    ingest_title_akas(db, tconst_map, loader, parser)
+
+    # Step 5: People (credited on movies unless all_people)
+    ingest_name_basics(db, None if all_people else tconst_map, loader, parser)
+
+    # Build nconst lookup
+    nconst_map = build_nconst_to_id_map(db)
+    print(f"  {len(nconst_map):,} people nconsts in map")
+
+    # Step 6: Principals
+    ingest_title_principals(db, tconst_map, nconst_map, loader, parser)
+
+
+def _init_worker():
+    # Forked workers must open their own connections, not reuse the parent's pool
+    engine.dispose(close=False)
 
-    db = SessionLocal()
 
+def _run_job(
+    job: str, loader_name: str, parser: str, tconst_map: IdMap | None = None
+) -> LoadStats:
+    """Parse one IMDb file and load it on this worker's own connection."""
+    loader = INGEST_LOADERS[loader_name]
+    db = SessionLocal()
     try:
-        # Step 1: Title basics (movies only)
-        ingest_title_basics(db)
+        if job == "titles":
+            return ingest_title_basics(db, loader, parser)
+        if job == "people":
+            return ingest_name_basics(db, tconst_map, loader, parser)
+        if job == "ratings":
+            return ingest_title_ratings(db, tconst_map, loader, parser)
+        if job == "crew":
+            return ingest_title_crew(db, tconst_map, loader, parser)
+        if job == "akas":
+            return ingest_title_akas(db, tconst_map, loader, parser)
+        if job == "principals":
+            # Built here rather than pickled over from the parent; it is by far the largest map
+            nconst_map = build_nconst_to_id_map(db)
+            return ingest_title_principals(db, tconst_map, nconst_map, loader, parser)
+        raise ValueError(f"Unknown ingestion job {job}")
+    finally:
+        db.close()
 
-        # Build tconst lookup
+
+def run_parallel(
+    db, loader_name: str, workers: int, parser: str = "python", all_people: bool = False
+) -> None:
+    """Load the six files in a process pool, honouring only the real dependencies.
+
+    titles starts immediately; ratings, crew, akas and people start once
+    titles are in and the tconst map is built (people only starts early with
+    all_people, as it then needs no map); principals waits for both titles
+    and people. Each worker decompresses and parses its file and streams it
+    to the database on its own connection.
+    """
+    for filename in FILES:
+        download_file(filename)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        titles = pool.submit(_run_job, "titles", loader_name, parser)
+        if all_people:
+            people = pool.submit(_run_job, "people", loader_name, parser)
+
+        titles.result()
         tconst_map = build_tconst_to_id_map(db)
         print(f"  {len(tconst_map):,} movie tconsts in map")
+        if not all_people:
+            people = pool.submit(_run_job, "people", loader_name, parser, tconst_map)
+        dependents = [pool.submit(_run_job, job, loader_name, parser, tconst_map) for job in ("ratings", "crew", "akas")]
+
+        people.result()
+        dependents.append(pool.submit(_run_job, "principals", loader_name, parser, tconst_map))
+        for future in dependents:
+            future.result()
+
+
+def run_rebuild(workers: int, parser: str = "python", all_people: bool = False) -> None:
+    """Load into shadow tables, index them and swap them in for the live catalog tables."""
+    print("\n=== Preparing shadow tables ===")
+    prepare_shadow_tables(SPECS)
+    use_build_schema()
 
-        # Step 2: Ratings
-        ingest_title_ratings(db, tconst_map)
+    db = SessionLocal()
+    try:
+        if workers > 1:
+            run_parallel(db, "rebuild", workers, parser, all_people)
+        else:
+            run_serial(db, rebuild_load, parser, all_people)
+    finally:
+        db.close()
 
-        # Step 3: Crew
-        ingest_title_crew(db, tconst_map)
+    print("\n=== Indexing shadow tables ===")
+    finish_shadow_tables(SPECS, workers)
+    print("\n=== Swapping in the rebuilt catalog ===")
+    swap_shadow_tables(SPECS)
 
-        # Step 4: AKAs
-        ingest_title_akas(db, tconst_map)
 
-        # Step 5: People (all)
-        ingest_name_basics(db, tconst_map)
+def main():
+    parser = argparse.ArgumentParser(description="Load IMDb datasets into the catalog tables")
+    parser.add_argument(
+        "--loader", choices=sorted(LOADERS), default="copy",
+        help="copy: COPY into staging tables and merge; delta: apply only changed rows; "
+        "insert: chunked executemany",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=min(4, os.cpu_count() or 1),
+        help="Worker processes for parsing and loading files in parallel; 1 loads them in order",
+    )
+    parser.add_argument(
+        "--parser", choices=PARSERS, default="python",
+        help="python: row-by-row csv module; arrow: columnar PyArrow chunks (copy loader only)",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="Load into unlogged shadow tables and swap them in when done (copy loader only)",
+    )
+    parser.add_argument(
+        "--all-people", action="store_true",
+        help="Load every person in name.basics, not only those credited on movies",
+    )
+    args = parser.parse_args()
+    if args.parser == "arrow":
+        if not arrow_parse.ARROW_AVAILABLE:
+            parser.error("--parser arrow requires pyarrow (pip install pyarrow)")
+        if args.loader != "copy":
+            parser.error("--parser arrow only works with --loader copy")
+    if args.rebuild and args.loader != "copy":
+        parser.error("--rebuild only works with --loader copy")
+    loader = LOADERS[args.loader]
 
-        # Build nconst lookup
-        nconst_map = build_nconst_to_id_map(db)
-        print(f"  {len(nconst_map):,} people nconsts in map")
+    print("MovieBrain IMDb Data Ingestion")
+    print("=" * 50)
+    start = time.time()
 
-        # Step 6: Principals
-        ingest_title_principals(db, tconst_map, nconst_map)
+    db = SessionLocal()
+
+    try:
+        if args.rebuild:
+            run_rebuild(args.workers, args.parser, args.all_people)
+        elif args.workers > 1:
+            run_parallel(db, args.loader, args.workers, args.parser, args.all_people)
+        else:
+            run_serial(db, loader, args.parser, args.all_people)
 
         # Stats
         print_stats(db)
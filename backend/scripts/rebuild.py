@@ -0,0 +1,307 @@
+"""Blue/green rebuild of the IMDb catalog tables for ingest_imdb --rebuild.
+
+Instead of loading into the live catalog_* tables while every index is
+maintained row by row and the API sees half-loaded data, a rebuild:
+
+  1. creates UNLOGGED copies of the tables in the catalog_build schema
+     with only their primary key and unique indexes (needed for the
+     merge's ON CONFLICT), plus their triggers;
+  2. seeds the tables whose rows are never deleted (titles, people,
+     ratings) from the live ones, so ids stay stable and columns filled by
+     enrichment (posters, TMDB ids, OMDb scores, ...) are carried over;
+     trigger-maintained tables (title_cards) fill from the seeding and loads;
+  3. loads every file into those copies: processes that call
+     use_build_schema() resolve the unqualified table names in the loaders
+     to catalog_build first;
+  4. switches them to LOGGED, builds the secondary indexes in parallel,
+     adds the foreign keys between them and ANALYZEs them;
+  5. swaps them in within one transaction: copies enrichment written to the
+     live tables during the load, moves the sequences over, drops the live
+     tables and moves the new ones into public. Foreign keys from user
+     tables are re-pointed NOT VALID and validated after the swap without
+     blocking writes. The tables' delta_load row hashes are dropped with them.
+
+The API keeps serving the old tables until the swap commits.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import engine
+from scripts.bulk_load import LoadStats, TableSpec, copy_load
+
+BUILD_SCHEMA = "catalog_build"
+MAINTENANCE_WORK_MEM = "512MB"
+SWAP_LOCK_TIMEOUT = "10s"
+SWAP_ATTEMPTS = 5
+
+
+def rebuild_load(db, spec: TableSpec, rows) -> LoadStats:
+    """copy_load for shadow tables; seeded tables take the dump's values on key conflicts."""
+    if not spec.delete_missing:
+        updates = ", ".join(
+            f"{c} = EXCLUDED.{c}" for c in spec.columns + list(spec.computed) if c not in spec.key
+        )
+        spec = replace(spec, conflict=f"ON CONFLICT ({', '.join(spec.key)}) DO UPDATE SET {updates}")
+    return copy_load(db, spec, rows)
+
+
+def use_build_schema() -> None:
+    """Make every new connection of this process (and its forked workers) see catalog_build first."""
+
+    @event.listens_for(engine, "connect", insert=True)
+    def _search_path(dbapi_connection, connection_record):
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET SESSION search_path TO {BUILD_SCHEMA}, public")
+        cursor.close()
+        dbapi_connection.autocommit = autocommit
+
+    engine.dispose()
+
+
+def _shadow(definition: str, tables: list[str]) -> str:
+    """Point a live index, trigger or foreign key definition at the catalog_build tables."""
+    names = "|".join(map(re.escape, tables))
+    definition = re.sub(rf" ON (ONLY )?(public\.)?({names}) ", rf" ON \1{BUILD_SCHEMA}.\3 ", definition, count=1)
+    return re.sub(rf"REFERENCES (public\.)?({names})\(", rf"REFERENCES {BUILD_SCHEMA}.\2(", definition)
+
+
+def _columns(conn, table: str) -> list[str]:
+    """Writable columns of a live table, in table order."""
+    return conn.execute(
+        text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = :table AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        """),
+        {"table": table},
+    ).scalars().all()
+
+
+def _constraints(conn, table: str, kinds: str) -> list[tuple[str, str]]:
+    """(name, definition) of a live table's constraints of the given pg_constraint kinds."""
+    rows = conn.execute(
+        text("""
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = CAST(:table AS regclass) AND contype = ANY(CAST(:kinds AS "char"[]))
+            ORDER BY conname
+        """),
+        {"table": f"public.{table}", "kinds": list(kinds)},
+    ).fetchall()
+    return [(r[0], r[1]) for r in rows]
+
+
+def _indexes(conn, table: str, unique: bool) -> list[str]:
+    """Definitions of a live table's indexes that do not back a constraint."""
+    return conn.execute(
+        text("""
+            SELECT pg_get_indexdef(ix.indexrelid) FROM pg_index ix
+            WHERE ix.indrelid = CAST(:table AS regclass) AND ix.indisunique = :unique
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = ix.indexrelid)
+            ORDER BY ix.indexrelid
+        """),
+        {"table": f"public.{table}", "unique": unique},
+    ).scalars().all()
+
+
+def _triggers(conn, table: str) -> list[str]:
+    return conn.execute(
+        text("""
+            SELECT pg_get_triggerdef(oid) FROM pg_trigger
+            WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal
+        """),
+        {"table": f"public.{table}"},
+    ).scalars().all()
+
+
+def _external_fks(conn, tables: list[str]) -> list[tuple[str, str, str]]:
+    """(table, name, definition) of foreign keys from other tables into the rebuilt ones."""
+    rows = conn.execute(
+        text("""
+            SELECT CAST(conrelid AS regclass)::text, conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f'
+              AND confrelid = ANY(CAST(:tables AS regclass[]))
+              AND NOT conrelid = ANY(CAST(:tables AS regclass[]))
+            ORDER BY 1, 2
+        """),
+        {"tables": [f"public.{t}" for t in tables]},
+    ).fetchall()
+    return [(r[0], r[1], r[2]) for r in rows]
+
+
+def _run_parallel(statements: list[str], workers: int) -> None:
+    """Run independent DDL statements on up to `workers` connections at once."""
+
+    def run(sql: str) -> None:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+            conn.execute(text(sql))
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for future in [pool.submit(run, sql) for sql in statements]:
+            future.result()
+
+
+def prepare_shadow_tables(specs: list[TableSpec]) -> None:
+    """Create catalog_build with unlogged, lightly indexed copies of the catalog tables."""
+    tables = [s.table for s in specs]
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {BUILD_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {BUILD_SCHEMA}"))
+        for spec in specs:
+            shadow = f"{BUILD_SCHEMA}.{spec.table}"
+            conn.execute(
+                text(f"""
+                    CREATE UNLOGGED TABLE {shadow} (LIKE public.{spec.table}
+                        INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED INCLUDING STORAGE)
+                """)
+            )
+            for name, definition in _constraints(conn, spec.table, "pu"):
+                conn.execute(text(f"ALTER TABLE {shadow} ADD CONSTRAINT {name} {definition}"))
+            for definition in _indexes(conn, spec.table, unique=True):
+                conn.execute(text(_shadow(definition, tables)))
+            for definition in _triggers(conn, spec.table):
+                conn.execute(text(_shadow(definition, tables)))
+
+        # Seed once every shadow table exists, so the triggers the seeding
+        # fires write to the shadow tables they resolve to first
+        conn.execute(text(f"SET LOCAL search_path TO {BUILD_SCHEMA}, public"))
+        for spec in specs:
+            if not spec.delete_missing:
+                columns = ", ".join(_columns(conn, spec.table))
+                conn.execute(
+                    text(f"""
+                        INSERT INTO {BUILD_SCHEMA}.{spec.table} ({columns})
+                        SELECT {columns} FROM public.{spec.table}
+                    """)
+                )
+    print(f"  Prepared {len(specs)} shadow tables in {BUILD_SCHEMA} ({time.perf_counter() - start:.1f}s)")
+
+
+def finish_shadow_tables(specs: list[TableSpec], workers: int) -> None:
+    """Make the loaded shadow tables durable, index them and collect statistics."""
+    tables = [s.table for s in specs]
+
+    start = time.perf_counter()
+    _run_parallel([f"ALTER TABLE {BUILD_SCHEMA}.{t} SET LOGGED" for t in tables], workers)
+    print(f"  Switched shadow tables to logged ({time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        indexes = [_shadow(d, tables) for t in tables for d in _indexes(conn, t, unique=False)]
+        fks = [(t, name, _shadow(d, tables)) for t in tables for name, d in _constraints(conn, t, "f")]
+    _run_parallel(indexes, workers)
+    print(f"  Built {len(indexes)} secondary indexes ({time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        # Serially: adding a foreign key locks both tables against concurrent DDL
+        for table, name, definition in fks:
+            conn.execute(text(f"ALTER TABLE {BUILD_SCHEMA}.{table} ADD CONSTRAINT {name} {definition}"))
+    _run_parallel([f"ANALYZE {BUILD_SCHEMA}.{t}" for t in tables], workers)
+    print(f"  Added {len(fks)} foreign keys and analyzed ({time.perf_counter() - start:.1f}s)")
+
+
+def _reset_row_hashes(conn, specs: list[TableSpec]) -> None:
+    """Forget delta_load's row hashes for the rebuilt tables.
+
+    They describe the rows the swap drops, so the next delta run would skip
+    rows that reverted to their last hashed content. Without them it rewrites
+    every row once and records fresh hashes.
+    """
+    conn.execute(
+        text("DELETE FROM public.ingest_row_hashes WHERE source = ANY(:sources)"),
+        {"sources": [s.table for s in specs]},
+    )
+
+
+def _swap(conn, specs: list[TableSpec], external_fks: list[tuple[str, str, str]]) -> None:
+    tables = [s.table for s in specs]
+    # Triggers fired by the catch-up below must write to the shadow tables
+    conn.execute(text(f"SET LOCAL search_path TO {BUILD_SCHEMA}, public"))
+    conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+    # Reads carry on against the live tables; writes wait for the swap
+    conn.execute(text(f"LOCK TABLE {', '.join(f'public.{t}' for t in tables)} IN EXCLUSIVE MODE"))
+
+    for spec in specs:
+        if spec.delete_missing:
+            continue
+        shadow = f"{BUILD_SCHEMA}.{spec.table}"
+        columns = _columns(conn, spec.table)
+        # Columns ingestion does not write, e.g. enrichment that landed during the load
+        carried = [c for c in columns if c not in {"id", *spec.columns, *spec.computed, *spec.derived}]
+        if carried:
+            conn.execute(
+                text(f"""
+                    UPDATE {shadow} b SET {', '.join(f'{c} = l.{c}' for c in carried)}
+                    FROM public.{spec.table} l
+                    WHERE b.id = l.id
+                      AND ({', '.join(f'b.{c}' for c in carried)}) IS DISTINCT FROM
+                          ({', '.join(f'l.{c}' for c in carried)})
+                """)
+            )
+        conn.execute(
+            text(f"""
+                INSERT INTO {shadow} ({', '.join(columns)})
+                SELECT {', '.join(f'l.{c}' for c in columns)} FROM public.{spec.table} l
+                WHERE NOT EXISTS (SELECT 1 FROM {shadow} b WHERE b.id = l.id)
+                ON CONFLICT DO NOTHING
+            """)
+        )
+
+    conn.execute(text("SET LOCAL search_path TO public"))
+    for table, name, _ in external_fks:
+        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+    for table in tables:
+        if "id" not in _columns(conn, table):
+            continue
+        sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+        if sequence:
+            # The live table owns its id sequence; hand it over before the drop takes it along
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {BUILD_SCHEMA}.{table}.id"))
+    conn.execute(text(f"DROP TABLE {', '.join(tables)}"))
+    _reset_row_hashes(conn, specs)
+    for table in tables:
+        conn.execute(text(f"ALTER TABLE {BUILD_SCHEMA}.{table} SET SCHEMA public"))
+    for table, name, definition in external_fks:
+        conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition} NOT VALID"))
+
+
+def swap_shadow_tables(specs: list[TableSpec]) -> None:
+    """Replace the live catalog tables with the shadow ones in a single transaction."""
+    tables = [s.table for s in specs]
+    with engine.connect() as conn:
+        conn.execute(text("SET search_path TO public"))
+        external_fks = _external_fks(conn, tables)
+        conn.commit()
+
+    start = time.perf_counter()
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            with engine.begin() as conn:
+                _swap(conn, specs, external_fks)
+            break
+        except OperationalError as e:
+            # Most likely the lock timeout behind a long-running query; the swap rolled back
+            if attempt == SWAP_ATTEMPTS:
+                raise
+            print(f"  Swap attempt {attempt} failed ({e.orig}); retrying")
+            time.sleep(attempt * 5)
+    print(f"  Swapped {len(tables)} tables into public ({time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL search_path TO public"))
+        for table, name, _ in external_fks:
+            conn.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}"))
+        conn.execute(text(f"DROP SCHEMA {BUILD_SCHEMA}"))
+    print(f"  Validated {len(external_fks)} foreign keys from other tables ({time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,419 @@
+"""Local stand-in for the TMDB, OMDb and OpenAI APIs.
+
+Serves recorded fixtures where they exist and deterministic synthesized
+responses otherwise, with injectable latency, server errors and 429s, so the
+enrichment queues, seed scripts and recommendations can be run and
+benchmarked end to end without touching the real services.
+
+Usage:
+    cd backend
+    python -m scripts.standin_server [--port 8900] [--workers 1]
+        [--latency-ms 80 | --latency-ms tmdb=60,omdb=250,openai=400]
+        [--jitter-ms 30] [--error-rate 0.01] [--rate-limit-rate 0.02]
+        [--missing-rate 0.1]
+
+Then point the app or a script at it (any non-empty API keys work):
+    TMDB_BASE_URL=http://localhost:8900/tmdb/3
+    OMDB_BASE_URL=http://localhost:8900/omdb
+    OPENAI_BASE_URL=http://localhost:8900/openai/v1
+
+Recorded responses live in scripts/standin_fixtures/, named after the
+request: tmdb/movie/{id}.json (a full append_to_response payload, also used
+for the /videos, /watch/providers and /external_ids sub-resources),
+tmdb/find/{imdb_id}.json and omdb/{imdb_id}.json. Anything else is
+synthesized from the id, using tmdb_id = the numeric part of the IMDb
+tconst, so repeated runs see identical data. --missing-rate makes that
+share of titles (and, independently, of trailers and overviews) unknown
+upstream.
+
+Settings are read from STANDIN_* environment variables so the app can also
+be served directly, e.g. `uvicorn scripts.standin_server:app --workers 4`.
+Request and fault counts are at GET /_standin/stats.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import struct
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+FIXTURES_DIR = Path(__file__).parent / "standin_fixtures"
+UPSTREAMS = ("tmdb", "omdb", "openai")
+DEFAULT_EMBEDDING_DIMENSIONS = 1536
+
+# (provider_id, provider_name, logo_path, display_priority)
+PROVIDERS = [
+    (8, "Netflix", "/pbpMk2JmcoNnQwx5JGpXngfoWtp.jpg", 0),
+    (9, "Amazon Prime Video", "/dQeAar5H991VYporEjUspolDarG.jpg", 1),
+    (337, "Disney Plus", "/97yvRBw1GzX7fXprcF80er19ot.jpg", 2),
+    (15, "Hulu", "/bxBlRPEPpMVDc4jMhSrTf2339DW.jpg", 3),
+    (1899, "Max", "/6Q3ZYUNA9Hsgj6iWnVsw2gR5V6z.jpg", 4),
+    (2, "Apple TV", "/9ghgSC0MA082EL6HLCW3GalykFD.jpg", 5),
+    (3, "Google Play Movies", "/8z7rC8uIDaTM91X0ZfkRf04ydj2.jpg", 6),
+]
+REGIONS = ("US", "GB", "CA", "DE")
+LANGUAGES = ("en", "en", "en", "fr", "es", "ja", "ko", "de", "it", "hi")
+
+# Well-known IMDb tconst numbers, so the synthesized trending list and mood
+# suggestions match titles in a real catalog
+POPULAR = [
+    (111161, "The Shawshank Redemption", 1994),
+    (68646, "The Godfather", 1972),
+    (468569, "The Dark Knight", 2008),
+    (137523, "Fight Club", 1999),
+    (110912, "Pulp Fiction", 1994),
+    (109830, "Forrest Gump", 1994),
+    (1375666, "Inception", 2010),
+    (816692, "Interstellar", 2014),
+    (133093, "The Matrix", 1999),
+    (120737, "The Lord of the Rings: The Fellowship of the Ring", 2001),
+    (167260, "The Lord of the Rings: The Return of the King", 2003),
+    (80684, "Star Wars: Episode V - The Empire Strikes Back", 1980),
+    (99685, "Goodfellas", 1990),
+    (73486, "One Flew Over the Cuckoo's Nest", 1975),
+    (114369, "Se7en", 1995),
+    (102926, "The Silence of the Lambs", 1991),
+    (38650, "It's a Wonderful Life", 1946),
+    (47478, "Seven Samurai", 1954),
+    (118799, "Life Is Beautiful", 1997),
+    (245429, "Spirited Away", 2001),
+]
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: dict[str, float]
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    missing_rate: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "StandinConfig":
+        return cls(
+            latency_ms=parse_latency(os.environ.get("STANDIN_LATENCY_MS", "0")),
+            jitter_ms=float(os.environ.get("STANDIN_JITTER_MS", "0")),
+            error_rate=float(os.environ.get("STANDIN_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.environ.get("STANDIN_RATE_LIMIT_RATE", "0")),
+            missing_rate=float(os.environ.get("STANDIN_MISSING_RATE", "0")),
+        )
+
+
+def parse_latency(value: str) -> dict[str, float]:
+    """Parse "80" (every upstream) or "tmdb=60,omdb=250" (unlisted upstreams get 0)."""
+    if "=" not in value:
+        return {name: float(value) for name in UPSTREAMS}
+    latency = {name: 0.0 for name in UPSTREAMS}
+    for part in value.split(","):
+        name, ms = part.split("=", 1)
+        latency[name.strip()] = float(ms)
+    return latency
+
+
+config = StandinConfig.from_env()
+stats: Counter = Counter()
+app = FastAPI(title="MovieBrain upstream stand-in")
+
+
+# --- Fault and latency injection ---
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    upstream = request.url.path.strip("/").split("/", 1)[0]
+    if upstream not in UPSTREAMS:
+        return await call_next(request)
+
+    stats[f"{upstream}.requests"] += 1
+    delay_ms = config.latency_ms.get(upstream, 0.0)
+    if config.jitter_ms > 0:
+        # Exponential tail: most calls near the base latency, a few much slower
+        delay_ms += random.expovariate(1.0 / config.jitter_ms)
+    if delay_ms > 0:
+        await asyncio.sleep(delay_ms / 1000)
+
+    roll = random.random()
+    if roll < config.rate_limit_rate:
+        stats[f"{upstream}.429"] += 1
+        return JSONResponse(
+            {"status_code": 25, "status_message": "Your request count is over the allowed limit."},
+            status_code=429,
+            headers={"Retry-After": "1"},
+        )
+    if roll < config.rate_limit_rate + config.error_rate:
+        stats[f"{upstream}.5xx"] += 1
+        return JSONResponse({"error": "injected failure"}, status_code=random.choice((500, 502, 503)))
+    return await call_next(request)
+
+
+@app.get("/_standin/stats")
+def get_stats():
+    return {"config": config.__dict__, "counts": dict(stats)}
+
+
+# --- Helpers ---
+
+def _fixture(*parts: str) -> dict | None:
+    path = FIXTURES_DIR.joinpath(*parts[:-1], f"{parts[-1]}.json")
+    if path.is_file():
+        return json.loads(path.read_text())
+    return None
+
+
+def _fraction(key: str) -> float:
+    """Stable pseudo-random number in [0, 1) for a key."""
+    return int(hashlib.sha1(key.encode()).hexdigest()[:8], 16) / 0x100000000
+
+
+def _missing(key: str) -> bool:
+    return _fraction(key) < config.missing_rate
+
+
+def _tconst_number(imdb_id: str) -> int | None:
+    if imdb_id.startswith("tt") and imdb_id[2:].isdigit():
+        return int(imdb_id[2:])
+    return None
+
+
+def _imdb_id(tmdb_id: int) -> str:
+    return f"tt{tmdb_id:07d}"
+
+
+def _title(tmdb_id: int) -> tuple[str, int]:
+    for number, title, year in POPULAR:
+        if number == tmdb_id:
+            return title, year
+    return f"Stand-in Movie {tmdb_id}", 1950 + tmdb_id % 75
+
+
+# --- TMDB ---
+
+def _tmdb_unknown() -> JSONResponse:
+    return JSONResponse(
+        {"success": False, "status_code": 34, "status_message": "The resource you requested could not be found."},
+        status_code=404,
+    )
+
+
+def _synth_videos(tmdb_id: int) -> dict:
+    if _missing(f"trailer:{tmdb_id}"):
+        return {"id": tmdb_id, "results": []}
+    return {
+        "id": tmdb_id,
+        "results": [
+            {"site": "YouTube", "type": "Teaser", "official": True, "key": f"standin-teaser-{tmdb_id}"},
+            {"site": "YouTube", "type": "Trailer", "official": True, "key": f"standin-{tmdb_id}"},
+        ],
+    }
+
+
+def _synth_providers(tmdb_id: int) -> dict:
+    results = {}
+    for region in REGIONS:
+        rng = random.Random(f"providers:{tmdb_id}:{region}")
+        if rng.random() < 0.3:
+            continue
+        entry = {"link": f"https://www.themoviedb.org/movie/{tmdb_id}/watch?locale={region}"}
+        for ptype, count in (("flatrate", rng.randint(0, 3)), ("rent", rng.randint(0, 2)), ("buy", rng.randint(0, 2))):
+            if count:
+                entry[ptype] = [
+                    {"provider_id": pid, "provider_name": name, "logo_path": logo, "display_priority": prio}
+                    for pid, name, logo, prio in rng.sample(PROVIDERS, count)
+                ]
+        results[region] = entry
+    return {"id": tmdb_id, "results": results}
+
+
+def _synth_movie(tmdb_id: int) -> dict:
+    title, year = _title(tmdb_id)
+    return {
+        "id": tmdb_id,
+        "imdb_id": _imdb_id(tmdb_id),
+        "title": title,
+        "release_date": f"{year}-06-01",
+        "poster_path": f"/standin{tmdb_id}.jpg",
+        "overview": None if _missing(f"overview:{tmdb_id}") else f"Synthesized overview for {title}.",
+        "original_language": LANGUAGES[tmdb_id % len(LANGUAGES)],
+        "popularity": round(100 * _fraction(f"popularity:{tmdb_id}"), 3),
+    }
+
+
+def _movie(media_type: str, tmdb_id: int) -> dict | None:
+    """Full title payload with every sub-resource appended, recorded or synthesized."""
+    recorded = _fixture("tmdb", media_type, str(tmdb_id))
+    if recorded is not None:
+        return recorded
+    if _missing(f"title:{tmdb_id}"):
+        return None
+    movie = _synth_movie(tmdb_id)
+    movie["videos"] = _synth_videos(tmdb_id)
+    movie["watch/providers"] = _synth_providers(tmdb_id)
+    movie["external_ids"] = {"id": tmdb_id, "imdb_id": movie["imdb_id"]}
+    return movie
+
+
+@app.get("/tmdb/3/find/{imdb_id}")
+def tmdb_find(imdb_id: str):
+    recorded = _fixture("tmdb", "find", imdb_id)
+    if recorded is not None:
+        return recorded
+    number = _tconst_number(imdb_id)
+    if number is None or _missing(f"title:{number}"):
+        return {"movie_results": [], "tv_results": []}
+    movie = _synth_movie(number)
+    return {"movie_results": [movie], "tv_results": []}
+
+
+@app.get("/tmdb/3/trending/movie/week")
+def tmdb_trending():
+    return {
+        "page": 1,
+        "results": [{"id": number, "title": title, "media_type": "movie"} for number, title, _ in POPULAR],
+        "total_pages": 1,
+        "total_results": len(POPULAR),
+    }
+
+
+@app.get("/tmdb/3/watch/providers/movie")
+def tmdb_provider_master(watch_region: str = "US"):
+    return {
+        "results": [
+            {
+                "provider_id": pid,
+                "provider_name": name,
+                "logo_path": logo,
+                "display_priority": prio,
+                "display_priorities": {watch_region: prio},
+            }
+            for pid, name, logo, prio in PROVIDERS
+        ]
+    }
+
+
+@app.get("/tmdb/3/{media_type}/{tmdb_id}/{resource:path}")
+def tmdb_sub_resource(media_type: str, tmdb_id: int, resource: str):
+    movie = _movie(media_type, tmdb_id)
+    if movie is None or resource not in ("videos", "watch/providers", "external_ids"):
+        return _tmdb_unknown()
+    return movie.get(resource) or {"id": tmdb_id, "results": []}
+
+
+@app.get("/tmdb/3/{media_type}/{tmdb_id}")
+def tmdb_title(media_type: str, tmdb_id: int, append_to_response: str = ""):
+    movie = _movie(media_type, tmdb_id)
+    if movie is None:
+        return _tmdb_unknown()
+    appended = {a for a in append_to_response.split(",") if a}
+    return {
+        k: v for k, v in movie.items()
+        if k not in ("videos", "watch/providers", "external_ids") or k in appended
+    }
+
+
+# --- OMDb ---
+
+@app.get("/omdb/")
+def omdb(i: str = "", apikey: str = ""):
+    if not apikey:
+        return JSONResponse({"Response": "False", "Error": "No API key provided."}, status_code=401)
+    recorded = _fixture("omdb", i)
+    if recorded is not None:
+        return recorded
+    number = _tconst_number(i)
+    if number is None or _missing(f"title:{number}"):
+        return {"Response": "False", "Error": "Incorrect IMDb ID."}
+
+    title, year = _title(number)
+    rng = random.Random(f"omdb:{number}")
+    ratings = [{"Source": "Internet Movie Database", "Value": f"{rng.uniform(4, 9):.1f}/10"}]
+    metascore = "N/A"
+    if not _missing(f"scores:{number}"):
+        ratings.append({"Source": "Rotten Tomatoes", "Value": f"{rng.randint(10, 100)}%"})
+        metascore = str(rng.randint(20, 100))
+        ratings.append({"Source": "Metacritic", "Value": f"{metascore}/100"})
+    return {"Title": title, "Year": str(year), "imdbID": i, "Ratings": ratings, "Metascore": metascore, "Response": "True"}
+
+
+# --- OpenAI ---
+
+def _embedding(text: str, dimensions: int) -> list[float]:
+    rng = random.Random(hashlib.sha1(text.encode()).digest())
+    vec = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = sum(x * x for x in vec) ** 0.5
+    return [x / norm for x in vec]
+
+
+@app.post("/openai/v1/embeddings")
+async def openai_embeddings(request: Request):
+    body = await request.json()
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    dimensions = body.get("dimensions") or DEFAULT_EMBEDDING_DIMENSIONS
+    data = []
+    for index, text in enumerate(inputs):
+        vec = _embedding(str(text), dimensions)
+        if body.get("encoding_format") == "base64":
+            vec = base64.b64encode(struct.pack(f"<{len(vec)}f", *vec)).decode()
+        data.append({"object": "embedding", "index": index, "embedding": vec})
+    tokens = sum(len(str(t).split()) for t in inputs)
+    return {
+        "object": "list",
+        "data": data,
+        "model": body.get("model", ""),
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+@app.post("/openai/v1/chat/completions")
+async def openai_chat(request: Request):
+    body = await request.json()
+    system = " ".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "system")
+    if "JSON array" in system:
+        content = json.dumps([{"title": title, "year": year} for _, title, year in POPULAR])
+    else:
+        content = "A tense, character-driven drama with a slow-burning mystery and a bittersweet ending."
+    return {
+        "id": f"chatcmpl-standin-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", ""),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for TMDB, OMDb and OpenAI")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency-ms", type=str, default="0", help='e.g. "80" or "tmdb=60,omdb=250,openai=400"')
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Mean of the extra exponential latency tail")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Share of titles/fields unknown upstream")
+    args = parser.parse_args()
+
+    # Workers import this module fresh, so settings travel via the environment
+    os.environ.update({
+        "STANDIN_LATENCY_MS": args.latency_ms,
+        "STANDIN_JITTER_MS": str(args.jitter_ms),
+        "STANDIN_ERROR_RATE": str(args.error_rate),
+        "STANDIN_RATE_LIMIT_RATE": str(args.rate_limit_rate),
+        "STANDIN_MISSING_RATE": str(args.missing_rate),
+    })
+
+    import uvicorn
+
+    uvicorn.run("scripts.standin_server:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
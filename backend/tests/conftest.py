@@ -27,6 +27,11 @@ def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
+# Background enrichment and the trending refresher write through their own
+# sessions to the main database and call real APIs; keep them off under test
+settings.ENRICHMENT_ENABLED = False
+settings.TRENDING_REFRESH_ENABLED = False
+
 
 @pytest.fixture(scope="session", autouse=True)
 def create_test_db():
@@ -55,6 +60,16 @@ def create_test_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Drop in-process caches so cached aggregates never leak between tests."""
+    from app.services.discovery import facet_cache
+
+    facet_cache.clear()
+    yield
+    facet_cache.clear()
+
+
 @pytest.fixture
 def db():
     """Get a test database session, rolled back after each test."""
@@ -114,6 +129,46 @@ def seed_movie(db):
     return title.id
 
 
+@pytest.fixture
+def insert_movie(db):
+    """Return a function that inserts a movie directly into catalog_titles and returns its id."""
+
+    def insert(tconst="tt0000001", title="Test Movie", year=2020, genres="Action"):
+        title_id = db.execute(
+            text("""
+                INSERT INTO catalog_titles
+                    (imdb_tconst, title_type, primary_title, original_title,
+                     start_year, runtime_minutes, genres)
+                VALUES
+                    (:tconst, 'movie', :title, :title,
+                     :year, 120, :genres)
+                RETURNING id
+            """),
+            {"tconst": tconst, "title": title, "year": year, "genres": genres},
+        ).scalar()
+        db.flush()
+        return title_id
+
+    return insert
+
+
+@pytest.fixture
+def insert_rating(db):
+    """Return a function that inserts a catalog_ratings row for a title."""
+
+    def insert(title_id, rating=8.0, votes=10000):
+        db.execute(
+            text("""
+                INSERT INTO catalog_ratings (title_id, average_rating, num_votes)
+                VALUES (:title_id, :rating, :votes)
+            """),
+            {"title_id": title_id, "rating": rating, "votes": votes},
+        )
+        db.flush()
+
+    return insert
+
+
 @pytest.fixture
 def seed_movies(db):
     """Insert multiple catalog titles for testing. Returns list of ids."""
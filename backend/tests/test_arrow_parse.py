@@ -0,0 +1,154 @@
+import csv
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scripts import arrow_parse  # noqa: E402
+from scripts.imdb_ids import IdMap, keep_known, map_ids  # noqa: E402
+from scripts.ingest_imdb import (  # noqa: E402
+    name_basics_rows,
+    title_akas_rows,
+    title_basics_rows,
+    title_crew_rows,
+    title_principals_rows,
+    title_ratings_rows,
+)
+
+TITLES = IdMap(np.array([1, 3, 4], dtype=np.int64), np.array([101, 103, 104], dtype=np.int64))
+PEOPLE = IdMap(np.array([1588970, 5690, 721526], dtype=np.int64), np.array([201, 202, 203], dtype=np.int64))
+
+FILES = {
+    "title.basics.tsv.gz": [
+        "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres",
+        "tt0000001\tmovie\tCarmencita\tCarmencita\t0\t1894\t\\N\t1\tDocumentary,Short",
+        "tt0000002\tshort\tLe clown et ses chiens\tLe clown et ses chiens\t0\t1892\t\\N\t5\tAnimation",
+        "tt0000003\tmovie\t\\N\tPauvre Pierrot\t0\t1892\t\\N\tabc\t\\N",
+        'tt0000004\tmovie\tSay "Cheese", Pierrot\tSay "Cheese"\t0\t\\N\t\\N\t12\tComedy',
+    ],
+    "title.ratings.tsv.gz": [
+        "tconst\taverageRating\tnumVotes",
+        "tt0000001\t5.7\t2045",
+        "tt0000003\t8.0\t\\N",
+        "tt0000005\t6.1\t10",
+    ],
+    "title.crew.tsv.gz": [
+        "tconst\tdirectors\twriters",
+        "tt0000001\tnm0005690\t\\N",
+        "tt0000003\tnm0721526,nm0000002\tnm0721526",
+        "tt0000009\t\\N\t\\N",
+    ],
+    "title.akas.tsv.gz": [
+        "titleId\tordering\ttitle\tregion\tlanguage\ttypes\tattributes\tisOriginalTitle",
+        "tt0000001\t1\tCarmencita\t\\N\t\\N\toriginal\t\\N\t1",
+        "tt0000001\t2\tCarmencita - spanyol tánc\tHU\t\\N\timdbDisplay\t\\N\t0",
+        "tt0000002\t1\tLe clown\tFR\t\\N\timdbDisplay\t\\N\t0",
+        "tt0000003\t1\tPauvre Pierrot\t\\N\t\\N\t\\N\t\\N\t\\N",
+    ],
+    "title.principals.tsv.gz": [
+        "tconst\tordering\tnconst\tcategory\tjob\tcharacters",
+        'tt0000001\t1\tnm1588970\tself\t\\N\t["Self"]',
+        "tt0000001\t2\tnm0005690\tdirector\t\\N\t\\N",
+        "tt0000003\t1\tnm9999999\tactor\t\\N\t\\N",
+        "tt0000009\t1\tnm1588970\tself\t\\N\t\\N",
+    ],
+    "name.basics.tsv.gz": [
+        "nconst\tprimaryName\tbirthYear\tdeathYear\tprimaryProfession\tknownForTitles",
+        "nm0000002\tLauren Bacall\t1924\t2014\tactress\ttt0037382",
+        "nm0005690\t\\N\t1860\t1944\tdirector\ttt0000001",
+        "nm0000003\tBrigitte Bardot\t1934\t\\N\tactress\ttt0049189",
+    ],
+}
+
+
+@pytest.fixture
+def imdb_files(tmp_path):
+    paths = {}
+    for name, lines in FILES.items():
+        paths[name] = tmp_path / name
+        with gzip.open(paths[name], "wt", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return paths
+
+
+def _cell(value):
+    """A loaded value in a form both parsers' output agree on."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool) or value in ("true", "false"):
+        return value in (True, "true")
+    if isinstance(value, list):
+        return "{" + ",".join(value) + "}"
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _python(rows) -> list[list]:
+    return [[_cell(v) for v in row] for row in rows]
+
+
+def _arrow(chunks) -> list[list]:
+    rows = []
+    for count, data in chunks:
+        chunk = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+        assert len(chunk) == count
+        rows += chunk
+    return [[_cell(v) for v in row] for row in rows]
+
+
+def test_parsers_agree_on_title_basics(imdb_files):
+    path = imdb_files["title.basics.tsv.gz"]
+    py_skipped, arrow_skipped = [0], [0]
+    expected = _python(title_basics_rows(path, py_skipped))
+
+    assert _arrow(arrow_parse.title_basics_batches(path, arrow_skipped)) == expected
+    assert [row[0] for row in expected] == ["tt0000001", "tt0000003", "tt0000004"]
+    assert py_skipped == arrow_skipped == [1]
+
+
+@pytest.mark.parametrize(
+    "name, python_rows, arrow_batches",
+    [
+        ("title.ratings.tsv.gz", title_ratings_rows, arrow_parse.title_ratings_batches),
+        ("title.crew.tsv.gz", title_crew_rows, arrow_parse.title_crew_batches),
+        ("title.akas.tsv.gz", title_akas_rows, arrow_parse.title_akas_batches),
+    ],
+)
+def test_parsers_agree_on_title_id_mapping(imdb_files, name, python_rows, arrow_batches):
+    path = imdb_files[name]
+    py_skipped, arrow_skipped = [0], [0]
+    expected = _python(map_ids(python_rows(path), {0: TITLES}, py_skipped))
+
+    assert _arrow(arrow_batches(path, TITLES, arrow_skipped)) == expected
+    assert {row[0] for row in expected} == {101.0, 103.0}
+    assert py_skipped == arrow_skipped == [1]
+
+
+def test_parsers_agree_on_principals(imdb_files):
+    path = imdb_files["title.principals.tsv.gz"]
+    py_skipped, arrow_skipped = [0], [0]
+    expected = _python(map_ids(title_principals_rows(path), {0: TITLES, 1: PEOPLE}, py_skipped))
+
+    assert _arrow(arrow_parse.title_principals_batches(path, TITLES, PEOPLE, arrow_skipped)) == expected
+    assert [row[:2] for row in expected] == [[101.0, 201.0], [101.0, 202.0]]
+    assert py_skipped == arrow_skipped == [2]
+
+
+def test_parsers_agree_on_movie_people(imdb_files):
+    people = arrow_parse.movie_nconsts(
+        imdb_files["title.principals.tsv.gz"], imdb_files["title.crew.tsv.gz"], TITLES
+    )
+    assert people.tolist() == [2, 5690, 721526, 1588970, 9999999]
+
+    path = imdb_files["name.basics.tsv.gz"]
+    py_skipped, arrow_skipped = [0], [0]
+    expected = _python(keep_known(name_basics_rows(path), people, py_skipped))
+
+    assert _arrow(arrow_parse.name_basics_batches(path, people, arrow_skipped)) == expected
+    assert [row[:2] for row in expected] == [["nm0000002", "Lauren Bacall"], ["nm0005690", "Unknown"]]
+    assert py_skipped == arrow_skipped == [1]
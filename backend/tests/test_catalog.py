@@ -1,3 +1,5 @@
+import math
+
 from sqlalchemy import text
 
 
@@ -7,11 +9,10 @@ def _seed_movie(db, tconst="tt0000001", title="Test Movie", year=2020, genres="A
         text("""
             INSERT INTO catalog_titles
                 (imdb_tconst, title_type, primary_title, original_title,
-                 start_year, runtime_minutes, genres, title_search_text, ts_vector)
+                 start_year, runtime_minutes, genres)
             VALUES
                 (:tconst, 'movie', :title, :title,
-                 :year, 120, :genres, :title,
-                 to_tsvector('english', :title))
+                 :year, 120, :genres)
             RETURNING id
         """),
         {"tconst": tconst, "title": title, "year": year, "genres": genres},
@@ -61,6 +62,26 @@ def test_search_no_results(client, db):
     assert data["results"] == []
 
 
+def test_search_matches_aka_titles_and_title_updates(client, db):
+    title_id = _seed_movie(db, "tt0000020", "Le Fabuleux Destin")
+    db.execute(
+        text("""
+            INSERT INTO catalog_akas (title_id, ordering, localized_title, region, is_original)
+            VALUES (:id, 1, 'Amelie', 'US', false), (:id, 2, 'Die fabelhafte Welt', 'DE', false)
+        """),
+        {"id": title_id},
+    )
+
+    assert client.get("/catalog/search?q=amelie").json()["total"] == 1
+    # Only selected akas are searchable
+    assert client.get("/catalog/search?q=fabelhafte").json()["total"] == 0
+
+    db.execute(
+        text("UPDATE catalog_titles SET original_title = 'Zazie Marvellous' WHERE id = :id"), {"id": title_id}
+    )
+    assert client.get("/catalog/search?q=zazie").json()["total"] == 1
+
+
 def test_search_pagination(client, db):
     for i in range(5):
         _seed_movie(db, f"tt900000{i}", f"Paginated Movie {i}", 2020)
@@ -90,3 +111,161 @@ def test_get_title_detail(client, db):
 def test_get_title_not_found(client, db):
     resp = client.get("/catalog/titles/999999")
     assert resp.status_code == 404
+
+
+def test_facets_counts(client, db):
+    a = _seed_movie(db, "tt7000001", "Facet Action", 1995, "Action,Thriller")
+    b = _seed_movie(db, "tt7000002", "Facet Drama", 2005, "Drama")
+    _seed_rating(db, a, 7.0, 1000)
+    _seed_rating(db, b, 8.0, 1000)
+
+    resp = client.get("/catalog/facets")
+    assert resp.status_code == 200
+    data = resp.json()
+    genres = {f["genre"]: f["count"] for f in data["genres"]}
+    assert genres["Action"] >= 1
+    assert genres["Drama"] >= 1
+    decades = {f["decade"]: f["count"] for f in data["decades"]}
+    assert decades[1990] >= 1
+    assert decades[2000] >= 1
+
+
+def test_facets_ignore_own_dimension(client, db):
+    _seed_movie(db, "tt7000011", "Facet One", 1995, "Action")
+    _seed_movie(db, "tt7000012", "Facet Two", 1998, "Drama")
+    _seed_movie(db, "tt7000013", "Facet Three", 2005, "Action")
+
+    resp = client.get("/catalog/facets?genres=Action&decade=1990")
+    data = resp.json()
+    genres = {f["genre"]: f["count"] for f in data["genres"]}
+    decades = {f["decade"]: f["count"] for f in data["decades"]}
+    # Genre counts respect the decade filter but not the genre filter
+    assert genres == {"Action": 1, "Drama": 1}
+    # Decade counts respect the genre filter but not the decade filter
+    assert decades == {1990: 1, 2000: 1}
+
+
+def test_facets_invalid_provider_ids(client):
+    resp = client.get("/catalog/facets?provider_ids=abc")
+    assert resp.status_code == 422
+
+
+def test_browse_from_snapshot_matches_sql(client, db):
+    from app.services.snapshot import build_snapshot, set_snapshot
+
+    for i, (genres, year, rating, votes) in enumerate([
+        ("Action", 1995, 7.0, 5000),
+        ("Drama", 2005, 8.5, 200),
+        ("Action,Drama", 2015, 6.0, 90000),
+        ("Comedy", None, None, None),
+    ]):
+        title_id = _seed_movie(db, f"tt800000{i}", f"Snapshot Movie {i}", year, genres)
+        if rating is not None:
+            _seed_rating(db, title_id, rating, votes)
+
+    queries = [
+        "/catalog/browse",
+        "/catalog/browse?sort_by=rating",
+        "/catalog/browse?sort_by=year_asc",
+        "/catalog/browse?genres=Drama&min_rating=6",
+        "/catalog/browse?decade=1990",
+        "/catalog/browse?limit=2&page=2",
+    ]
+    expected = [client.get(q).json() for q in queries]
+
+    set_snapshot(build_snapshot(db))
+    try:
+        for q, exp in zip(queries, expected):
+            assert client.get(q).json() == exp
+    finally:
+        set_snapshot(None)
+
+
+def test_browse_cursor_pagination(client, db):
+    for i in range(5):
+        title_id = _seed_movie(db, f"tt810000{i}", f"Cursor Movie {i}", 2000 + i)
+        _seed_rating(db, title_id, 7.0, 1000)  # identical keys: ties broken by id
+
+    for sort_by in ("popularity", "rating", "year_desc", "year_asc"):
+        url = f"/catalog/browse?sort_by={sort_by}"
+        expected = [r["id"] for r in client.get(f"{url}&limit=100").json()["results"]]
+        url += "&limit=2"
+
+        ids, cursor = [], None
+        while True:
+            data = client.get(url + (f"&cursor={cursor}" if cursor else "")).json()
+            ids += [r["id"] for r in data["results"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert ids == expected
+
+
+def test_browse_cursor_wrong_sort(client, db):
+    for i in range(3):
+        _seed_movie(db, f"tt820000{i}", f"Cursor Sort {i}", 2000)
+    cursor = client.get("/catalog/browse?limit=1").json()["next_cursor"]
+
+    resp = client.get(f"/catalog/browse?sort_by=rating&cursor={cursor}")
+    assert resp.status_code == 422
+    resp = client.get("/catalog/browse?cursor=not-a-cursor")
+    assert resp.status_code == 422
+
+
+def _seed_provider(db, title_id, provider_id, provider_type="flatrate", region="US"):
+    from app.services.tmdb import sync_title_availability
+
+    db.execute(
+        text("""
+            INSERT INTO watch_providers (title_id, provider_id, provider_name, provider_type, region)
+            VALUES (:title_id, :provider_id, 'Provider', :provider_type, :region)
+        """),
+        {"title_id": title_id, "provider_id": provider_id, "provider_type": provider_type, "region": region},
+    )
+    sync_title_availability(db, title_id, region)
+    db.flush()
+
+
+def test_browse_provider_filter_uses_availability(client, db):
+    a = _seed_movie(db, "tt8300001", "Streaming Movie", 2001)
+    b = _seed_movie(db, "tt8300002", "Rental Movie", 2002)
+    c = _seed_movie(db, "tt8300003", "Abroad Movie", 2003)
+    _seed_provider(db, a, 8)
+    _seed_provider(db, b, 8, provider_type="rent")
+    _seed_provider(db, c, 8, region="GB")
+
+    data = client.get("/catalog/browse?provider_ids=8,337").json()
+    assert [r["id"] for r in data["results"]] == [a]
+
+    data = client.get("/catalog/browse?provider_ids=8&region=gb").json()
+    assert [r["id"] for r in data["results"]] == [c]
+
+    facets = client.get("/catalog/facets").json()
+    assert {f["provider_id"]: f["count"] for f in facets["providers"]} == {8: 1}
+
+
+def test_title_cards_follow_title_and_rating_writes(client, db):
+    title_id = _seed_movie(db, "tt8400001", "Card Movie", 2010)
+
+    def card():
+        return db.execute(
+            text("SELECT has_rating, average_rating, poster_path, popularity FROM title_cards WHERE title_id = :id"),
+            {"id": title_id},
+        ).fetchone()
+
+    assert tuple(card()) == (False, None, None, 0)
+
+    _seed_rating(db, title_id, 7.0, 999)
+    db.execute(text("UPDATE catalog_titles SET poster_path = '/card.jpg' WHERE id = :id"), {"id": title_id})
+    has_rating, rating, poster, popularity = card()
+    assert (has_rating, rating, poster) == (True, 7.0, "/card.jpg")
+    assert abs(popularity - 7.0 * math.log(1000)) < 1e-9
+
+    result = client.get("/catalog/browse").json()["results"]
+    assert [(r["id"], r["average_rating"]) for r in result] == [(title_id, 7.0)]
+
+    db.execute(text("DELETE FROM catalog_ratings WHERE title_id = :id"), {"id": title_id})
+    assert tuple(card()) == (False, None, "/card.jpg", 0)
+
+    db.execute(text("DELETE FROM catalog_titles WHERE id = :id"), {"id": title_id})
+    assert card() is None
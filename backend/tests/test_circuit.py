@@ -0,0 +1,79 @@
+import time
+
+import httpx
+import pytest
+
+from app.services.circuit import (
+    CircuitBreaker,
+    LatencyBudgetExceeded,
+    UpstreamUnavailable,
+    get_breaker,
+    latency_budget,
+    remaining_budget,
+)
+from app.services.http import GuardedTransport
+
+
+def _breaker(**overrides):
+    options = {"window_seconds": 30, "min_requests": 4, "failure_ratio": 0.5, "open_seconds": 0.05}
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+def test_breaker_opens_on_failure_ratio_and_recovers_via_probe():
+    breaker = _breaker()
+    for ok in (True, False, True, False):
+        breaker.before_request()
+        breaker.record(ok)
+    assert breaker.state == "open"
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_request()
+
+    time.sleep(0.06)
+    breaker.before_request()  # the probe
+    assert breaker.state == "half_open"
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_request()  # only one probe at a time
+    breaker.record(True)
+    assert breaker.state == "closed"
+
+
+def test_breaker_needs_minimum_volume():
+    breaker = _breaker(min_requests=10)
+    for _ in range(5):
+        breaker.record(False)
+    assert breaker.state == "closed"
+
+
+def test_nested_latency_budget_keeps_the_tighter_deadline():
+    assert remaining_budget() is None
+    with latency_budget(10):
+        with latency_budget(0.5):
+            assert remaining_budget() <= 0.5
+        assert remaining_budget() > 0.5
+    assert remaining_budget() is None
+
+
+def test_guarded_transport_fails_fast():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = httpx.Client(
+        transport=GuardedTransport("test-guarded", httpx.MockTransport(handler), rate_limited=False),
+        base_url="http://upstream.test",
+    )
+    with latency_budget(0):
+        with pytest.raises(LatencyBudgetExceeded):
+            client.get("/")
+    assert calls == []
+
+    breaker = get_breaker("test-guarded")
+    while breaker.state == "closed":
+        client.get("/")
+    calls.clear()
+    with pytest.raises(UpstreamUnavailable):
+        client.get("/")
+    assert calls == []
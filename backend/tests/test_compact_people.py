@@ -0,0 +1,37 @@
+from sqlalchemy import text
+
+from scripts.compact_people import compact_people
+
+
+def _seed_person(db, nconst: str) -> int:
+    return db.execute(
+        text("INSERT INTO catalog_people (imdb_nconst, primary_name) VALUES (:n, :n) RETURNING id"),
+        {"n": nconst},
+    ).scalar()
+
+
+def test_compact_people_keeps_only_credited_people(db, insert_movie):
+    title_id = insert_movie("tt8390001", "Compaction Movie")
+    actor = _seed_person(db, "nm8390001")
+    _seed_person(db, "nm8390002")  # director, credited through catalog_crew only
+    _seed_person(db, "nm8390003")  # not credited anywhere
+    db.execute(
+        text("""
+            INSERT INTO catalog_principals (title_id, person_id, ordering, category)
+            VALUES (:title_id, :person_id, 1, 'actor')
+        """),
+        {"title_id": title_id, "person_id": actor},
+    )
+    db.execute(
+        text("""
+            INSERT INTO catalog_crew (title_id, director_nconsts, writer_nconsts)
+            VALUES (:title_id, ARRAY['nm8390002'], NULL)
+        """),
+        {"title_id": title_id},
+    )
+
+    assert compact_people(db, batch_size=1) >= 1
+    kept = db.execute(
+        text("SELECT imdb_nconst FROM catalog_people WHERE imdb_nconst LIKE 'nm839000%' ORDER BY imdb_nconst")
+    ).scalars().all()
+    assert kept == ["nm8390001", "nm8390002"]
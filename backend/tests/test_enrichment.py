@@ -0,0 +1,110 @@
+import threading
+import time
+
+from app.services import enrichment
+from app.services.enrichment import EnrichmentQueue
+
+
+def _make_queue(fetch, written, batch_size=2, retry_seconds=600):
+    return EnrichmentQueue(
+        "test",
+        fetch=fetch,
+        write_batch=written.append,
+        enabled=lambda: True,
+        workers=2,
+        batch_size=batch_size,
+        flush_seconds=60,
+        max_pending=10,
+        retry_seconds=retry_seconds,
+    )
+
+
+def test_enqueue_dedups_and_writes_in_batches():
+    release = threading.Event()
+
+    def fetch(imdb_tconst):
+        release.wait(5)
+        return {"imdb": imdb_tconst}
+
+    written = []
+    q = _make_queue(fetch, written)
+    assert q.enqueue([(1, "tt1"), (2, "tt2"), (1, "tt1")]) == 2
+    # Still pending: not accepted again
+    assert q.enqueue([(1, "tt1"), (3, "tt3")]) == 1
+    release.set()
+    q.stop()
+
+    results = sorted(r for batch in written for r in batch)
+    assert results == [(1, {"imdb": "tt1"}), (2, {"imdb": "tt2"}), (3, {"imdb": "tt3"})]
+    assert all(len(batch) <= 2 for batch in written)
+    # Recently attempted ids are not re-fetched until retry_seconds pass
+    assert q.enqueue([(1, "tt1")]) == 0
+    q.stop()
+
+
+def test_failed_fetch_is_not_written():
+    def fetch(imdb_tconst):
+        if imdb_tconst == "tt_bad":
+            raise RuntimeError("upstream down")
+        return None if imdb_tconst == "tt_none" else {"ok": True}
+
+    written = []
+    q = _make_queue(fetch, written)
+    q.enqueue([(1, "tt_bad"), (2, "tt_none"), (3, "tt_ok")])
+    q.stop()
+
+    assert [r for batch in written for r in batch] == [(3, {"ok": True})]
+
+
+def test_stop_drops_the_backlog_at_the_deadline():
+    fetched = []
+
+    def fetch(imdb_tconst):
+        time.sleep(0.1)
+        fetched.append(imdb_tconst)
+        return {"imdb": imdb_tconst}
+
+    written = []
+    q = _make_queue(fetch, written, batch_size=100)
+    assert q.enqueue([(i, f"tt{i}") for i in range(10)]) == 10
+    start = time.monotonic()
+    q.stop(timeout=0.25)
+    assert time.monotonic() - start < 1.0
+    assert 0 < len(fetched) < 10
+    assert {r[1]["imdb"] for batch in written for r in batch} <= set(fetched)
+
+    # Dropped titles are accepted again once the queue restarts
+    assert q.enqueue([(9, "tt9")]) == 1
+    q.stop()
+
+
+def test_disabled_queue_accepts_nothing():
+    q = EnrichmentQueue(
+        "disabled",
+        fetch=lambda imdb: {},
+        write_batch=lambda results: None,
+        enabled=lambda: False,
+        workers=1,
+        batch_size=1,
+        flush_seconds=60,
+        max_pending=10,
+        retry_seconds=600,
+    )
+    assert q.enqueue([(1, "tt1")]) == 0
+    assert q._threads == []
+
+
+def test_tmdb_fetch_reuses_the_stored_tmdb_id(monkeypatch):
+    calls = []
+
+    def fetch(imdb_id, tmdb_id=None):
+        calls.append((imdb_id, tmdb_id))
+        return {}
+
+    monkeypatch.setattr(enrichment, "fetch_movie_details_from_tmdb", fetch)
+    written = []
+    q = _make_queue(enrichment._fetch_movie_details, written)
+    q.enqueue([(1, ("tt1", 550)), (2, ("tt2", None))])
+    q.stop()
+
+    assert sorted(calls) == [("tt1", 550), ("tt2", None)]
@@ -0,0 +1,50 @@
+from sqlalchemy import text
+
+from app.services.enrichment_state import record_fields, suppressed_fields
+from app.services.tmdb import movie_details_need_fetch
+
+
+def _state(db, title_id, field):
+    return db.execute(
+        text("""
+            SELECT attempts, EXTRACT(EPOCH FROM next_check_at - fetched_at)
+            FROM title_enrichment_state WHERE title_id = :id AND field = :field
+        """),
+        {"id": title_id, "field": field},
+    ).one()
+
+
+def test_missing_field_backs_off_exponentially(db, insert_movie):
+    title_id = insert_movie("tt8350001", "Obscure Movie")
+
+    record_fields(db, [(title_id, "trailer_key", False)], base_seconds=60)
+    assert suppressed_fields(db, title_id, ["trailer_key", "overview"]) == {"trailer_key"}
+    assert _state(db, title_id, "trailer_key") == (1, 60)
+
+    record_fields(db, [(title_id, "trailer_key", False)], base_seconds=60)
+    assert _state(db, title_id, "trailer_key") == (2, 120)
+
+    # Found on a later check: backoff resets and the field is no longer suppressed
+    record_fields(db, [(title_id, "trailer_key", True)], base_seconds=60)
+    attempts, _ = _state(db, title_id, "trailer_key")
+    assert attempts == 0
+    assert suppressed_fields(db, title_id, ["trailer_key"]) == set()
+
+
+def test_details_not_refetched_while_negatively_cached(db, insert_movie):
+    from app.models.catalog import CatalogTitle
+
+    title_id = insert_movie("tt8350002", "Trailerless Movie")
+    db.execute(
+        text("""
+            UPDATE catalog_titles
+            SET tmdb_id = 1, poster_path = '/p.jpg', overview = 'x', original_language = 'en'
+            WHERE id = :id
+        """),
+        {"id": title_id},
+    )
+    title = db.get(CatalogTitle, title_id)
+    assert movie_details_need_fetch(db, title)
+
+    record_fields(db, [(title_id, "trailer_key", False)])
+    assert not movie_details_need_fetch(db, title)
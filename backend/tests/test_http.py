@@ -0,0 +1,35 @@
+import httpx
+
+from app.services.http import OMDB, OPENAI, TMDB, close_clients, get_client, rate_limit_costs
+from app.services.ratelimit import OPENAI_EMBEDDING_TOKENS, OPENAI_EMBEDDINGS
+
+
+def test_clients_are_shared_per_upstream():
+    tmdb = get_client(TMDB)
+    assert get_client(TMDB) is tmdb
+    assert get_client(OMDB) is not tmdb
+    assert str(tmdb.base_url).startswith("https://api.themoviedb.org/3")
+
+    close_clients()
+    assert tmdb.is_closed
+    assert get_client(TMDB) is not tmdb
+    close_clients()
+
+
+def test_metrics_endpoint(client):
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    http = resp.json()["http"]
+    assert set(http) == {"tmdb", "omdb"}
+    assert {"requests", "connections_opened", "connection_reuse_ratio"} <= set(http["tmdb"])
+
+
+def test_openai_embeddings_take_request_and_token_buckets():
+    embed = httpx.Request("POST", "https://api.openai.com/v1/embeddings", json={"input": "a rainy day", "model": "m"})
+    assert rate_limit_costs(OPENAI, embed) == [(OPENAI_EMBEDDINGS, 1.0), (OPENAI_EMBEDDING_TOKENS, 4.0)]
+    batch = httpx.Request("POST", "https://api.openai.com/v1/embeddings", json={"input": ["abc", "abcdef"]})
+    assert rate_limit_costs(OPENAI, batch)[1] == (OPENAI_EMBEDDING_TOKENS, 5.0)
+
+    chat = httpx.Request("POST", "https://api.openai.com/v1/chat/completions", json={"messages": []})
+    assert rate_limit_costs(OPENAI, chat) == []
+    assert rate_limit_costs(TMDB, httpx.Request("GET", "https://api.themoviedb.org/3/movie/1")) == [(TMDB, 1.0)]
@@ -0,0 +1,20 @@
+import numpy as np
+
+from scripts.imdb_ids import IdMap, map_ids
+
+
+def test_map_ids_replaces_imdb_ids_and_drops_unknown_rows():
+    titles = IdMap(np.array([30, 10], dtype=np.int64), np.array([3, 1], dtype=np.int64))
+    people = IdMap(np.array([7], dtype=np.int64), np.array([70], dtype=np.int64))
+    skipped = [0]
+
+    rows = [("tt0000010", "nm0000007", 1), ("tt0000020", "nm0000007", 2), ("tt0000030", "nm0000008", 3)]
+    assert list(map_ids(rows, {0: titles, 1: people}, skipped)) == [(1, 70, 1)]
+    assert skipped == [2]
+
+
+def test_id_map_loads_catalog_ids(db, insert_movie):
+    title_id = insert_movie("tt8400001", "Id Map Movie")
+
+    id_map = IdMap.load(db, "catalog_titles", "imdb_tconst")
+    assert id_map.lookup(np.array([8400001, 8400002], dtype=np.int64)).tolist() == [title_id, -1]
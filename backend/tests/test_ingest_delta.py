@@ -0,0 +1,52 @@
+from sqlalchemy import text
+
+from scripts.bulk_load import delta_load
+from scripts.ingest_imdb import CREW, RATINGS
+
+
+def test_delta_load_writes_only_changed_rows(db, insert_movie):
+    title_id = insert_movie("tt8380001", "Delta Movie")
+
+    assert delta_load(db, RATINGS, [(title_id, 7.5, 100)]).merged == 1
+    # Same content again: nothing is rewritten
+    assert delta_load(db, RATINGS, [(title_id, 7.5, 100)]).merged == 0
+
+    stats = delta_load(db, RATINGS, [(title_id, 7.6, 140)])
+    assert stats.merged == 1
+    assert db.execute(
+        text("SELECT average_rating, num_votes FROM catalog_ratings WHERE title_id = :id"), {"id": title_id}
+    ).one() == (7.6, 140)
+
+
+def test_delta_load_deletes_rows_missing_from_the_source(db, insert_movie):
+    title_id = insert_movie("tt8380002", "Delta Crew Movie")
+
+    delta_load(db, CREW, [(title_id, ["nm0000001"], [])])
+    assert delta_load(db, CREW, []).deleted == 1
+    assert db.execute(
+        text("SELECT count(*) FROM catalog_crew WHERE title_id = :id"), {"id": title_id}
+    ).scalar() == 0
+
+
+def test_delta_load_after_rebuild_resyncs_rows_the_rebuild_wrote(db, insert_movie):
+    from scripts.rebuild import _reset_row_hashes
+
+    kept = insert_movie("tt8380003", "Delta Kept Movie")
+    dropped = insert_movie("tt8380004", "Delta Dropped Movie")
+    delta_load(db, CREW, [(kept, ["nm0000001"], [])])
+
+    # A rebuild loads its dump without delta_load, then swaps and drops the hashes
+    db.execute(text("UPDATE catalog_crew SET director_nconsts = '{nm0000002}' WHERE title_id = :id"), {"id": kept})
+    db.execute(
+        text("INSERT INTO catalog_crew (title_id, director_nconsts, writer_nconsts) VALUES (:id, '{nm0000003}', '{}')"),
+        {"id": dropped},
+    )
+    _reset_row_hashes(db.connection(), [CREW])
+
+    # The next dump reverts the kept row to its last hashed content and lacks the other
+    stats = delta_load(db, CREW, [(kept, ["nm0000001"], [])])
+    assert stats.deleted == 1
+    assert db.execute(
+        text("SELECT title_id, director_nconsts FROM catalog_crew WHERE title_id IN (:a, :b)"),
+        {"a": kept, "b": dropped},
+    ).fetchall() == [(kept, ["nm0000001"])]
@@ -0,0 +1,42 @@
+from sqlalchemy import text
+
+from app.config import settings
+from app.services.omdb_scheduler import plan_omdb_refreshes, store_demand
+from app.services.quota import reserved_quota, spend_reserved, try_take_quota
+
+
+def test_interactive_fills_cannot_spend_the_reserved_share(db, monkeypatch):
+    monkeypatch.setattr(settings, "OMDB_DAILY_QUOTA", 10)
+    monkeypatch.setattr(settings, "OMDB_SCHEDULED_QUOTA_FRACTION", 0.8)
+    db.execute(text("DELETE FROM upstream_quota_usage WHERE upstream = 'omdb'"))
+
+    assert reserved_quota(db, "omdb") == 8
+    assert [try_take_quota(db, "omdb") for _ in range(3)] == [True, True, False]
+
+    # The plan spends 5 and has no work for the other 3, which go to interactive fills
+    spend_reserved(db, "omdb", 5, released=3)
+    assert reserved_quota(db, "omdb") == 0
+    assert [try_take_quota(db, "omdb") for _ in range(4)] == [True, True, True, False]
+
+
+def test_plan_ranks_stale_titles_by_demand_and_trending(db, insert_movie, insert_rating):
+    popular = insert_movie("tt8370001", "Popular Unviewed")
+    insert_rating(popular, votes=2_000_000)
+    viewed = insert_movie("tt8370002", "Often Viewed")
+    insert_rating(viewed, votes=1000)
+    trending = insert_movie("tt8370003", "Trending Now")
+    insert_rating(trending, votes=1000)
+    fresh = insert_movie("tt8370004", "Recently Fetched")
+    insert_rating(fresh, votes=5_000_000)
+    db.execute(text("UPDATE catalog_ratings SET omdb_fetched_at = now() WHERE title_id = :id"), {"id": fresh})
+    db.execute(
+        text("INSERT INTO trending_cache (tmdb_id, title_id, rank) VALUES (9001, :id, 1)"), {"id": trending}
+    )
+
+    store_demand(db, {viewed: 20})
+    store_demand(db, {viewed: 5})
+
+    ids = [c.title_id for c in plan_omdb_refreshes(db, limit=1000)]
+    assert fresh not in ids
+    assert ids.index(viewed) < ids.index(trending) < ids.index(popular)
+    assert db.execute(text("SELECT views FROM title_demand WHERE title_id = :id"), {"id": viewed}).scalar() == 25
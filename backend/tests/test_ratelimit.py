@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.services.ratelimit import BucketConfig, LocalBucket, PostgresBucketStore, RateLimiter, _reserve
+
+
+def test_local_bucket_takes_until_empty():
+    bucket = LocalBucket(BucketConfig(capacity=3, refill_per_second=1.0))
+    assert [bucket.try_take(1, 0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = bucket.try_take(1, 0)
+    assert 0 < wait <= 1.0
+
+
+def test_bulk_lane_leaves_reserve_for_interactive():
+    config = BucketConfig(capacity=4, refill_per_second=0.001)
+    bucket = LocalBucket(config)
+    bulk_reserve = _reserve(config, "bulk")
+    assert bulk_reserve > 0
+
+    taken = 0
+    while bucket.try_take(1, bulk_reserve) == 0.0:
+        taken += 1
+    assert taken == config.capacity - bulk_reserve
+    # Interactive requests can still use the reserved tokens
+    assert bucket.try_take(1, _reserve(config, "interactive")) == 0.0
+
+
+def test_acquire_rejects_a_cost_the_lane_can_never_take(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "OMDB_RATE_LIMIT_BURST", 4)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BULK_RESERVE_FRACTION", 0.25)
+
+    # Bulk may only ever hold 3 of the 4 tokens; waiting for 4 would never end
+    with pytest.raises(ValueError):
+        RateLimiter().acquire("omdb", cost=4, lane="bulk")
+    with pytest.raises(ValueError):
+        RateLimiter().acquire("omdb", cost=5, lane="interactive")
+
+
+@pytest.fixture
+def store(db):
+    """Bucket store on the test database; it commits, so its rows are removed afterwards."""
+    engine = db.get_bind().engine
+    yield PostgresBucketStore(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM rate_limit_buckets WHERE upstream LIKE 'test-%'"))
+
+
+def _bucket(store, upstream):
+    with store._engine.connect() as conn:
+        return conn.execute(
+            text("SELECT tokens, capacity FROM rate_limit_buckets WHERE upstream = :upstream"),
+            {"upstream": upstream},
+        ).one()
+
+
+def test_store_takes_until_empty(store):
+    config = BucketConfig(capacity=3, refill_per_second=0.001)
+    assert [store.try_take("test-take", config, 1, 0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert store.try_take("test-take", config, 1, 0) > 0
+    tokens, _ = _bucket(store, "test-take")
+    assert tokens < 1
+
+
+def test_store_refills_with_elapsed_time(store):
+    config = BucketConfig(capacity=2, refill_per_second=1.0)
+    assert store.try_take("test-refill", config, 2, 0) == 0.0
+    wait = store.try_take("test-refill", config, 2, 0)
+    assert 1.0 < wait <= 2.0
+
+    with store._engine.begin() as conn:
+        conn.execute(
+            text("""
+                UPDATE rate_limit_buckets SET updated_at = updated_at - interval '5 seconds'
+                WHERE upstream = 'test-refill'
+            """)
+        )
+    # Refilled, but never beyond capacity
+    assert store.try_take("test-refill", config, 2, 0) == 0.0
+    assert store.try_take("test-refill", config, 1, 0) > 0
+
+
+def test_store_reserve_blocks_bulk_but_not_interactive(store):
+    config = BucketConfig(capacity=4, refill_per_second=0.001)
+    bulk_reserve = _reserve(config, "bulk")
+
+    taken = 0
+    while store.try_take("test-reserve", config, 1, bulk_reserve) == 0.0:
+        taken += 1
+    assert taken == config.capacity - bulk_reserve
+    assert store.try_take("test-reserve", config, 1, _reserve(config, "interactive")) == 0.0
+
+
+def test_store_applies_capacity_changes(store):
+    assert store.try_take("test-capacity", BucketConfig(capacity=10, refill_per_second=0.001), 1, 0) == 0.0
+    assert tuple(_bucket(store, "test-capacity")) == pytest.approx((9, 10), abs=0.01)
+
+    # A process started with new settings shrinks the shared bucket, tokens included
+    restarted = PostgresBucketStore(store._engine)
+    smaller = BucketConfig(capacity=2, refill_per_second=0.001)
+    assert restarted.try_take("test-capacity", smaller, 2, 0) == 0.0
+    assert restarted.try_take("test-capacity", smaller, 1, 0) > 0
+    assert _bucket(store, "test-capacity")[1] == 2
@@ -0,0 +1,17 @@
+from scripts.rebuild import BUILD_SCHEMA, _shadow
+
+TABLES = ["catalog_titles", "catalog_people", "catalog_principals"]
+
+
+def test_shadow_points_index_definitions_at_the_build_schema():
+    definition = "CREATE INDEX ix_catalog_titles_ts_vector ON public.catalog_titles USING gin (ts_vector)"
+    assert _shadow(definition, TABLES) == (
+        f"CREATE INDEX ix_catalog_titles_ts_vector ON {BUILD_SCHEMA}.catalog_titles USING gin (ts_vector)"
+    )
+
+
+def test_shadow_rewrites_only_references_to_rebuilt_tables():
+    inside = "FOREIGN KEY (person_id) REFERENCES catalog_people(id)"
+    assert _shadow(inside, TABLES) == f"FOREIGN KEY (person_id) REFERENCES {BUILD_SCHEMA}.catalog_people(id)"
+    outside = "FOREIGN KEY (user_id) REFERENCES users(id)"
+    assert _shadow(outside, TABLES) == outside
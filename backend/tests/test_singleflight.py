@@ -0,0 +1,43 @@
+import threading
+import time
+
+from app.services.singleflight import _local_flight, _locks
+
+
+def test_local_flight_runs_one_caller_at_a_time_per_key():
+    active = 0
+    max_active = 0
+    guard = threading.Lock()
+
+    def fetch():
+        nonlocal active, max_active
+        with _local_flight(("tmdb-details", 1)):
+            with guard:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.01)
+            with guard:
+                active -= 1
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max_active == 1
+    assert _locks == {}
+
+
+def test_local_flight_does_not_block_other_keys():
+    with _local_flight(("tmdb-details", 1)):
+        done = threading.Event()
+
+        def other():
+            with _local_flight(("tmdb-details", 2)):
+                done.set()
+
+        t = threading.Thread(target=other)
+        t.start()
+        assert done.wait(timeout=1.0)
+        t.join()
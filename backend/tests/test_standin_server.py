@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.services import http
+from app.services.omdb import fetch_omdb_ratings
+from app.services.tmdb import fetch_movie_details_from_tmdb
+from scripts import standin_server
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """Route the shared TMDB/OMDb clients to the stand-in app."""
+    monkeypatch.setattr(settings, "TMDB_API_KEY", "standin")
+    monkeypatch.setattr(settings, "OMDB_API_KEY", "standin")
+    monkeypatch.setattr(standin_server, "config", standin_server.StandinConfig(latency_ms={}))
+    monkeypatch.setitem(http._clients, http.TMDB, TestClient(standin_server.app, base_url="http://testserver/tmdb/3"))
+    monkeypatch.setitem(http._clients, http.OMDB, TestClient(standin_server.app, base_url="http://testserver/omdb"))
+    return standin_server
+
+
+def test_recorded_fixtures_flow_through_real_fetchers(standin):
+    details = fetch_movie_details_from_tmdb("tt0137523")
+    assert details["tmdb_id"] == 550
+    assert details["trailer_key"] == "BdJKm16Co6M"
+    assert details["providers"]["GB"]["flatrate"][0]["provider_id"] == 337
+
+    assert fetch_omdb_ratings("tt0137523") == {
+        "rt_critic_score": 79,
+        "rt_audience_score": None,
+        "metacritic_score": 67,
+    }
+
+
+def test_synthesized_titles_are_deterministic(standin):
+    first = fetch_movie_details_from_tmdb("tt0111161")
+    assert first["tmdb_id"] == 111161
+    assert first["imdb_id"] == "tt0111161"
+    assert fetch_movie_details_from_tmdb("tt0111161") == first
+
+
+def test_rate_limit_injection(standin):
+    standin.config.rate_limit_rate = 1.0
+    resp = http.get_client(http.TMDB).get("/trending/movie/week")
+    assert resp.status_code == 429
+    assert standin.stats["tmdb.429"] >= 1
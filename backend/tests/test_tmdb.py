@@ -0,0 +1,116 @@
+from sqlalchemy import text
+
+from app.services.tmdb import _pick_trailer_key, store_movie_details, store_watch_providers
+
+
+def test_pick_trailer_key_prefers_official_trailer():
+    videos = [
+        {"site": "Vimeo", "type": "Trailer", "key": "vimeo"},
+        {"site": "YouTube", "type": "Teaser", "key": "teaser"},
+        {"site": "YouTube", "type": "Trailer", "key": "fan", "official": False},
+        {"site": "YouTube", "type": "Trailer", "key": "official"},
+    ]
+    assert _pick_trailer_key(videos) == "official"
+    assert _pick_trailer_key(videos[:3]) == "teaser"
+    assert _pick_trailer_key([{"site": "YouTube", "type": "Clip", "key": "clip"}]) == "clip"
+    assert _pick_trailer_key([]) is None
+
+
+def test_store_watch_providers_writes_every_region(db, insert_movie):
+    title_id = insert_movie("tt8340001", "Bundle Movie")
+    providers = {
+        "US": {
+            "flatrate": [{"provider_id": 8, "provider_name": "Netflix"}],
+            "rent": [{"provider_id": 2, "provider_name": "Apple TV"}],
+        },
+        "GB": {"flatrate": [{"provider_id": 337, "provider_name": "Disney Plus"}]},
+    }
+    store_watch_providers(db, title_id, providers)
+    # A refresh replaces the region's rows rather than appending
+    store_watch_providers(db, title_id, providers)
+
+    rows = db.execute(
+        text("""
+            SELECT region, provider_type, provider_id FROM watch_providers
+            WHERE title_id = :id ORDER BY region, provider_type
+        """),
+        {"id": title_id},
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [("GB", "flatrate", 337), ("US", "flatrate", 8), ("US", "rent", 2)]
+
+    availability = dict(
+        db.execute(
+            text("SELECT region, flatrate_provider_ids FROM title_availability WHERE title_id = :id"),
+            {"id": title_id},
+        ).fetchall()
+    )
+    assert availability == {"US": [8], "GB": [337]}
+
+
+def test_store_watch_providers_clears_regions_missing_from_payload(db, insert_movie):
+    title_id = insert_movie("tt8340004", "Dropped Region")
+    store_watch_providers(db, title_id, {
+        "US": {"flatrate": [{"provider_id": 8, "provider_name": "Netflix"}]},
+        "GB": {"flatrate": [{"provider_id": 337, "provider_name": "Disney Plus"}]},
+    })
+    # The title left GB: the second bundle no longer lists it
+    store_watch_providers(db, title_id, {"US": {"flatrate": [{"provider_id": 8, "provider_name": "Netflix"}]}})
+
+    regions = db.execute(
+        text("SELECT DISTINCT region FROM watch_providers WHERE title_id = :id"), {"id": title_id}
+    ).scalars().all()
+    assert regions == ["US"]
+    availability = dict(
+        db.execute(
+            text("SELECT region, flatrate_provider_ids FROM title_availability WHERE title_id = :id"),
+            {"id": title_id},
+        ).fetchall()
+    )
+    assert availability == {"US": [8], "GB": []}
+
+
+def test_store_movie_details_batch_fills_only_missing_fields(db, insert_movie):
+    first = insert_movie("tt8340002", "Batch One")
+    second = insert_movie("tt8340003", "Batch Two")
+    db.execute(text("UPDATE catalog_titles SET overview = 'Kept' WHERE id = :id"), {"id": first})
+
+    store_movie_details(db, [
+        (first, {"tmdb_id": 901, "poster_path": "/one.jpg", "overview": "New", "providers": {"US": {}}}),
+        (second, {"tmdb_id": None, "poster_path": None, "overview": None, "providers": {"US": {}}}),
+    ])
+
+    rows = db.execute(
+        text("SELECT id, tmdb_id, poster_path, overview FROM catalog_titles WHERE id IN (:a, :b) ORDER BY id"),
+        {"a": first, "b": second},
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [(first, 901, "/one.jpg", "Kept"), (second, None, None, None)]
+    # Empty provider payloads still mark the region as checked
+    checked = db.execute(
+        text("SELECT count(*) FROM title_availability WHERE title_id IN (:a, :b) AND region = 'US'"),
+        {"a": first, "b": second},
+    ).scalar()
+    assert checked == 2
+
+
+def test_refresh_trending_cache_matches_in_batches(db, monkeypatch, insert_movie):
+    from app.services import tmdb
+
+    known = insert_movie("tt8360001", "Known Trending")
+    db.execute(text("UPDATE catalog_titles SET tmdb_id = 501 WHERE id = :id"), {"id": known})
+    unknown = insert_movie("tt8360002", "Unmatched Trending")
+
+    monkeypatch.setattr(tmdb, "fetch_tmdb_trending", lambda: [{"id": 501}, {"id": 502}, {"id": 503}])
+    bundles = {
+        502: {"tmdb_id": 502, "imdb_id": "tt8360002", "overview": "Found", "providers": {}},
+        503: None,
+    }
+    monkeypatch.setattr(tmdb, "fetch_tmdb_bundle", lambda tmdb_id: bundles[tmdb_id])
+
+    assert tmdb.refresh_trending_cache(db) == 2
+
+    rows = db.execute(text("SELECT rank, tmdb_id, title_id FROM trending_cache ORDER BY rank")).fetchall()
+    assert [tuple(r) for r in rows] == [(1, 501, known), (2, 502, unknown), (3, 503, None)]
+    assert db.execute(
+        text("SELECT tmdb_id, overview FROM catalog_titles WHERE id = :id"), {"id": unknown}
+    ).one() == (502, "Found")
+    assert tmdb.get_trending_title_ids(db) == [known, unknown]
@@ -204,3 +204,28 @@ def test_watch_history_pagination(client, auth_profile, seed_movies):
     )
     data = resp.json()
     assert len(data["results"]) == 1
+
+
+def test_watch_history_cursor(client, auth_profile, seed_movies):
+    headers, profile_id = auth_profile
+    for mid in seed_movies:
+        client.post(
+            f"/profiles/{profile_id}/watches",
+            json={"title_id": mid, "tag_names": []},
+            headers=headers,
+        )
+
+    resp = client.get(f"/profiles/{profile_id}/history?limit=2", headers=headers)
+    data = resp.json()
+    assert len(data["results"]) == 2
+    assert data["next_cursor"] is not None
+
+    resp = client.get(
+        f"/profiles/{profile_id}/history?limit=2&cursor={data['next_cursor']}",
+        headers=headers,
+    )
+    data2 = resp.json()
+    assert len(data2["results"]) == 1
+    assert data2["next_cursor"] is None
+    seen = {w["title_id"] for w in data["results"] + data2["results"]}
+    assert seen == set(seed_movies)